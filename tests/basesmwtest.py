@@ -4,14 +4,18 @@ Created on 18.01.2023
 @author: wf
 """
 
+import os
 import sys
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List
 
 from meta.metamodel import Context
 from meta.mw import SMWAccess
 
 from tests.basemwtest import BaseMediawikiTest
+from yprinciple.fake_mediawiki import FakeMediaWiki, FakeMediaWikiServer
+from yprinciple.genapi import GeneratorAPI
 from yprinciple.smw_targets import SMWTarget
 
 
@@ -108,3 +112,53 @@ class BaseSemanticMediawikiTest(BaseMediawikiTest):
         self.assertIsNone(error)
         cc = ContextContext(smwAccess, context)
         return cc
+
+    def getSiDIFContext(self, context_name: str = "TestContext") -> Context:
+        """
+        get the offline context with the given name from the test resources
+
+        Args:
+            context_name(str): the name of the SiDIF file (without extension)
+
+        Returns:
+            Context: the context parsed from the SiDIF file
+        """
+        sidif_path = os.path.join(
+            os.path.dirname(__file__), "resources", f"{context_name}.sidif"
+        )
+        context, error, _errMsg = Context.fromSiDIF_input(sidif_path, debug=self.debug)
+        self.assertIsNone(error)
+        return context
+
+    @contextmanager
+    def fakeWikiGen(
+        self,
+        wiki: FakeMediaWiki = None,
+        gen: GeneratorAPI = None,
+        context: Context = None,
+        wikiId: str = "ypgen-fakewiki",
+    ) -> Iterator[GeneratorAPI]:
+        """
+        serve the given fake wiki and supply a generator API targeting it
+
+        Args:
+            wiki(FakeMediaWiki): the fake wiki to serve - a new empty one if None
+            gen(GeneratorAPI): the generator API to use - a new one if None
+            context(Context): the context to generate - the offline test context if None
+            wikiId(str): the wikiId to save the credentials of the fake wiki for
+
+        Yields:
+            GeneratorAPI: the generator API while the fake wiki is served
+        """
+        if wiki is None:
+            wiki = FakeMediaWiki()
+        with FakeMediaWikiServer(wiki) as server:
+            server.getWikiUser(wikiId, save=True)
+            if gen is None:
+                gen = GeneratorAPI(verbose=False, debug=self.debug)
+            if context is None:
+                context = self.getSiDIFContext()
+            gen.context = context
+            gen.wikiId = wikiId
+            gen.smwAccess = SMWAccess(wikiId)
+            yield gen
@@ -0,0 +1,121 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import asyncio
+
+import httpx
+from mwclient.errors import APIError
+from requests.auth import HTTPBasicAuth, HTTPDigestAuth
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.async_genapi import AsyncGeneratorAPI, AsyncMwApi
+from yprinciple.fake_mediawiki import FakeMediaWiki
+from yprinciple.page_cache import PageCache
+
+
+class TestAsyncGeneratorAPI(BaseSemanticMediawikiTest):
+    """
+    test the asyncio variant of the generator API against the fake wiki
+    """
+
+    def test_generateViaMwApi(self):
+        """
+        test generating the pages of a context concurrently on the event loop
+        """
+        wiki = FakeMediaWiki(latency=0.01)
+        wiki.setPage("Help:Event", "outdated help")
+        with self.fakeWikiGen(wiki) as gen:
+            agen = AsyncGeneratorAPI(gen, concurrency=4)
+            target_names = ["help", "template"]
+            genResults = asyncio.run(
+                agen.generateViaMwApi(target_names=target_names, dryRun=True)
+            )
+            self.assertEqual(6, len(genResults))
+            self.assertNotIn("edit:saved", wiki.stats)
+
+            async def generate() -> dict:
+                genResults = {}
+                async for ypCell, genResult in agen.yieldGenResults(
+                    target_names=target_names, dryRun=False
+                ):
+                    genResults[ypCell.getPageTitle()] = genResult
+                return genResults
+
+            genResults = asyncio.run(generate())
+            statuses = [genResult.getStatus() for genResult in genResults.values()]
+            self.assertEqual(["edited"] * 6, statuses)
+            help_result = genResults["Help:Event"]
+            self.assertIn("outdated help", help_result.markup_diff)
+            self.assertIsNotNone(help_result.getDiffUrl())
+            self.assertTrue(help_result.page_changed())
+            # the sequential API sees the same state
+            genResults = gen.generateViaMwApi(target_names=target_names, dryRun=False)
+            statuses = {genResult.getStatus() for genResult in genResults}
+            self.assertEqual({"unchanged"}, statuses)
+        self.assertEqual(6, wiki.stats["edit:saved"])
+        self.assertIn("Help for Event", wiki.getText("Help:Event"))
+
+    def test_retryAfterDate(self):
+        """
+        test that a Retry-After header with an HTTP date is accepted
+        """
+        wiki = FakeMediaWiki(lag=10, retry_after="Wed, 21 Oct 2026 07:28:00 GMT")
+        with self.fakeWikiGen(wiki) as gen:
+            site = gen.smwAccess.wikiClient.getSite()
+
+            async def query():
+                async with AsyncMwApi(site, max_retries=1) as api:
+                    await api.call("query", meta="siteinfo")
+
+            queries = wiki.stats["action:query"]
+            with self.assertRaises(APIError) as context:
+                asyncio.run(query())
+            self.assertEqual("maxlag", context.exception.code)
+        # a single retry after the default delay
+        self.assertEqual(queries + 2, wiki.stats["action:query"])
+
+    def test_getAuth(self):
+        """
+        test converting the auth of an mwclient connection for httpx
+        """
+        self.assertIsNone(AsyncMwApi.getAuth(None))
+        for auth in [("user", "secret"), HTTPBasicAuth("user", "secret")]:
+            httpx_auth = AsyncMwApi.getAuth(auth)
+            self.assertIsInstance(httpx_auth, httpx.BasicAuth)
+        httpx_auth = AsyncMwApi.getAuth(HTTPDigestAuth("user", "secret"))
+        self.assertIsInstance(httpx_auth, httpx.DigestAuth)
+        with self.assertRaises(ValueError):
+            AsyncMwApi.getAuth(object())
+
+    def test_boundedWindowAndCacheMiss(self):
+        """
+        test generating with a window smaller than the number of cells
+        and fetching a page missing in the page cache asynchronously
+        """
+        wiki = FakeMediaWiki()
+        wiki.setPage("Help:Event", "outdated help")
+        with self.fakeWikiGen(wiki) as gen:
+            agen = AsyncGeneratorAPI(gen, concurrency=1)
+            genResults = asyncio.run(
+                agen.generateViaMwApi(target_names=["help", "template"], dryRun=True)
+            )
+            self.assertEqual(6, len(genResults))
+            ypCell = list(gen.yieldYpCells("for test", target_names=["help"]))[1]
+            site = gen.smwAccess.wikiClient.getSite()
+            page_cache = PageCache(site)
+
+            async def generateCell():
+                async with AsyncMwApi(site) as api:
+                    return await agen.generateCell(
+                        api, ypCell, ypCell.generateMarkup(), page_cache
+                    )
+
+            genResult = asyncio.run(generateCell())
+            # the page has been fetched into the page cache
+            self.assertIn("Help:Event", page_cache)
+            self.assertEqual(1, page_cache.query_count)
+            self.assertEqual("outdated help", ypCell.pageText)
+            self.assertFalse(genResult.unchanged)
@@ -0,0 +1,55 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import os
+import tempfile
+
+from tests.basetest import Basetest
+from yprinciple.benchmark import ContextSynthesizer, GenerationBenchmark, main
+
+
+class TestBenchmark(Basetest):
+    """
+    test the offline generation benchmark
+    """
+
+    def test_synthesize(self):
+        """
+        test synthesizing a context of a given size
+        """
+        synthesizer = ContextSynthesizer(
+            topics=7, properties=4, links=3, extends_depth=2
+        )
+        context = synthesizer.getContext()
+        self.assertEqual(7, len(context.topics))
+        topic2 = context.topics["Topic2"]
+        extends_names = [topic.name for topic in topic2.get_extends_topics()]
+        self.assertEqual(["Topic1", "Topic0"], extends_names)
+        self.assertIsNone(getattr(context.topics["Topic3"], "extends", None))
+        self.assertEqual(1, len(context.topics["Topic0"].sourceTopicLinks))
+
+    def test_benchmark(self):
+        """
+        test running the benchmark with JSON output
+        """
+        synthesizer = ContextSynthesizer(topics=4, properties=3, links=2)
+        benchmark = GenerationBenchmark(synthesizer.getContext(), repeat=1)
+        results = {result.name: result for result in benchmark.run()}
+        self.assertEqual(4, results["category"].pages)
+        self.assertTrue(results["category"].bytes > 0)
+        self.assertTrue(results["category"].peak_memory > 0)
+        self.assertIn("generateToFile", results)
+        self.assertNotIn("properties", results)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "benchmark.json")
+            exit_code = main(["--topics", "3", "--repeat", "1", "--output", json_path])
+            self.assertEqual(0, exit_code)
+            with open(json_path) as json_file:
+                report = json.load(json_file)
+        self.assertEqual(3, report["context"]["topics"])
+        names = [result["name"] for result in report["results"]]
+        self.assertIn("python", names)
@@ -0,0 +1,101 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from meta.metamodel import Context
+from meta.mw import MediaWikiContext
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.context_cache import ContextCache
+from yprinciple.fake_mediawiki import FakeMediaWiki
+
+
+class TestContextCache(BaseSemanticMediawikiTest):
+    """
+    test caching parsed contexts by revision
+    """
+
+    def test_load_store(self):
+        """
+        test that a cached context is only used for the same revision
+        """
+        context = self.getSiDIFContext()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            context_cache = ContextCache(cache_dir=cache_dir, debug=self.debug)
+            self.assertIsNone(context_cache.load("test", "TestContext", 42))
+            context_cache.store("test", "TestContext", 42, context)
+            cached_context = context_cache.load("test", "TestContext", 42)
+            self.assertIsNotNone(cached_context)
+            self.assertEqual(list(context.topics), list(cached_context.topics))
+            event = cached_context.topics["Event"]
+            self.assertIs(cached_context, event.context_obj)
+            self.assertEqual("Item", event.get_extends_topics()[0].name)
+            # a new revision invalidates the cached context
+            self.assertIsNone(context_cache.load("test", "TestContext", 43))
+            # without a known revision the cache is not used
+            self.assertIsNone(context_cache.load("test", "TestContext", None))
+
+    def test_getContext(self):
+        """
+        test that getContext only parses the context again if the revision
+        of the context page or the library versions changed
+        """
+        sidif_path = os.path.join(
+            os.path.dirname(__file__), "resources", "TestContext.sidif"
+        )
+        with open(sidif_path) as sidif_file:
+            sidif = sidif_file.read()
+        markup = f"=sidif=\n<source lang='sidif'>\n{sidif}\n</source>\n"
+        wiki = FakeMediaWiki()
+        wiki.setPage("TestContext", markup)
+        with (
+            tempfile.TemporaryDirectory() as cache_dir,
+            self.fakeWikiGen(wiki) as gen,
+            patch.object(
+                Context, "fromWikiContext", wraps=Context.fromWikiContext
+            ) as fromWikiContext,
+        ):
+            mw_context = MediaWikiContext(
+                wikiId=gen.wikiId,
+                wiki_url=gen.smwAccess.wikiClient.wikiUser.url,
+                context="TestContext",
+                since=None,
+                master=None,
+            )
+            context_cache = ContextCache(cache_dir=cache_dir, debug=self.debug)
+
+            def getContext(parses: int) -> Context:
+                context, error, _errMsg = context_cache.getContext(mw_context)
+                self.assertIsNone(error)
+                self.assertEqual(["Item", "Event", "City"], list(context.topics))
+                self.assertEqual(parses, fromWikiContext.call_count)
+                return context
+
+            # a miss on the first use and a hit for the same revision
+            getContext(1)
+            getContext(1)
+            # a new revision of the context page is a miss
+            wiki.setPage("TestContext", f"{markup}\n")
+            getContext(2)
+            getContext(2)
+            # a new library version is a miss
+            versions = {"ypgen": "0.0.0", "pyMetaModel": "0.0.0"}
+            with patch.object(ContextCache, "getVersions", return_value=versions):
+                getContext(3)
+                getContext(3)
+            # the cached context of the other version is replaced again
+            getContext(4)
+            getContext(4)
+            # without the revision the cache is neither used nor updated
+            with patch.object(
+                ContextCache, "getRevision", side_effect=ValueError("no revision")
+            ):
+                getContext(5)
+                getContext(6)
+            getContext(6)
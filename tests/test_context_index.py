@@ -0,0 +1,76 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.benchmark import ContextSynthesizer
+from yprinciple.context_index import ContextIndex, TopicIndex
+from yprinciple.smw_targets import SMWTarget
+
+
+class TestContextIndex(BaseSemanticMediawikiTest):
+    """
+    test the precomputed per context topic index
+    """
+
+    def test_topicIndex(self):
+        """
+        test that the index has the same data as the topic methods
+        """
+        context = self.getSiDIFContext()
+        context_index = ContextIndex(context)
+        for topic in context.topics.values():
+            topic_index = context_index.getTopicIndex(topic)
+            self.assertIs(topic_index, context_index.getTopicIndex(topic))
+            self.assertEqual(topic.get_extends_topics(), topic_index.extends_topics)
+            self.assertEqual(topic.get_all_properties(), topic_index.all_properties)
+            self.assertEqual(topic.propertiesByIndex(), topic_index.properties_by_index)
+            self.assertIs(
+                topic.get_primary_key_property(), topic_index.primary_key_property
+            )
+            self.assertEqual(
+                list(topic.sourceTopicLinks.values()), topic_index.source_topic_links
+            )
+            self.assertEqual(
+                list(topic.targetTopicLinks.values()), topic_index.target_topic_links
+            )
+        event_index = context_index.getTopicIndex(context.topics["Event"])
+        self.assertEqual("Item", event_index.extends_topic.name)
+        self.assertEqual(
+            ["Event", "Item"],
+            [t.name for t in [event_index.topic] + event_index.extends_topics],
+        )
+        city_index = context_index.getTopicIndex(context.topics["City"])
+        self.assertEqual(1, len(city_index.source_topic_links))
+
+    def test_generateWithIndex(self):
+        """
+        test that the generators give the same markup with the shared
+        context index as with an index per page
+        """
+        synthesizer = ContextSynthesizer(
+            topics=8, properties=4, links=6, extends_depth=3
+        )
+        context = synthesizer.getContext()
+        targets = SMWTarget.getSMWTargets()
+        markups = {}
+        for target_key in ["category", "concept", "form", "help", "template", "python"]:
+            for topic in context.topics.values():
+                markups[(target_key, topic.name)] = targets[target_key].generate(topic)
+        fragment_cache = targets["template"].fragment_cache
+        context_index = fragment_cache.context_index
+        self.assertIs(context, context_index.context)
+        self.assertEqual(len(context.topics), len(context_index.topic_indices))
+        for target_key in ["category", "concept", "form", "help", "template", "python"]:
+            target = targets[target_key]
+            target.fragment_cache = None
+            for topic in context.topics.values():
+                self.assertEqual(
+                    markups[(target_key, topic.name)],
+                    target.generate(topic),
+                    f"{target_key}:{topic.name}",
+                )
+        deep_topic = context.topics[synthesizer.getTopicName(3)]
+        self.assertEqual(3, len(TopicIndex.ofTopic(deep_topic).extends_topics))
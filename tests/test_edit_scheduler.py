@@ -0,0 +1,142 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import threading
+from urllib.parse import urlparse
+
+import mwclient
+from mwclient.errors import APIError
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.edit_scheduler import EditScheduler, TransientEditError
+from yprinciple.fake_mediawiki import FakeMediaWiki, FakeMediaWikiServer
+
+
+class FakeClock:
+    """
+    a clock that only advances when sleeping
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class TestEditScheduler(BaseSemanticMediawikiTest):
+    """
+    test the adaptive edit scheduler
+    """
+
+    def test_aimd(self):
+        """
+        test the rate adaption and the pauses
+        """
+        clock = FakeClock()
+        scheduler = EditScheduler(
+            rate=2.0,
+            max_rate=4.0,
+            target_latency=1.0,
+            clock=clock.time,
+            sleep=clock.sleep,
+            seed=1,
+        )
+        self.assertEqual(0, scheduler.acquire())
+        # the next slot is 1/rate later
+        self.assertAlmostEqual(0.5, scheduler.acquire())
+        # fast edits increase the rate additively up to the maximum
+        scheduler.onSuccess(0.1)
+        self.assertEqual(3.0, scheduler.rate)
+        for _i in range(3):
+            scheduler.onSuccess(0.1)
+        self.assertEqual(4.0, scheduler.rate)
+        # slow edits and failures decrease it multiplicatively
+        scheduler.onSuccess(1.5)
+        self.assertEqual(2.0, scheduler.rate)
+        scheduler.onFailure(retry_after=5)
+        self.assertEqual(1.0, scheduler.rate)
+        # Retry-After pauses all edits
+        start = clock.now
+        scheduler.acquire()
+        self.assertAlmostEqual(start + 5, clock.now)
+        delays = [scheduler.getRetryDelay(attempt) for attempt in range(1, 9)]
+        for attempt, delay in enumerate(delays, start=1):
+            expected = min(60.0, 2 ** (attempt - 1))
+            self.assertTrue(expected / 2 <= delay <= expected, f"{attempt}:{delay}")
+        self.assertTrue(scheduler.isTransient(TransientEditError("maxlag", "lag")))
+        self.assertFalse(scheduler.isTransient(ValueError("permanent")))
+
+    def test_rateLimit(self):
+        """
+        test that rate limited cells are retried until all pages are edited
+        """
+        wiki = FakeMediaWiki(edit_rate_limit=2, rate_window=0.5)
+        with self.fakeWikiGen(wiki) as gen:
+            scheduler = EditScheduler(rate=50, base_delay=0.3, seed=1)
+            genResults = gen.generateViaMwApi(
+                target_names=["help", "template"],
+                dryRun=False,
+                jobs=2,
+                edit_scheduler=scheduler,
+            )
+            statuses = [genResult.getStatus() for genResult in genResults]
+            self.assertEqual(["edited"] * 6, statuses)
+        self.assertEqual(6, wiki.stats["edit:saved"])
+        self.assertTrue(wiki.stats["error:ratelimited"] > 0)
+        self.assertTrue(scheduler.stats["retries"] > 0)
+        self.assertTrue(scheduler.rate < 50)
+
+    def test_lagAndServerErrors(self):
+        """
+        test that maxlag pauses the edits and server errors are retried
+        """
+        wiki = FakeMediaWiki(error_rate=0.3, failure_actions=["edit"], lag=5, seed=2)
+        with self.fakeWikiGen(wiki) as gen:
+            scheduler = EditScheduler(rate=20, base_delay=0.1, max_retries=8, seed=1)
+            # the replication catches up after a while
+            timer = threading.Timer(0.5, lambda: setattr(wiki, "lag", 0))
+            timer.start()
+            try:
+                genResults = gen.generateViaMwApi(
+                    target_names=["help", "template"],
+                    dryRun=False,
+                    edit_scheduler=scheduler,
+                )
+            finally:
+                timer.cancel()
+            statuses = [genResult.getStatus() for genResult in genResults]
+            self.assertEqual(["edited"] * 6, statuses)
+        self.assertEqual(6, wiki.stats["edit:saved"])
+        self.assertTrue(wiki.stats["error:maxlag"] > 0)
+        self.assertTrue(scheduler.stats["waited"] >= 0.5)
+        self.assertTrue(wiki.stats["error:http"] > 0)
+        failures = wiki.stats["error:maxlag"] + wiki.stats["error:http"]
+        self.assertEqual(failures, scheduler.stats["failures"])
+
+    def test_anonymousEdit(self):
+        """
+        test that the login is only asserted if it is required or active
+        as mwclient does
+        """
+        wiki = FakeMediaWiki(anonymous_edits=True)
+        scheduler = EditScheduler()
+        with FakeMediaWikiServer(wiki) as server:
+            url = urlparse(server.url)
+            site = mwclient.Site(
+                url.netloc, path="/", scheme=url.scheme, force_login=False
+            )
+            page = site.pages["Help:Anonymous"]
+            edit_result = scheduler.edit(page, "anonymous text", "test")
+            self.assertEqual("Success", edit_result["result"])
+            site.force_login = True
+            with self.assertRaises(APIError) as context:
+                scheduler.edit(page, "other text", "test")
+            self.assertEqual("assertuserfailed", context.exception.code)
+        self.assertEqual("anonymous text", wiki.getText("Help:Anonymous"))
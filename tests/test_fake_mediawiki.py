@@ -0,0 +1,134 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from wikibot3rd.smw import SMWClient
+from wikibot3rd.wikiclient import WikiClient
+from wikibot3rd.wikipush import WikiPush
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.fake_mediawiki import FakeMediaWiki, FakeMediaWikiServer
+
+
+class TestFakeMediaWiki(BaseSemanticMediawikiTest):
+    """
+    test the local MediaWiki API stand-in
+    """
+
+    def test_edit(self):
+        """
+        test reading and editing pages via mwclient
+        """
+        wiki = FakeMediaWiki(users={})
+        wiki.setPage("Help:Event", "old text")
+        with FakeMediaWikiServer(wiki) as server:
+            wikiClient = WikiClient.ofWikiUser(server.getWikiUser())
+            self.assertTrue(wikiClient.login())
+            page = wikiClient.getPage("Help:Event")
+            self.assertTrue(page.exists)
+            self.assertEqual("old text", page.text())
+            result = page.edit("new text", "test edit")
+            self.assertEqual("Success", result["result"])
+            result = page.edit("new text", "test edit")
+            self.assertIn("nochange", result)
+            missing = wikiClient.getPage("Help:City")
+            self.assertFalse(missing.exists)
+        self.assertEqual("new text", wiki.getText("Help:Event"))
+        self.assertEqual(1, wiki.stats["edit:saved"])
+        self.assertEqual(1, wiki.stats["edit:nochange"])
+
+    def test_failures(self):
+        """
+        test the injected failures
+        """
+        wiki = FakeMediaWiki(edit_rate_limit=1, lag=5, seed=1)
+        status, headers, result, _session = wiki.handle(
+            {"action": "query", "maxlag": "3"}, None
+        )
+        self.assertEqual(200, status)
+        self.assertEqual("maxlag", result["error"]["code"])
+        self.assertIn("Retry-After", headers)
+        self.assertFalse(wiki.isRateLimited("FakeBot"))
+        self.assertTrue(wiki.isRateLimited("FakeBot"))
+        failures = 0
+        wiki.error_rate = 0.5
+        for _i in range(100):
+            status, _headers, _result, _session = wiki.handle({"action": "query"}, None)
+            failures += 1 if status == 503 else 0
+        self.assertTrue(20 < failures < 80)
+
+    def test_ask(self):
+        """
+        test Semantic MediaWiki ask queries with alternatives
+        """
+        wiki = FakeMediaWiki()
+        for topic_name in ["Event", "City"]:
+            wiki.addAskResult(
+                f"[[Topic name::{topic_name}]]",
+                f"Concept:{topic_name}",
+                {"context": "Concept:TestContext"},
+            )
+        with FakeMediaWikiServer(wiki) as server:
+            wikiClient = WikiClient.ofWikiUser(server.getWikiUser())
+            smw = SMWClient(wikiClient.getSite())
+            records = smw.query(
+                "{{#ask: [[Topic name::Event||City]]|?Topic context=context}}"
+            )
+        self.assertEqual(["Concept:Event", "Concept:City"], list(records.keys()))
+        self.assertEqual("Concept:TestContext", records["Concept:City"]["context"])
+
+    def test_generateViaMwApi(self):
+        """
+        test generating the pages of a context via the fake wiki
+        """
+        wiki = FakeMediaWiki(latency=0.001)
+        with self.fakeWikiGen(wiki) as gen:
+            genResults = gen.generateViaMwApi(
+                target_names=["help", "template"], dryRun=False, jobs=2
+            )
+            self.assertEqual(6, len(genResults))
+            self.assertEqual(6, wiki.stats["edit:saved"])
+            genResults = gen.generateViaMwApi(
+                target_names=["help", "template"], dryRun=False, jobs=2
+            )
+            statuses = {genResult.getStatus() for genResult in genResults}
+            self.assertEqual({"unchanged"}, statuses)
+        self.assertEqual(6, wiki.stats["edit:saved"])
+        self.assertIn("Help for Event", wiki.getText("Help:Event"))
+
+    def test_collectPushPageTitles(self):
+        """
+        test collecting the pages to push with batched ask queries
+        """
+        wiki = FakeMediaWiki()
+        context = self.getSiDIFContext()
+        for topic_name, topic in context.topics.items():
+            for prop in topic.properties.values():
+                wiki.addAskResult(
+                    f"[[Property topic::Concept:{topic_name}]]",
+                    f"Property:{topic_name} {prop.name}",
+                )
+            wiki.addAskResult(
+                f"[[Topic name::{topic_name}]]",
+                f"Concept:{topic_name}",
+                {"context": "Concept:TestContext"},
+            )
+        with self.fakeWikiGen(wiki, context=context) as gen:
+            gen.smwSourceAccess = gen.smwAccess
+            wikiPush = WikiPush(fromWikiId=gen.wikiId, toWikiId=gen.wikiId)
+            topic_names = list(context.topics.keys())
+            page_titles = gen.collectPushPageTitles(wikiPush, topic_names)
+            self.assertEqual(2, wiki.stats["action:ask"])
+            concurrent_page_titles = gen.collectPushPageTitles(
+                wikiPush, topic_names, batch_size=1, jobs=3
+            )
+            self.assertEqual(8, wiki.stats["action:ask"])
+        # 6 pages per topic, 5 properties and the context
+        self.assertEqual(3 * 6 + 5 + 1, len(page_titles))
+        self.assertEqual(len(page_titles), len(set(page_titles)))
+        self.assertEqual(set(page_titles), set(concurrent_page_titles))
+        self.assertEqual("Concept:Item", page_titles[0])
+        self.assertIn("Property:Event city", page_titles)
+        self.assertEqual("Concept:TestContext", page_titles[-1])
@@ -0,0 +1,66 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import tempfile
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.file_writer import BulkFileWriter
+from yprinciple.genapi import GeneratorAPI
+
+
+class TestBulkFileWriter(BaseSemanticMediawikiTest):
+    """
+    test the atomic, content-aware bulk file writer
+    """
+
+    def test_write(self):
+        """
+        test that only changed content is written
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target_dir = f"{tmp_dir}/wiki/backup"
+            file_writer = BulkFileWriter(target_dir)
+            path, unchanged = file_writer.write("Help:Event.wiki", "Ä first")
+            self.assertFalse(unchanged)
+            self.assertEqual(f"{target_dir}/Help:Event.wiki", path)
+            mtime = 1_000_000_000
+            os.utime(path, (mtime, mtime))
+            _path, unchanged = file_writer.write("Help:Event.wiki", "Ä first")
+            self.assertTrue(unchanged)
+            self.assertEqual(mtime, os.stat(path).st_mtime)
+            # same size but other content
+            _path, unchanged = file_writer.write("Help:Event.wiki", "Ä secnd")
+            self.assertFalse(unchanged)
+            with open(path, encoding="utf-8") as wiki_file:
+                self.assertEqual("Ä secnd", wiki_file.read())
+            self.assertEqual(2, file_writer.written)
+            self.assertEqual(1, file_writer.unchanged)
+            # no temporary files are left behind
+            self.assertEqual(["Help:Event.wiki"], os.listdir(target_dir))
+            self.assertEqual(0o644, os.stat(path).st_mode & 0o777)
+            # replaced files keep their mode
+            os.chmod(path, 0o664)
+            file_writer.write("Help:Event.wiki", "Ä third")
+            self.assertEqual(0o664, os.stat(path).st_mode & 0o777)
+
+    def test_generateToFile(self):
+        """
+        test that a second generation does not touch the files
+        """
+        gen = GeneratorAPI(verbose=self.debug, debug=self.debug)
+        gen.context = self.getSiDIFContext()
+        with tempfile.TemporaryDirectory() as target_dir:
+            genResults = gen.generateToFile(target_dir=target_dir, dryRun=False)
+            self.assertTrue(len(genResults) > 0)
+            for genResult in genResults:
+                self.assertEqual("written", genResult.getStatus())
+            genResults = gen.generateToFile(target_dir=target_dir, dryRun=False)
+            for genResult in genResults:
+                self.assertEqual("unchanged", genResult.getStatus())
+            genResults = gen.generateToFile(target_dir=target_dir, dryRun=True)
+            for genResult in genResults:
+                self.assertEqual("dry run", genResult.getStatus())
@@ -0,0 +1,75 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import tempfile
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.genapi import GeneratorAPI
+
+
+class TestGenerationCache(BaseSemanticMediawikiTest):
+    """
+    test incremental generation
+    """
+
+    def setUp(self, debug=False, profile=True):
+        BaseSemanticMediawikiTest.setUp(self, debug=debug, profile=profile)
+        self.gen = GeneratorAPI(verbose=self.debug, debug=self.debug)
+        self.gen.context = self.getSiDIFContext()
+
+    def test_incremental_generateToFile(self):
+        """
+        test that an incremental run only generates changed cells
+        """
+        with tempfile.TemporaryDirectory() as target_dir:
+
+            def generate():
+                genResults = self.gen.generateToFile(
+                    target_dir=target_dir, dryRun=False, incremental=True
+                )
+                paths = [genResult.path for genResult in genResults]
+                return paths
+
+            paths = generate()
+            self.assertTrue(len(paths) > 20)
+            self.assertEqual([], generate())
+            # change the documentation of a single property
+            event = self.gen.context.topics["Event"]
+            event.properties["title"].documentation = "the full title of the event"
+            paths = generate()
+            names = [path.replace(f"{target_dir}/", "") for path in paths]
+            if self.debug:
+                print(names)
+            self.assertIn("Property:Event_title.wiki", names)
+            self.assertIn("Template:Event.wiki", names)
+            self.assertNotIn("Property:Event_acronym.wiki", names)
+            self.assertNotIn("Template:Item.wiki", names)
+            self.assertEqual([], generate())
+
+    def test_incremental_linkProperty(self):
+        """
+        test that an incremental run regenerating only a link property
+        gives the same markup as the full generation
+        """
+        with tempfile.TemporaryDirectory() as target_dir:
+            self.gen.generateToFile(
+                target_dir=target_dir, dryRun=False, incremental=True
+            )
+            path = os.path.join(target_dir, "Property:Event_city.wiki")
+            with open(path) as wiki_file:
+                expected = wiki_file.read()
+            self.assertIn("values_from=City", expected)
+            os.remove(path)
+            # a new run with a context that has not been generated yet
+            gen = GeneratorAPI(verbose=self.debug, debug=self.debug)
+            gen.context = self.getSiDIFContext()
+            genResults = gen.generateToFile(
+                target_dir=target_dir, dryRun=False, incremental=True
+            )
+            self.assertEqual([path], [genResult.path for genResult in genResults])
+            with open(path) as wiki_file:
+                self.assertEqual(expected, wiki_file.read())
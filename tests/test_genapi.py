@@ -0,0 +1,151 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.benchmark import ContextSynthesizer
+from yprinciple.fake_mediawiki import FakeMediaWiki
+from yprinciple.genapi import GeneratorAPI
+from yprinciple.smw_targets import FormTarget
+from yprinciple.ypcell import MarkupDiff, PageRef
+
+
+class TestGeneratorAPI(BaseSemanticMediawikiTest):
+    """
+    test the generator API with an offline context
+    """
+
+    def setUp(self, debug=False, profile=True):
+        BaseSemanticMediawikiTest.setUp(self, debug=debug, profile=profile)
+        self.gen = GeneratorAPI(verbose=self.debug, debug=self.debug)
+        self.gen.context = self.getSiDIFContext()
+
+    def test_workOnCells(self):
+        """
+        test that concurrent work on cells keeps the order of the cells
+        and skips failed cells
+        """
+        ypCells = list(self.gen.yieldYpCells("for test", target_names=["help"]))
+        page_titles = [ypCell.getPageTitle() for ypCell in ypCells]
+        failing = page_titles[1]
+
+        def cell_work(ypCell):
+            page_title = ypCell.getPageTitle()
+            if page_title == failing:
+                raise ValueError(f"{page_title} failed on purpose")
+            # let earlier cells finish later
+            time.sleep(0.01 * (len(page_titles) - page_titles.index(page_title)))
+            return page_title
+
+        expected = [page_title for page_title in page_titles if page_title != failing]
+        for jobs in [1, 4]:
+            results = [
+                result
+                for _ypCell, result in self.gen.workOnCells(
+                    ypCells, cell_work, jobs=jobs
+                )
+            ]
+            self.assertEqual(expected, results, f"jobs={jobs}")
+
+    def test_generateToFileInProcesses(self):
+        """
+        test that generating to files with worker processes
+        gives the same files as the sequential generation
+        """
+        self.assertEqual(
+            [["Item", "Event"], ["City"]], self.gen.partitionTopics(partitions=2)
+        )
+        self.assertEqual(
+            [["Event"], ["City"]],
+            self.gen.partitionTopics(["Event", "City"], partitions=4),
+        )
+        results = {}
+        for processes in [1, 2]:
+            with tempfile.TemporaryDirectory() as target_dir:
+                genResults = self.gen.generateToFile(
+                    target_dir=target_dir, dryRun=False, processes=processes
+                )
+                results[processes] = [
+                    (os.path.relpath(genResult.path, target_dir), genResult.markup)
+                    for genResult in genResults
+                ]
+                for genResult in genResults:
+                    self.assertTrue(os.path.isfile(genResult.path))
+        self.assertTrue(len(results[1]) > 0)
+        self.assertEqual(results[1], results[2])
+
+    def test_compactGenerateViaMwApi(self):
+        """
+        test that compact results and cells keep only revision ids,
+        sizes and hashes instead of pages and texts
+        """
+        wiki = FakeMediaWiki()
+        wiki.setPage("Help:Event", "outdated help")
+        with self.fakeWikiGen(wiki, gen=self.gen):
+            ypCells = list(self.gen.yieldYpCells("for test", target_names=["help"]))
+            self.assertFalse(hasattr(ypCells[0], "__dict__"))
+            genResults = self.gen.generateViaMwApi(
+                target_names=["help"], dryRun=False, compact=True
+            )
+            self.assertEqual(["edited"] * 3, [r.getStatus() for r in genResults])
+            for genResult in genResults:
+                self.assertFalse(hasattr(genResult, "__dict__"))
+                self.assertIsNone(genResult.markup)
+                self.assertIsNone(genResult.diff)
+                self.assertIsInstance(genResult.new_page, PageRef)
+                self.assertTrue(genResult.page_changed())
+                # the wiki has the generated markup
+                self.assertEqual(genResult.markup_hash, genResult.new_page.text_hash)
+            help_result = genResults[1]
+            self.assertEqual("Help:Event", help_result.new_page.title)
+            text = wiki.getText("Help:Event")
+            self.assertEqual(MarkupDiff.getHash(text), help_result.getMarkupHash())
+            self.assertEqual(len(text.encode("utf-8")), help_result.new_page.size)
+            self.assertEqual(
+                MarkupDiff.getHash("outdated help"), help_result.old_page.text_hash
+            )
+            self.assertIn("diff=", help_result.getDiffUrl())
+            # the cells only keep the status
+            ypCell = list(self.gen.yieldYpCells("for test", target_names=["help"]))[1]
+            ypCell.getPage(self.gen.smwAccess, compact=True)
+            self.assertIsNone(ypCell.pageText)
+            self.assertEqual(help_result.new_page.revision, ypCell.page.revision)
+            self.assertEqual("✅", ypCell.status)
+        self.assertEqual(3, wiki.stats["edit:saved"])
+
+    def test_parallelGenerateViaMwApi(self):
+        """
+        test that generating via the MediaWiki API with concurrent jobs
+        gives the same markup as the sequential generation
+        """
+        synthesizer = ContextSynthesizer(topics=20, links=20)
+        markups = {}
+        formTemplate_to = FormTarget.formTemplate_to
+
+        def slowFormTemplate_to(target, topic, isMultiple, sink):
+            # give concurrent property cells the chance to overtake the form
+            time.sleep(0.01)
+            formTemplate_to(target, topic, isMultiple, sink)
+
+        with (
+            self.fakeWikiGen(gen=self.gen),
+            patch.object(FormTarget, "formTemplate_to", slowFormTemplate_to),
+        ):
+            for jobs in [1, 8]:
+                # generating forms modifies the link properties of the context
+                self.gen.context = synthesizer.getContext()
+                markups[jobs] = [
+                    (ypCell.pageTitle, genResult.markup)
+                    for ypCell, genResult in self.gen.yieldViaMwApi(
+                        dryRun=True, jobs=jobs
+                    )
+                ]
+        self.assertTrue(len(markups[1]) > 0)
+        self.assertEqual(markups[1], markups[8])
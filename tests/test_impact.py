@@ -0,0 +1,221 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+
+from meta.metamodel import Context
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.context_diff import ContextDiff
+from yprinciple.genapi import GeneratorAPI
+from yprinciple.impact import DependencyGraph
+
+
+class TestImpact(BaseSemanticMediawikiTest):
+    """
+    test the change impact dependency graph
+    """
+
+    def getContext(self, replacements: dict = None) -> Context:
+        """
+        get the test context with the given text replacements in its SiDIF
+        """
+        sidif_path = os.path.join(
+            os.path.dirname(__file__), "resources", "TestContext.sidif"
+        )
+        with open(sidif_path) as sidif_file:
+            sidif = sidif_file.read()
+        for old, new in (replacements or {}).items():
+            self.assertIn(old, sidif)
+            sidif = sidif.replace(old, new)
+        context, error, _errMsg = Context.fromSiDIF(sidif, title="TestContext")
+        self.assertIsNone(error)
+        return context
+
+    def generate(
+        self, context: Context, changed_topics: list = None, target_names: list = None
+    ) -> dict:
+        """
+        generate the markup of all (or only the impacted) cells
+        """
+        gen = GeneratorAPI(verbose=False, debug=self.debug)
+        gen.context = context
+        markups = {
+            ypCell.getPageTitle(): ypCell.generateMarkup()
+            for ypCell in gen.selectYpCells(
+                "for test", target_names=target_names, changed_topics=changed_topics
+            )
+        }
+        return markups
+
+    def test_graph(self):
+        """
+        test the dependency graph of the test context
+        """
+        graph = DependencyGraph(self.getContext())
+        self.assertEqual({"Event"}, graph.extended_by["Item"])
+        self.assertEqual({"City", "Event"}, graph.linked_by["City"])
+        impact = graph.getImpact(["Item"])
+        self.assertEqual(["Event", "Item"], impact.getTopicNames())
+        # the list of and python pages include the inherited properties
+        self.assertIn("listOf", impact.topic_targets["Event"])
+        self.assertIn("python", impact.topic_targets["Event"])
+        # the property pages do not depend on their topic
+        self.assertEqual(set(), impact.properties)
+        impact = graph.getImpact(property_keys=["Event.title"])
+        self.assertEqual({("Event", "title")}, impact.properties)
+        self.assertIn("template", impact.topic_targets["City"])
+        # the list of and python pages do not show the linked topics
+        impact = graph.getImpact(["City"])
+        self.assertIn("template", impact.topic_targets["Event"])
+        self.assertNotIn("listOf", impact.topic_targets["Event"])
+        self.assertNotIn("python", impact.topic_targets["Event"])
+
+    def test_impact(self):
+        """
+        test that the impacted cells cover all changed pages
+        and are generated as in a full generation
+        """
+        for changed_topics, replacements in [
+            (["Item"], {"an item with a wikidata id": "an item"}),
+            (["Event.title"], {"the title of the event": "the event title"}),
+            (["City"], {'"a city"': '"a town"'}),
+            (["City.name"], {"the name of the city": "the city name"}),
+            (
+                ["Item.qid"],
+                {
+                    '"External identifier" is type of it': '"External identifier" is type of it\n1 is sortPos of it'
+                },
+            ),
+        ]:
+            old_markups = self.generate(self.getContext())
+            new_markups = self.generate(self.getContext(replacements))
+            changed = {
+                page_title
+                for page_title, markup in new_markups.items()
+                if old_markups[page_title] != markup
+            }
+            impacted = self.generate(self.getContext(replacements), changed_topics)
+            if self.debug:
+                print(f"{changed_topics}: {len(impacted)} impacted {sorted(changed)}")
+            self.assertTrue(len(changed) > 0)
+            self.assertTrue(
+                changed.issubset(impacted.keys()),
+                f"{changed_topics}: {sorted(changed - impacted.keys())} missing",
+            )
+            self.assertTrue(len(impacted) < len(new_markups))
+            for page_title, markup in impacted.items():
+                self.assertEqual(new_markups[page_title], markup, page_title)
+        # link properties get their values from the form target
+        # even if the form is not generated
+        # only the link property referring to the changed topic
+        impacted = self.generate(self.getContext(), ["City"], ["properties"])
+        self.assertEqual(["Property:Event city"], sorted(impacted))
+        self.assertEqual(
+            new_markups["Property:Event city"], impacted["Property:Event city"]
+        )
+        self.assertIn("values_from=City", impacted["Property:Event city"])
+
+    def test_context_diff(self):
+        """
+        test the structural diff of two versions of a context
+        """
+        old_context = self.getContext()
+        new_context = self.getContext(
+            {
+                '"a city"': '"a town"',
+                '"the title of the event" is documentation of it': '"the event title" is documentation of it',
+                "Item_qid isA Property": "Item_wikidata isA Property",
+                '"qid" is name of it': '"wikidataid" is name of it',
+            }
+        )
+        gen = GeneratorAPI(verbose=False, debug=self.debug)
+        gen.context = new_context
+        diff = gen.getContextDiff(old_context)
+        if self.debug:
+            print(diff.getSummary())
+        self.assertEqual(["City"], diff.changed_topics)
+        self.assertEqual(["Item.wikidataid"], diff.added_properties)
+        self.assertEqual(["Item.qid"], diff.removed_properties)
+        self.assertEqual(["Event.title"], diff.changed_properties)
+        self.assertEqual(["Property:Item qid"], diff.orphaned_pages)
+        changes = diff.getChanges(new_context)
+        self.assertEqual(["City", "Item.wikidataid", "Event.title", "Item"], changes)
+        # the affected cells cover all changed pages
+        old_markups = self.generate(self.getContext())
+        new_markups = self.generate(new_context)
+        impacted = self.generate(new_context, changes)
+        changed = {
+            page_title
+            for page_title, markup in new_markups.items()
+            if old_markups.get(page_title) != markup
+        }
+        self.assertTrue(changed.issubset(impacted.keys()))
+        self.assertTrue(len(impacted) < len(new_markups))
+        # no difference - nothing to generate
+        diff = ContextDiff.compare(old_context, self.getContext())
+        self.assertTrue(diff.isEmpty())
+        self.assertEqual([], diff.getChanges(old_context))
+        self.assertEqual({}, self.generate(old_context, []))
+
+    def test_inherited_context_diff(self):
+        """
+        test that a diff changing a property of a base topic regenerates
+        the pages of the extending topics that include it
+        """
+        new_context = self.getContext(
+            {
+                '"External identifier" is type of it': '"External identifier" is type of it\n1 is sortPos of it'
+            }
+        )
+        diff = ContextDiff.compare(self.getContext(), new_context)
+        self.assertEqual(["Item.qid"], diff.changed_properties)
+        changes = diff.getChanges(new_context)
+        self.assertEqual(["Item.qid"], changes)
+        old_markups = self.generate(self.getContext())
+        new_markups = self.generate(new_context)
+        impacted = self.generate(new_context, changes)
+        changed = {
+            page_title
+            for page_title, markup in new_markups.items()
+            if old_markups.get(page_title) != markup
+        }
+        self.assertIn("List of Events", changed)
+        self.assertIn("Python:Event", changed)
+        self.assertTrue(changed.issubset(impacted.keys()))
+        for page_title, markup in impacted.items():
+            self.assertEqual(new_markups[page_title], markup, page_title)
+
+    def test_same_link_names_context_diff(self):
+        """
+        test that the changes of links sharing a name are all reported
+        """
+
+        def getContext(events_multiple: str, home_multiple: str) -> Context:
+            item_link = f"""Item_in_City isA TopicLink
+"eventInCity" is name of it
+"item" is sourceRole of it
+false is sourceMultiple of it
+"Item" is source of it
+"homeCity" is targetRole of it
+{home_multiple} is targetMultiple of it
+"City" is target of it
+City_name isA Property"""
+            return self.getContext(
+                {
+                    "City_name isA Property": item_link,
+                    '"events" is targetRole of it\ntrue': f'"events" is targetRole of it\n{events_multiple}',
+                }
+            )
+
+        old_context = getContext("true", "false")
+        for new_context, link_key, topic_names in [
+            (getContext("false", "false"), "City.city-Event.events", ["City", "Event"]),
+            (getContext("true", "true"), "Item.item-City.homeCity", ["Item", "City"]),
+        ]:
+            diff = ContextDiff.compare(old_context, new_context)
+            self.assertEqual([link_key], diff.changed_links)
+            self.assertEqual(topic_names, diff.link_topics[link_key])
@@ -0,0 +1,90 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple import metrics
+from yprinciple.fake_mediawiki import FakeMediaWiki
+from yprinciple.tracing import tracer
+
+
+class TestMetrics(BaseSemanticMediawikiTest):
+    """
+    test the Prometheus style generation metrics
+    """
+
+    def test_exposition(self):
+        """
+        test the Prometheus text exposition format
+        """
+        counter = metrics.CounterMetric("test_total", "a test counter", ("target",))
+        counter.inc(target="Help")
+        counter.inc(2, target='Tem"plate')
+        self.assertEqual(
+            """# HELP test_total a test counter
+# TYPE test_total counter
+test_total{target="Help"} 1
+test_total{target="Tem\\"plate"} 2""",
+            counter.toPrometheus(),
+        )
+        histogram = metrics.HistogramMetric(
+            "test_seconds", "a test histogram", buckets=(1, 5)
+        )
+        for value in [0.5, 2, 10]:
+            histogram.observe(value)
+        self.assertEqual(
+            [
+                'test_seconds_bucket{le="1"} 1',
+                'test_seconds_bucket{le="5"} 2',
+                'test_seconds_bucket{le="+Inf"} 3',
+                "test_seconds_sum 12.5",
+                "test_seconds_count 3",
+            ],
+            histogram.getSamples(),
+        )
+
+    def test_generationMetrics(self):
+        """
+        test the metrics of generation runs against the fake wiki
+        """
+        wiki = FakeMediaWiki()
+        gen_metrics = metrics.GenerationMetrics()
+        gen_metrics.attach(tracer)
+        # attaching again does not count twice
+        gen_metrics.attach(tracer)
+        active_jobs = []
+
+        def on_start(_span):
+            active_jobs.append(gen_metrics.active_jobs.get(job="generate via api"))
+
+        def on_end(_span):
+            pass
+
+        tracer.addListener(on_end, on_start=on_start)
+        try:
+            with self.fakeWikiGen(wiki) as gen:
+                for dryRun in [False, False, True]:
+                    gen.generateViaMwApi(
+                        target_names=["help", "template"], dryRun=dryRun, jobs=2
+                    )
+        finally:
+            gen_metrics.detach(tracer)
+            tracer.removeListener(on_end, on_start=on_start)
+        self.assertFalse(tracer.enabled)
+        self.assertEqual(9, gen_metrics.cells_generated.get(target="Help"))
+        self.assertEqual(9, gen_metrics.cells_generated.get(target="Template"))
+        self.assertEqual(6, gen_metrics.edits.get(result="performed"))
+        self.assertEqual(6, gen_metrics.edits.get(result="skipped"))
+        # no edits are needed for the unchanged pages of the dry run
+        self.assertEqual(6, gen_metrics.edits.get(result="dry_run_unchanged"))
+        self.assertEqual(1, max(active_jobs))
+        self.assertEqual(0, gen_metrics.active_jobs.get(job="generate via api"))
+        # the prefetched pages and the refetch after each edit
+        self.assertEqual(18, gen_metrics.page_fetch.getCount(cached=True))
+        self.assertEqual(6, gen_metrics.page_fetch.getCount(cached=False))
+        text = gen_metrics.toPrometheus()
+        self.assertIn('ypgen_cells_generated_total{target="Help"} 9', text)
+        self.assertIn('ypgen_edits_total{result="performed"} 6', text)
+        self.assertIn("# TYPE ypgen_page_fetch_seconds histogram", text)
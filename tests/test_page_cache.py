@@ -0,0 +1,76 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from tests.basetest import Basetest
+from yprinciple.page_cache import PageCache
+
+
+class CannedSite:
+    """
+    a site answering query API calls from a dict of page texts
+    """
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.rights = ["read", "edit"]
+        self.calls = []
+
+    def get(self, action: str, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        pages = {}
+        for i, title in enumerate(kwargs["titles"].split("|")):
+            if title in self.pages:
+                pages[str(i + 1)] = {
+                    "pageid": i + 1,
+                    "ns": 0,
+                    "title": title,
+                    "lastrevid": 100 + i,
+                    "length": len(self.pages[title]),
+                    "revisions": [
+                        {
+                            "revid": 100 + i,
+                            "timestamp": "2026-10-18T12:00:00Z",
+                            "slots": {"main": {"*": self.pages[title]}},
+                        }
+                    ],
+                }
+            else:
+                pages[str(-i - 1)] = {"ns": 0, "title": title, "missing": ""}
+        return {"query": {"pages": pages}}
+
+
+class TestPageCache(Basetest):
+    """
+    test prefetching pages in batches
+    """
+
+    def test_prefetch(self):
+        """
+        test that pages are fetched in batches and served from the cache
+        """
+        texts = {f"Page {i}": f"text of page {i}" for i in range(120)}
+        site = CannedSite(texts)
+        page_cache = PageCache(site)
+        self.assertEqual(50, page_cache.batch_size)
+        page_titles = list(texts.keys()) + ["Missing page", "Page 0"]
+        queries = page_cache.prefetch(page_titles)
+        self.assertEqual(3, queries)
+        self.assertEqual(3, len(site.calls))
+        self.assertEqual(121, len(page_cache))
+        record = page_cache.get("Page 7")
+        self.assertTrue(record.exists)
+        self.assertEqual("text of page 7", record.text)
+        missing = page_cache.get("Missing page")
+        self.assertFalse(missing.exists)
+        self.assertIsNone(missing.text)
+        page = page_cache.getPage("Page 7")
+        self.assertTrue(page.exists)
+        self.assertEqual(107, page.revision)
+        self.assertIsNotNone(page.last_rev_time)
+        # no further API calls needed
+        self.assertEqual(3, len(site.calls))
+        page_cache.invalidate("Page 7")
+        self.assertIsNone(page_cache.get("Page 7"))
@@ -0,0 +1,91 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import asyncio
+import os
+import pstats
+import tempfile
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.fake_mediawiki import FakeMediaWiki
+from yprinciple.profiler import HotPathProfiler
+from yprinciple.tracing import tracer
+
+
+class TestHotPathProfiler(BaseSemanticMediawikiTest):
+    """
+    test profiling generation runs per target and phase
+    """
+
+    def test_profileGenerateViaMwApi(self):
+        """
+        test profiling a generation run against the fake wiki
+        """
+        wiki = FakeMediaWiki()
+        wiki.setPage("Help:Event", "outdated help")
+        profiler = HotPathProfiler(top_n=5)
+        with self.fakeWikiGen(wiki) as gen:
+            profiler.start()
+            try:
+                genResults = gen.generateViaMwApi(
+                    target_names=["help", "template"], dryRun=False
+                )
+                # the diff is computed lazily outside of the cell
+                diffs = [
+                    genResult.diff
+                    for genResult in genResults
+                    if genResult.diff is not None
+                ]
+                self.assertEqual(1, len(diffs))
+                self.assertIn("outdated help", diffs[0].text)
+            finally:
+                profiler.stop()
+        self.assertFalse(tracer.enabled)
+        for key, calls in [
+            (("TemplateTarget", "generate"), 3),
+            (("HelpTarget", "generate"), 3),
+            (("HelpTarget", "fetch"), 6),
+            (("TemplateTarget", "edit"), 3),
+            (("HelpTarget", "diff"), 1),
+        ]:
+            self.assertEqual(calls, profiler.wall_times[key][0], key)
+            self.assertIn(key, profiler.profiles)
+        self.assertIn("generate", profiler.getTopReport(("TemplateTarget", "generate")))
+        phase_report = profiler.getPhaseReport()
+        self.assertIn("TemplateTarget", phase_report)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ypgen.pstats")
+            report = profiler.save(path)
+            self.assertIn("top 5 hot functions", report)
+            stats = pstats.Stats(path)
+            self.assertTrue(stats.total_calls > 0)
+            self.assertTrue(os.path.isfile(f"{path}.txt"))
+        if self.debug:
+            print(report)
+
+    def test_interleavedSpans(self):
+        """
+        test that the interleaved spans of concurrent tasks
+        do not leak entries of the profile stack
+        """
+        profiler = HotPathProfiler()
+
+        async def edit(target: str, delay: float):
+            with tracer.span("edit", target=target):
+                await asyncio.sleep(delay)
+
+        async def run():
+            # the edit of the template starts first and ends first
+            await asyncio.gather(edit("Template", 0.01), edit("Form", 0.02))
+
+        profiler.start()
+        try:
+            asyncio.run(run())
+            self.assertEqual([], profiler.stack)
+        finally:
+            profiler.stop()
+        self.assertEqual(1, profiler.wall_times[("TemplateTarget", "edit")][0])
+        self.assertEqual(1, profiler.wall_times[("FormTarget", "edit")][0])
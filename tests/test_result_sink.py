@@ -0,0 +1,87 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import io
+import json
+import os
+import tempfile
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.fake_mediawiki import FakeMediaWiki
+from yprinciple.genapi import GeneratorAPI
+from yprinciple.result_sink import ResultSink
+
+
+class TestResultSink(BaseSemanticMediawikiTest):
+    """
+    test streaming generation results as NDJSON
+    """
+
+    def getRecords(self, stream: io.StringIO) -> list:
+        """
+        get the records of the given NDJSON stream
+        """
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        return records
+
+    def test_yieldToFile(self):
+        """
+        test streaming the results of generating to files
+        """
+        gen = GeneratorAPI(verbose=False, debug=self.debug)
+        gen.context = self.getSiDIFContext()
+        for processes in [1, 2]:
+            with tempfile.TemporaryDirectory() as target_dir:
+                stream = io.StringIO()
+                sink = ResultSink(stream)
+                count = sink.writeAll(
+                    gen.yieldToFile(
+                        target_dir=target_dir,
+                        target_names=["help", "properties"],
+                        dryRun=False,
+                        processes=processes,
+                    )
+                )
+                records = self.getRecords(stream)
+                self.assertEqual(count, len(records))
+                help_records = [r for r in records if r["target"] == "Help"]
+                self.assertEqual(3, len(help_records), f"processes={processes}")
+                record = help_records[1]
+                self.assertEqual("Event", record["topic"])
+                self.assertEqual("Help:Event", record["page"])
+                self.assertEqual("written", record["status"])
+                self.assertTrue(os.path.isfile(record["path"]))
+                property_records = [r for r in records if "property" in r]
+                self.assertTrue(len(property_records) > 0)
+                for record in property_records:
+                    self.assertEqual("Property", record["target"])
+
+    def test_yieldViaMwApi(self):
+        """
+        test that the results via the MediaWiki API are yielded
+        while the generation is still in progress
+        """
+        wiki = FakeMediaWiki()
+        wiki.setPage("Help:Event", "outdated help")
+        with self.fakeWikiGen(wiki) as gen:
+            stream = io.StringIO()
+            sink = ResultSink(stream, with_markup=True)
+            results = gen.yieldViaMwApi(target_names=["help"], dryRun=False)
+            for i, (ypCell, genResult) in enumerate(results):
+                # only the cells up to the current one have been edited
+                self.assertEqual(i + 1, wiki.stats["edit:saved"])
+                sink.write(ypCell, genResult)
+            records = self.getRecords(stream)
+            self.assertEqual(["edited"] * 3, [r["status"] for r in records])
+            record = records[1]
+            self.assertEqual("Help:Event", record["page"])
+            self.assertIn("diff=", record["diff_url"])
+            self.assertNotEqual(record["old_revision"], record["new_revision"])
+            self.assertEqual("+", record["diff"][0])
+            self.assertIn("Help for Event", record["markup"])
+            self.assertEqual(
+                len(record["markup"].encode("utf-8")), record["markup_size"]
+            )
@@ -0,0 +1,104 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import io
+import os
+
+from meta.metamodel import Context
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.smw_targets import SMWTarget
+
+
+class TestSMWTargets(BaseSemanticMediawikiTest):
+    """
+    test the Semantic MediaWiki targets without a wiki
+    """
+
+    def setUp(self, debug=False, profile=True):
+        BaseSemanticMediawikiTest.setUp(self, debug=debug, profile=profile)
+        self.context = self.getSiDIFContext()
+
+    def test_generate_to(self):
+        """
+        test that streaming the markup to a sink gives the same result
+        as generating the markup as a string
+        """
+        targets = SMWTarget.getSMWTargets()
+        for topic in self.context.topics.values():
+            for target_key, target in targets.items():
+                if target.is_multi:
+                    continue
+                if target_key == "property":
+                    model_elements = list(topic.properties.values())
+                else:
+                    model_elements = [topic]
+                for model_element in model_elements:
+                    markup = target.generate(model_element)
+                    sink = io.StringIO()
+                    target.generate_to(model_element, sink)
+                    self.assertEqual(
+                        markup, sink.getvalue(), f"{target_key}:{model_element.name}"
+                    )
+
+    def test_fragment_cache(self):
+        """
+        test that the uml fragments are memoized per context
+        """
+        targets = SMWTarget.getSMWTargets()
+        fragment_cache = targets["category"].fragment_cache
+        event = self.context.topics["Event"]
+        markups = {}
+        for target_key in ["category", "concept", "help"]:
+            markups[target_key] = targets[target_key].generate(event)
+        # Event, its extends topic Item and the skin params
+        self.assertEqual(3, fragment_cache.misses)
+        self.assertEqual(3, len(fragment_cache.fragments))
+        self.assertEqual(4, fragment_cache.hits)
+        # the markup is the same as without a fragment cache
+        for target_key in ["category", "concept", "help"]:
+            target = targets[target_key]
+            target.fragment_cache = None
+            self.assertEqual(markups[target_key], target.generate(event))
+        # another context invalidates the fragments
+        other_context = self.getSiDIFContext()
+        targets["concept"].fragment_cache = fragment_cache
+        targets["concept"].generate(other_context.topics["City"])
+        self.assertIs(other_context, fragment_cache.context)
+        self.assertNotIn(("plantUmlClass", "Event"), fragment_cache.fragments)
+
+    def test_same_link_names(self):
+        """
+        test that the uml relations of links sharing a name are not mixed up
+        """
+        sidif_path = os.path.join(
+            os.path.dirname(__file__), "resources", "TestContext.sidif"
+        )
+        with open(sidif_path) as sidif_file:
+            sidif = sidif_file.read()
+        sidif += """Item_in_City isA TopicLink
+"eventInCity" is name of it
+"item" is sourceRole of it
+false is sourceMultiple of it
+"Item" is source of it
+"homeCity" is targetRole of it
+false is targetMultiple of it
+"City" is target of it
+"""
+        context, error, _errMsg = Context.fromSiDIF(sidif, title="TestContext")
+        self.assertIsNone(error)
+        targets = SMWTarget.getSMWTargets()
+        for target_key in ["category", "concept", "help"]:
+            target = targets[target_key]
+            for topic_name in ["City", "Item"]:
+                topic = context.topics[topic_name]
+                markup = target.generate(topic)
+                if topic_name == "Item":
+                    self.assertIn('Item "item (1)" -- "homeCity(1)" City', markup)
+                fragment_cache = target.fragment_cache
+                target.fragment_cache = None
+                self.assertEqual(target.generate(topic), markup, topic_name)
+                target.fragment_cache = fragment_cache
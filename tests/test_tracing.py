@@ -0,0 +1,86 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import tempfile
+
+from tests.basesmwtest import BaseSemanticMediawikiTest
+from yprinciple.genapi import GeneratorAPI
+from yprinciple.tracing import Tracer, tracer
+
+
+class TestTracing(BaseSemanticMediawikiTest):
+    """
+    test the span tracing of generation runs
+    """
+
+    def test_spans(self):
+        """
+        test nesting, attributes and the Chrome trace export of spans
+        """
+        test_tracer = Tracer()
+        # not enabled - spans are not recorded
+        with test_tracer.span("ignored") as span:
+            span.set(size=1)
+        self.assertEqual([], test_tracer.getSpans())
+        finished = []
+        test_tracer.addListener(finished.append)
+        test_tracer.start()
+        with test_tracer.span("cell", category="cell", target="Help") as cell_span:
+            with test_tracer.span("fetch", page="Help:Event") as fetch_span:
+                fetch_span.set(size=42)
+        with self.assertRaises(ValueError):
+            with test_tracer.span("edit"):
+                raise ValueError("edit failed")
+        test_tracer.stop()
+        self.assertEqual(["fetch", "cell", "edit"], [span.name for span in finished])
+        self.assertIs(cell_span, fetch_span.parent)
+        self.assertEqual(1, fetch_span.getDepth())
+        self.assertEqual({"page": "Help:Event", "size": 42}, fetch_span.attributes)
+        self.assertEqual("ValueError", finished[2].attributes["error"])
+        trace = test_tracer.toChromeTrace()
+        events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(["cell", "fetch", "edit"], [event["name"] for event in events])
+        cell_event, fetch_event = events[0], events[1]
+        self.assertEqual("cell", cell_event["cat"])
+        self.assertEqual("42", fetch_event["args"]["size"])
+        self.assertTrue(cell_event["ts"] <= fetch_event["ts"])
+        self.assertTrue(
+            fetch_event["ts"] + fetch_event["dur"]
+            <= cell_event["ts"] + cell_event["dur"]
+        )
+        self.assertIn("fetch: 1x", test_tracer.getSummary())
+
+    def test_traceGenerateToFile(self):
+        """
+        test tracing a generation run to files
+        """
+        gen = GeneratorAPI(verbose=self.debug, debug=self.debug)
+        gen.context = self.getSiDIFContext()
+        tracer.start()
+        try:
+            with tempfile.TemporaryDirectory() as target_dir:
+                genResults = gen.generateToFile(
+                    target_dir=target_dir, target_names=["help"], dryRun=False
+                )
+        finally:
+            tracer.stop()
+        cell_spans = tracer.getSpans("cell")
+        self.assertEqual(len(genResults), len(cell_spans))
+        self.assertEqual("Help", cell_spans[0].attributes["target"])
+        for name in ["generate", "write"]:
+            spans = tracer.getSpans(name)
+            self.assertEqual(len(genResults), len(spans), name)
+            for span in spans:
+                self.assertEqual("cell", span.parent.name)
+                self.assertTrue(span.attributes["size"] > 0)
+        run_span = tracer.getSpans("generate to file")[0]
+        self.assertEqual(run_span, tracer.getSpans("target filter")[0].parent)
+        with tempfile.NamedTemporaryFile(suffix=".json") as trace_file:
+            tracer.save(trace_file.name)
+            with open(trace_file.name) as json_file:
+                trace = json.load(json_file)
+        self.assertTrue(len(trace["traceEvents"]) > 2 * len(genResults))
@@ -0,0 +1,52 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from tests.basetest import Basetest
+from yprinciple.ui_coalescer import UpdateCoalescer
+
+
+class Counting:
+    """
+    an element or progress bar that counts its updates
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.value = 0
+
+    def update(self, steps: int = None):
+        self.updates += 1
+        if steps is not None:
+            self.value += steps
+
+
+class TestUpdateCoalescer(Basetest):
+    """
+    test coalescing of user interface updates
+    """
+
+    def test_coalesce(self):
+        """
+        test that many changes lead to few updates at a bounded rate
+        """
+        now = [0.0]
+        ui_updates = UpdateCoalescer(min_interval=0.1, clock=lambda: now[0])
+        grid = Counting()
+        progress_bar = Counting()
+        # 1000 cells within 0.5 seconds
+        for _i in range(1000):
+            ui_updates.add_progress(progress_bar)
+            ui_updates.mark_dirty(grid)
+            now[0] += 0.0005
+        ui_updates.flush()
+        self.assertEqual(1000, progress_bar.value)
+        self.assertTrue(grid.updates <= 7, grid.updates)
+        self.assertTrue(progress_bar.updates <= 7, progress_bar.updates)
+        self.assertEqual(2000, ui_updates.requested)
+        # nothing pending - no further updates
+        ui_updates.flush()
+        self.assertEqual(1000, progress_bar.value)
+        self.assertTrue(grid.updates <= 7)
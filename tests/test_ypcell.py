@@ -0,0 +1,73 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from wikibot3rd.wikipush import WikiPush
+
+from tests.basetest import Basetest
+from yprinciple.ypcell import MarkupDiff, MwGenResult, YpCell
+
+
+class TestYpCell(Basetest):
+    """
+    test YpCell handling that does not need a wiki
+    """
+
+    def test_isUnchanged(self):
+        """
+        test the comparison of generated markup with the current page text
+        """
+        markup = "== Help ==\nsome text  \n\n"
+        test_cases = [
+            # pageText, ignore_whitespace, expected
+            (None, False, False),
+            (None, True, False),
+            (markup, False, True),
+            ("== Help ==\nsome text", False, False),
+            ("== Help ==\nsome text", True, True),
+            ("== Help ==\r\nsome text\r\n", True, True),
+            ("== Help ==\nother text", True, False),
+        ]
+        for pageText, ignore_whitespace, expected in test_cases:
+            unchanged = YpCell.isUnchanged(pageText, markup, ignore_whitespace)
+            self.assertEqual(expected, unchanged, f"{pageText!r} {ignore_whitespace}")
+
+    def test_markupDiff(self):
+        """
+        test the lazy, bounded markup diff
+        """
+        old_text = "\n".join(f"line {i}" for i in range(100))
+        # equal texts are not diffed
+        diff = MarkupDiff(old_text, str(old_text))
+        self.assertTrue(diff.isEqual())
+        self.assertEqual("", diff.text)
+        self.assertEqual("+0/-0", diff.getStats())
+        # the diff is only computed when accessed
+        new_text = old_text.replace("line 1\n", "line one\n").replace(
+            "line 50", "line fifty"
+        )
+        diff = MarkupDiff(old_text, new_text)
+        self.assertFalse(diff.computed)
+        self.assertEqual(WikiPush.getDiff(old_text, new_text), diff.text)
+        self.assertTrue(diff.computed)
+        self.assertEqual("+2/-2", diff.getStats())
+        # the text is truncated but the stats cover the full diff
+        new_text = "\n".join(f"changed {i}" for i in range(100))
+        diff = MarkupDiff(old_text, new_text, max_lines=10)
+        diff_lines = diff.text.split("\n")
+        self.assertEqual(11, len(diff_lines))
+        self.assertEqual("... 190 more diff lines truncated", diff_lines[-1])
+        self.assertEqual("+100/-100", diff.getStats())
+        # without a page the "diff" is the markup itself
+        diff = MarkupDiff(None, new_text)
+        self.assertFalse(diff.isEqual())
+        self.assertEqual(new_text, diff.text)
+        # the generation result exposes the diff text
+        genResult = MwGenResult(
+            markup=new_text, old_page=None, new_page=None, diff=diff
+        )
+        self.assertEqual(new_text, genResult.markup_diff)
+        genResult = MwGenResult(markup=new_text, old_page=None, new_page=None)
+        self.assertEqual("", genResult.markup_diff)
@@ -0,0 +1,482 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from mwclient.errors import APIError
+from requests.auth import HTTPBasicAuth, HTTPDigestAuth
+
+from yprinciple.edit_scheduler import EditScheduler
+from yprinciple.genapi import GeneratorAPI
+from yprinciple.page_cache import PageCache
+from yprinciple.tracing import tracer
+from yprinciple.version import Version
+from yprinciple.ypcell import MarkupDiff, MwGenResult, YpCell
+
+
+class AsyncMwApi:
+    """
+    non-blocking access to the MediaWiki action API
+
+    shares the login session of an mwclient site and limits the number
+    of requests in flight with a semaphore
+    """
+
+    def __init__(
+        self,
+        site,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+        max_retries: int = 5,
+        debug: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            site(mwclient.Site): the (logged in) site whose session to use
+            concurrency(int): the maximum number of requests in flight
+            timeout(float): the timeout of a single request in seconds
+            max_retries(int): the number of retries on lag and server errors
+            debug(bool): if True show debug messages
+        """
+        self.site = site
+        self.url = f"{site.scheme}://{site.host}{site.path}api{site.ext}"
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.debug = debug
+        self.client: Optional[httpx.AsyncClient] = None
+        self.request_count = 0
+
+    async def __aenter__(self) -> "AsyncMwApi":
+        connection = self.site.connection
+        self.client = httpx.AsyncClient(
+            cookies=httpx.Cookies(connection.cookies),
+            headers=dict(connection.headers),
+            auth=self.getAuth(connection.auth),
+            timeout=self.timeout,
+        )
+        return self
+
+    @staticmethod
+    def getAuth(auth) -> Optional[httpx.Auth]:
+        """
+        get the httpx equivalent of the given requests auth of an mwclient connection
+
+        Args:
+            auth: the auth of the requests session e.g. for mwclient's httpauth
+
+        Returns:
+            httpx.Auth: the auth to use or None if there is none
+
+        Raises:
+            ValueError: if there is no httpx equivalent of the auth
+        """
+        if auth is None:
+            return None
+        if isinstance(auth, tuple):
+            return httpx.BasicAuth(*auth)
+        if isinstance(auth, HTTPDigestAuth):
+            return httpx.DigestAuth(auth.username, auth.password)
+        if isinstance(auth, HTTPBasicAuth):
+            return httpx.BasicAuth(auth.username, auth.password)
+        raise ValueError(f"{type(auth).__name__} is not supported for async access")
+
+    async def __aexit__(self, *_args):
+        await self.close()
+
+    async def close(self):
+        """
+        close my http client
+        """
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def call(self, action: str, http_method: str = "GET", **params) -> dict:
+        """
+        call the given API action
+
+        retries like mwclient when the database lag exceeds maxlag
+        or the server has a temporary failure
+
+        Args:
+            action(str): the API action e.g. query or edit
+            http_method(str): GET or POST
+            params: the parameters of the action
+
+        Returns:
+            dict: the JSON result
+
+        Raises:
+            APIError: if the API reports an error
+        """
+        data = {"action": action, "format": "json", "maxlag": self.site.max_lag}
+        data.update(params)
+        async with self.semaphore:
+            for retry in range(self.max_retries + 1):
+                self.request_count += 1
+                if http_method == "GET":
+                    response = await self.client.get(self.url, params=data)
+                else:
+                    response = await self.client.post(self.url, data=data)
+                lag = response.headers.get("x-database-lag")
+                if (lag or response.status_code >= 500) and retry < self.max_retries:
+                    wait_time = EditScheduler.getRetryAfter(response.headers)
+                    if wait_time is None:
+                        wait_time = 2**retry
+                    if self.debug:
+                        print(
+                            f"{action} HTTP {response.status_code} lag={lag} - retrying in {wait_time} s"
+                        )
+                    await asyncio.sleep(wait_time)
+                    continue
+                response.raise_for_status()
+                break
+        result = response.json()
+        if "error" in result:
+            error = result["error"]
+            raise APIError(error.get("code"), error.get("info"), params)
+        return result
+
+    async def getToken(self, token_type: str = "csrf") -> str:
+        """
+        get the token of the given type - reusing the token of the mwclient site if available
+        """
+        token = self.site.tokens.get(token_type)
+        # mwclient uses "0" as placeholder for tokens not fetched yet
+        if token in (None, "0"):
+            result = await self.call("query", meta="tokens", type=token_type)
+            token = result["query"]["tokens"][f"{token_type}token"]
+            self.site.tokens[token_type] = token
+        return token
+
+    async def fetchBatch(self, page_cache: PageCache, page_titles: List[str]) -> int:
+        """
+        fetch a single batch of page titles into the given page cache
+
+        Args:
+            page_cache(PageCache): the page cache to add the records to
+            page_titles(List[str]): the titles to fetch
+
+        Returns:
+            int: the number of query API calls needed
+        """
+        queries = 0
+        requested = {page_title: page_title for page_title in page_titles}
+        params = page_cache.getBatchParams(page_titles)
+        continue_params = {}
+        while continue_params is not None:
+            result = await self.call("query", **params, **continue_params)
+            queries += 1
+            continue_params = page_cache.addQueryResult(result, requested)
+        page_cache.query_count += queries
+        return queries
+
+    async def prefetch(self, page_cache: PageCache, page_titles: List[str]) -> int:
+        """
+        prefetch the given page titles in concurrent batches
+
+        Args:
+            page_cache(PageCache): the page cache to add the records to
+            page_titles(List[str]): the titles to fetch
+
+        Returns:
+            int: the number of query API calls needed
+        """
+        titles = list(dict.fromkeys(page_titles))
+        batch_size = page_cache.batch_size
+        batches = [
+            titles[i : i + batch_size] for i in range(0, len(titles), batch_size)
+        ]
+        query_counts = await asyncio.gather(
+            *[self.fetchBatch(page_cache, batch) for batch in batches]
+        )
+        return sum(query_counts)
+
+    async def edit(
+        self, page_title: str, text: str, summary: str, basetimestamp: str = None
+    ) -> dict:
+        """
+        edit the given page
+
+        Args:
+            page_title(str): the title of the page
+            text(str): the new text
+            summary(str): the edit summary
+            basetimestamp(str): the timestamp of the revision the edit is based on
+                for edit conflict detection
+
+        Returns:
+            dict: the edit result
+        """
+        params = {
+            "title": page_title,
+            "text": text,
+            "summary": summary,
+            "token": await self.getToken(),
+        }
+        if basetimestamp:
+            params["basetimestamp"] = basetimestamp
+        result = await self.call("edit", http_method="POST", **params)
+        edit_result = result.get("edit", {})
+        if edit_result.get("result") != "Success":
+            raise APIError(
+                edit_result.get("result"), f"edit of {page_title} failed", params
+            )
+        return edit_result
+
+
+class AsyncGeneratorAPI:
+    """
+    asyncio variant of the generator API
+
+    the markup is generated in cell order on the event loop while page fetches
+    and edits are awaited concurrently so that e.g. NiceGUI handlers can await
+    the generation directly instead of blocking a thread
+    """
+
+    def __init__(
+        self,
+        gen: GeneratorAPI,
+        concurrency: int = 8,
+        handleFailure: Callable[[YpCell, BaseException], None] = None,
+    ):
+        """
+        constructor
+
+        Args:
+            gen(GeneratorAPI): the generator API with context and smwAccess
+            concurrency(int): the maximum number of API requests in flight
+            handleFailure(Callable): the handler for failed cells -
+                default: the handleFailure of the generator API
+        """
+        self.gen = gen
+        self.concurrency = concurrency
+        if handleFailure is None:
+            handleFailure = gen.handleFailure
+        self.handleFailure = handleFailure
+
+    async def login(self):
+        """
+        make sure the wiki client of my generator API is logged in
+        """
+        await asyncio.to_thread(self.gen.smwAccess.wikiClient.login)
+
+    async def generateMarkups(self, ypCells: List[YpCell]) -> Dict[int, str]:
+        """
+        generate the markup for the given cells in order
+
+        the generation order matters since e.g. the form target
+        modifies properties used by later targets
+
+        Args:
+            ypCells(List[YpCell]): the cells to generate
+
+        Returns:
+            dict: the markup by index of the cell - failed cells are missing
+        """
+        markups = {}
+        for i, ypCell in enumerate(ypCells):
+            try:
+                markups[i] = ypCell.generateMarkup()
+            except Exception as ex:
+                self.handleFailure(ypCell, ex)
+            # give other tasks on the event loop a chance
+            await asyncio.sleep(0)
+        return markups
+
+    async def generateCell(
+        self,
+        api: AsyncMwApi,
+        ypCell: YpCell,
+        markup: str,
+        page_cache: PageCache,
+        dryRun: bool = True,
+        ignore_whitespace: bool = False,
+        compact: bool = False,
+    ) -> MwGenResult:
+        """
+        compare the given markup with the prefetched page of the given cell
+        and edit the page if needed
+
+        Args:
+            api(AsyncMwApi): the api to edit with
+            ypCell(YpCell): the cell
+            markup(str): the generated markup of the cell
+            page_cache(PageCache): the prefetched pages
+            dryRun(bool): if True do not edit
+            ignore_whitespace(bool): if True ignore trailing whitespace and line endings
+            compact(bool): if True keep only the revision ids, sizes and hashes
+
+        Returns:
+            MwGenResult: the result
+        """
+        with tracer.span(
+            "cell", category="cell", **ypCell.getTraceAttributes()
+        ) as cell_span:
+            if ypCell.hasPage() and ypCell.getPageTitle() not in page_cache:
+                # fetch pages that have not been prefetched without blocking the loop
+                await api.fetchBatch(page_cache, [ypCell.getPageTitle()])
+            old_page = ypCell.getPage(self.gen.smwAccess, page_cache=page_cache)
+            old_text = ypCell.pageText
+            new_page = None
+            new_text = None
+            diff = None
+            unchanged = ypCell.isUnchanged(ypCell.pageText, markup, ignore_whitespace)
+            if ypCell.pageText and not unchanged:
+                diff = MarkupDiff(
+                    ypCell.pageText, markup, attributes=ypCell.getTraceAttributes()
+                )
+            if unchanged and not dryRun:
+                # no-op edit avoided
+                pass
+            elif not dryRun and ypCell.page:
+                record = page_cache.get(ypCell.pageTitle)
+                with tracer.span("edit", page=ypCell.pageTitle, size=len(markup)):
+                    await api.edit(
+                        ypCell.pageTitle,
+                        markup,
+                        f"modified by {Version.name} {Version.version}",
+                        basetimestamp=record.timestamp if record else None,
+                    )
+                page_cache.invalidate(ypCell.pageTitle)
+                with tracer.span("refetch", page=ypCell.pageTitle):
+                    await api.fetchBatch(page_cache, [ypCell.pageTitle])
+                    new_page = page_cache.getPage(ypCell.pageTitle)
+                    new_record = page_cache.get(ypCell.pageTitle)
+                    new_text = new_record.text if new_record else None
+            else:
+                diff = MarkupDiff(None, markup)
+            genResult = MwGenResult(
+                markup=markup,
+                old_page=old_page,
+                new_page=new_page,
+                unchanged=unchanged,
+                diff=diff,
+            )
+            if compact:
+                genResult.compact(old_text, new_text)
+                ypCell.page = genResult.new_page or genResult.old_page
+                ypCell.pageText = None
+                if ypCell.pageTitle is not None:
+                    page_cache.invalidate(ypCell.pageTitle)
+            cell_span.set(status=genResult.getStatus(), dryRun=dryRun)
+        return genResult
+
+    async def yieldGenResults(
+        self,
+        ypCells: List[YpCell] = None,
+        target_names: list = None,
+        topic_names: list = None,
+        dryRun: bool = True,
+        ignore_whitespace: bool = False,
+        compact: bool = False,
+    ) -> AsyncIterator[Tuple[YpCell, MwGenResult]]:
+        """
+        generate the given cells (or the cells for the given target and topic names)
+        via the MediaWiki API
+
+        Args:
+            ypCells(list): the cells to generate - if None all cells of my
+                generator API matching the target and topic names
+            target_names(list): an optional list of target names
+            topic_names(list): an optional list of topic names
+            dryRun(bool): if True do not edit
+            ignore_whitespace(bool): if True ignore trailing whitespace and line endings
+            compact(bool): if True keep only the revision ids, sizes and hashes
+                of the pages and the markup and drop the prefetched page of
+                each finished cell
+
+        Yields:
+            tuple(YpCell,MwGenResult): the cells and their results in cell order -
+                failed cells are reported via handleFailure and skipped
+        """
+        if ypCells is None:
+            ypCells = self.gen.yieldYpCells(
+                "via async Mediawiki Api", target_names, topic_names
+            )
+        ypCells = [ypCell for ypCell in ypCells if not ypCell.target.is_multi]
+        await self.login()
+        site = self.gen.smwAccess.wikiClient.getSite()
+        page_cache = PageCache(site, debug=self.gen.debug)
+        async with AsyncMwApi(
+            site, concurrency=self.concurrency, debug=self.gen.debug
+        ) as api:
+            markups = await self.generateMarkups(ypCells)
+            page_titles = [
+                ypCell.getPageTitle()
+                for i, ypCell in enumerate(ypCells)
+                if i in markups and ypCell.hasPage()
+            ]
+            await api.prefetch(page_cache, page_titles)
+
+            async def collect(i: int, task: asyncio.Task) -> list:
+                try:
+                    return [(ypCells[i], await task)]
+                except Exception as ex:
+                    self.handleFailure(ypCells[i], ex)
+                    return []
+
+            # keep a bounded window of cells in flight as the sync path does
+            pending = deque()
+            try:
+                for i, markup in markups.items():
+                    task = asyncio.create_task(
+                        self.generateCell(
+                            api,
+                            ypCells[i],
+                            markup,
+                            page_cache,
+                            dryRun=dryRun,
+                            ignore_whitespace=ignore_whitespace,
+                            compact=compact,
+                        )
+                    )
+                    pending.append((i, task))
+                    if len(pending) >= 2 * self.concurrency:
+                        for result in await collect(*pending.popleft()):
+                            yield result
+                while pending:
+                    for result in await collect(*pending.popleft()):
+                        yield result
+            finally:
+                for _i, task in pending:
+                    task.cancel()
+
+    async def generateViaMwApi(
+        self,
+        target_names: list = None,
+        topic_names: list = None,
+        dryRun: bool = True,
+        ignore_whitespace: bool = False,
+        compact: bool = False,
+    ) -> List[MwGenResult]:
+        """
+        generate the cells for the given target and topic names via the MediaWiki API
+
+        Args:
+            see yieldGenResults
+
+        Returns:
+            list(MwGenResult): the results in cell order
+        """
+        genResults = [
+            genResult
+            async for _ypCell, genResult in self.yieldGenResults(
+                target_names=target_names,
+                topic_names=topic_names,
+                dryRun=dryRun,
+                ignore_whitespace=ignore_whitespace,
+                compact=compact,
+            )
+        ]
+        return genResults
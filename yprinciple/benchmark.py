@@ -0,0 +1,459 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass, field
+from typing import Callable, List, Tuple
+
+from meta.metamodel import Context
+from meta.mw import SMWAccess
+
+from yprinciple.fake_mediawiki import FakeMediaWiki, FakeMediaWikiServer
+from yprinciple.genapi import GeneratorAPI
+from yprinciple.smw_targets import SMWTarget
+from yprinciple.version import Version
+
+
+class ContextSynthesizer:
+    """
+    synthesize SiDIF contexts of configurable size for benchmarking
+    """
+
+    prop_types = ["Text", "Number", "Boolean", "Page", "External identifier", "Date"]
+
+    def __init__(
+        self,
+        topics: int = 10,
+        properties: int = 5,
+        links: int = 5,
+        extends_depth: int = 2,
+        name: str = "BenchmarkContext",
+    ):
+        """
+        constructor
+
+        Args:
+            topics(int): the number of topics
+            properties(int): the number of properties per topic
+            links(int): the number of topic links
+            extends_depth(int): the length of the extends chains
+            name(str): the name of the context
+        """
+        self.topics = topics
+        self.properties = properties
+        self.links = links
+        self.extends_depth = extends_depth
+        self.name = name
+
+    def getTopicName(self, index: int) -> str:
+        """
+        get the name of the topic with the given index
+        """
+        return f"Topic{index}"
+
+    def getExtends(self, index: int) -> str:
+        """
+        get the name of the topic the topic with the given index extends
+
+        topics are grouped in chains of extends_depth+1 topics where each
+        topic extends its predecessor
+
+        Returns:
+            str: the topic name or None for the root of a chain
+        """
+        if self.extends_depth > 0 and index % (self.extends_depth + 1) != 0:
+            return self.getTopicName(index - 1)
+        return None
+
+    def toSiDIF(self) -> str:
+        """
+        get the SiDIF markup of the synthetic context
+
+        Returns:
+            str: the SiDIF markup
+        """
+        lines = [
+            f"{self.name} isA Context",
+            f'"{self.name}" is name of it',
+            '"2026-01-01" is since of it',
+            '"http://contexts.bitplan.com" is master of it',
+        ]
+        for t in range(self.topics):
+            topic_name = self.getTopicName(t)
+            lines.extend(
+                [
+                    f"{topic_name} isA Topic",
+                    f'"{topic_name}" is name of it',
+                    f'"{topic_name}s" is pluralName of it',
+                    f'"File:{topic_name}_icon.png" is icon of it',
+                    f'"synthetic topic {t} for benchmarking" is documentation of it',
+                    f'"{self.name}" is context of it',
+                ]
+            )
+            extends = self.getExtends(t)
+            if extends:
+                lines.append(f'"{extends}" is extends of it')
+            for p in range(self.properties):
+                prop_type = self.prop_types[p % len(self.prop_types)]
+                lines.extend(
+                    [
+                        f"{topic_name}_prop{p} isA Property",
+                        f'"prop{p}" is name of it',
+                        f'"Prop {p}" is label of it',
+                        f'"property {p} of {topic_name}" is documentation of it',
+                        f'"{prop_type}" is type of it',
+                        f"{p + 1} is index of it",
+                        f'"{topic_name}" is topic of it',
+                    ]
+                )
+                if p == 0:
+                    lines.extend(["true is primaryKey of it", "1 is sortPos of it"])
+                elif p % 3 == 1:
+                    lines.extend(["true is mandatory of it", "40 is size of it"])
+                elif p % 3 == 2:
+                    lines.append('"textarea" is inputType of it')
+                if prop_type == "External identifier":
+                    lines.append('"https://example.org/$1" is formatterURI of it')
+        if self.topics > 0:
+            for l in range(self.links):
+                source = self.getTopicName(l % self.topics)
+                target = self.getTopicName((l + 1) % self.topics)
+                lines.extend(
+                    [
+                        f"{source}_link{l}_{target} isA TopicLink",
+                        f'"link{l}" is name of it',
+                        f'"source{l}" is sourceRole of it',
+                        "false is sourceMultiple of it",
+                        f'"{source}" is source of it',
+                        f'"targets{l}" is targetRole of it',
+                        f"{'true' if l % 2 == 0 else 'false'} is targetMultiple of it",
+                        f'"{target}" is target of it',
+                    ]
+                )
+                if l % 2 == 0:
+                    lines.append('";" is separator of it')
+        sidif = "\n".join(lines) + "\n"
+        return sidif
+
+    def getContext(self) -> Context:
+        """
+        get the synthetic context
+
+        Returns:
+            Context: the parsed context
+        """
+        context, error, errMsg = Context.fromSiDIF(self.toSiDIF(), title=self.name)
+        if error:
+            raise Exception(f"synthetic context {self.name} invalid: {errMsg}")
+        return context
+
+    def asDict(self) -> dict:
+        """
+        get my size parameters
+        """
+        size = {
+            "topics": self.topics,
+            "properties": self.properties,
+            "links": self.links,
+            "extends_depth": self.extends_depth,
+        }
+        return size
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    the throughput of a benchmarked generation
+    """
+
+    name: str
+    pages: int = 0
+    bytes: int = 0
+    # best wall clock time of all repetitions
+    seconds: float = 0.0
+    pages_per_s: float = 0.0
+    bytes_per_s: float = 0.0
+    peak_memory: int = 0
+    times: List[float] = field(default_factory=list)
+
+    def calcRates(self):
+        """
+        calculate the rates from the best time
+        """
+        self.seconds = min(self.times) if self.times else 0.0
+        if self.seconds > 0:
+            self.pages_per_s = self.pages / self.seconds
+            self.bytes_per_s = self.bytes / self.seconds
+
+
+class GenerationBenchmark:
+    """
+    measure the generation throughput of the SMW targets and of
+    GeneratorAPI.generateToFile for a given context without a wiki
+    """
+
+    def __init__(self, context: Context, repeat: int = 3, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            context(Context): the context to generate from
+            repeat(int): the number of repetitions - the best time is reported
+            debug(bool): if True show debug messages
+        """
+        self.context = context
+        self.repeat = max(1, repeat)
+        self.debug = debug
+
+    def measure(self, name: str, work: Callable[[], Tuple[int, int]]):
+        """
+        measure the given work
+
+        Args:
+            name(str): the name of the measurement
+            work(Callable): the work to do returning the number of pages and bytes
+
+        Returns:
+            BenchmarkResult: the result
+        """
+        result = BenchmarkResult(name=name)
+        for _i in range(self.repeat):
+            start_time = time.perf_counter()
+            result.pages, result.bytes = work()
+            result.times.append(time.perf_counter() - start_time)
+        # an extra traced run since tracemalloc slows down the work
+        tracemalloc.start()
+        try:
+            work()
+            _size, result.peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result.calcRates()
+        if self.debug:
+            print(
+                f"{name}: {result.pages} pages in {result.seconds:.3f} s ({result.pages_per_s:.1f} pages/s)"
+            )
+        return result
+
+    def benchmarkTarget(self, target_key: str) -> BenchmarkResult:
+        """
+        benchmark the SMW target with the given key
+
+        Args:
+            target_key(str): the key of the target e.g. "category"
+
+        Returns:
+            BenchmarkResult: the result
+        """
+
+        def work() -> Tuple[int, int]:
+            # fresh targets so that no fragments of previous runs are reused
+            target = SMWTarget.getSMWTargets()[target_key]
+            pages = 0
+            size = 0
+            for topic in self.context.topics.values():
+                if target_key == "property":
+                    model_elements = topic.properties.values()
+                else:
+                    model_elements = [topic]
+                for model_element in model_elements:
+                    markup = target.generate(model_element)
+                    pages += 1
+                    size += len(markup.encode("utf-8"))
+            return pages, size
+
+        result = self.measure(target_key, work)
+        return result
+
+    def benchmarkGenerateToFile(self) -> BenchmarkResult:
+        """
+        benchmark GeneratorAPI.generateToFile end to end
+        including writing the files
+
+        Returns:
+            BenchmarkResult: the result
+        """
+        gen = GeneratorAPI(verbose=False, debug=False)
+        gen.context = self.context
+
+        def work() -> Tuple[int, int]:
+            with tempfile.TemporaryDirectory() as target_dir:
+                genResults = gen.generateToFile(target_dir=target_dir, dryRun=False)
+            pages = len(genResults)
+            size = sum(
+                len(genResult.markup.encode("utf-8")) for genResult in genResults
+            )
+            return pages, size
+
+        result = self.measure("generateToFile", work)
+        return result
+
+    def benchmarkViaMwApi(
+        self,
+        wiki: FakeMediaWiki,
+        jobs: int = 1,
+        wikiId: str = "ypgen-fakewiki",
+    ) -> BenchmarkResult:
+        """
+        benchmark GeneratorAPI.generateViaMwApi against a local fake wiki
+
+        each repetition starts with an empty wiki so that all pages are created
+
+        Args:
+            wiki(FakeMediaWiki): the fake wiki with the latency and failures to simulate
+            jobs(int): the number of cells to generate concurrently
+            wikiId(str): the wikiId to register the fake wiki with
+
+        Returns:
+            BenchmarkResult: the result
+        """
+        with FakeMediaWikiServer(wiki) as server:
+            server.getWikiUser(wikiId, save=True)
+            gen = GeneratorAPI(verbose=False, debug=False)
+            gen.context = self.context
+            gen.wikiId = wikiId
+            gen.smwAccess = SMWAccess(wikiId)
+
+            def work() -> Tuple[int, int]:
+                wiki.pages.clear()
+                genResults = gen.generateViaMwApi(dryRun=False, jobs=jobs)
+                pages = len(genResults)
+                size = sum(
+                    len(genResult.markup.encode("utf-8")) for genResult in genResults
+                )
+                return pages, size
+
+            result = self.measure(f"generateViaMwApi(jobs={jobs})", work)
+        return result
+
+    def run(self, mw_api_latency: float = None, jobs: int = 1) -> List[BenchmarkResult]:
+        """
+        run the benchmark for all SMW targets and generateToFile
+
+        Args:
+            mw_api_latency(float): if set also benchmark generateViaMwApi
+                against a fake wiki with the given latency in seconds
+            jobs(int): the number of concurrent cells for generateViaMwApi
+
+        Returns:
+            List[BenchmarkResult]: the results
+        """
+        results = []
+        for target_key, target in SMWTarget.getSMWTargets().items():
+            if target.is_multi:
+                continue
+            results.append(self.benchmarkTarget(target_key))
+        results.append(self.benchmarkGenerateToFile())
+        if mw_api_latency is not None:
+            wiki = FakeMediaWiki(latency=mw_api_latency)
+            results.append(self.benchmarkViaMwApi(wiki, jobs=jobs))
+        return results
+
+    @staticmethod
+    def getEnvironment() -> dict:
+        """
+        get the environment the benchmark ran in
+        """
+        environment = {
+            "ypgen": Version.version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        return environment
+
+
+def main(argv: list = None):
+    """
+    run the generation benchmark for a synthetic context
+    """
+    parser = ArgumentParser(description="Y-Principle generator benchmark")
+    parser.add_argument(
+        "--topics", type=int, default=20, help="number of topics [default: %(default)s]"
+    )
+    parser.add_argument(
+        "--properties",
+        type=int,
+        default=8,
+        help="number of properties per topic [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--links",
+        type=int,
+        default=10,
+        help="number of topic links [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--extendsDepth",
+        type=int,
+        default=3,
+        help="length of the extends chains [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of repetitions per measurement [default: %(default)s]",
+    )
+    parser.add_argument("--sidif", help="benchmark the given SiDIF file instead")
+    parser.add_argument(
+        "--mwApiLatency",
+        type=float,
+        help="also benchmark generateViaMwApi against a local fake wiki with the given latency in seconds",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of cells to generate concurrently via Api [default: %(default)s]",
+    )
+    parser.add_argument(
+        "-o", "--output", help="path of the JSON result file [default: stdout]"
+    )
+    parser.add_argument(
+        "-d", "--debug", action="store_true", help="show debug messages"
+    )
+    args = parser.parse_args(argv)
+    if args.sidif:
+        context, error, errMsg = Context.fromSiDIF_input(args.sidif)
+        if error:
+            print(f"{errMsg}", file=sys.stderr)
+            return 1
+        context_info = {"sidif": args.sidif}
+    else:
+        synthesizer = ContextSynthesizer(
+            topics=args.topics,
+            properties=args.properties,
+            links=args.links,
+            extends_depth=args.extendsDepth,
+        )
+        context = synthesizer.getContext()
+        context_info = synthesizer.asDict()
+    benchmark = GenerationBenchmark(context, repeat=args.repeat, debug=args.debug)
+    results = benchmark.run(mw_api_latency=args.mwApiLatency, jobs=args.jobs)
+    report = {
+        "environment": benchmark.getEnvironment(),
+        "context": context_info,
+        "repeat": benchmark.repeat,
+        "results": [asdict(result) for result in results],
+    }
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as json_file:
+            json_file.write(report_json)
+    else:
+        print(report_json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
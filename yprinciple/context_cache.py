@@ -0,0 +1,173 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+from meta.metamodel import Context
+from meta.mw import MediaWikiContext
+from meta.version import Version as MetaVersion
+from wikibot3rd.wikiclient import WikiClient
+
+from yprinciple.version import Version
+
+
+class ContextCache:
+    """
+    local cache of parsed contexts
+
+    a context is only downloaded and parsed again if the revision
+    of the wiki page holding its SiDIF has changed
+    """
+
+    def __init__(self, cache_dir: str = None, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            cache_dir(str): the directory for the cached contexts - default ~/.ypgen/contexts
+            debug(bool): if True show debug messages
+        """
+        if cache_dir is None:
+            cache_dir = f"{Path.home()}/.ypgen/contexts"
+        self.cache_dir = cache_dir
+        self.debug = debug
+
+    def getPath(self, wikiId: str, context_name: str) -> str:
+        """
+        get the path of the cache file for the given context
+        """
+        file_name = f"{wikiId}-{context_name}.pickle".replace("/", "_")
+        path = os.path.join(self.cache_dir, file_name)
+        return path
+
+    def getRevision(self, mw_context: MediaWikiContext) -> Optional[int]:
+        """
+        get the current revision of the page holding the SiDIF of the given context
+
+        Args:
+            mw_context(MediaWikiContext): the context
+
+        Returns:
+            int: the revision id or None if the page is not available
+        """
+        wikiClient = WikiClient.ofWikiId(mw_context.wikiId)
+        if wikiClient.needsLogin():
+            wikiClient.login()
+        result = wikiClient.getSite().get(
+            "query", prop="info", titles=mw_context.context
+        )
+        revision = None
+        for info in result["query"]["pages"].values():
+            revision = info.get("lastrevid", None)
+        return revision
+
+    def getVersions(self) -> dict:
+        """
+        get the library versions the pickled contexts depend on
+        """
+        versions = {
+            "ypgen": Version.version,
+            "pyMetaModel": MetaVersion.version,
+        }
+        return versions
+
+    def load(self, wikiId: str, context_name: str, revision: int) -> Optional[Context]:
+        """
+        load the given context if it has been cached for the given revision
+
+        Args:
+            wikiId(str): the wikiId of the context
+            context_name(str): the name of the context
+            revision(int): the current revision of the context page
+
+        Returns:
+            Context: the cached context or None if there is no current one
+        """
+        path = self.getPath(wikiId, context_name)
+        context = None
+        if revision is not None and os.path.isfile(path):
+            try:
+                with open(path, "rb") as cache_file:
+                    record = pickle.load(cache_file)
+                if (
+                    record.get("revision") == revision
+                    and record.get("versions") == self.getVersions()
+                ):
+                    context = record["context"]
+            except Exception as ex:
+                print(
+                    f"Warning ⚠️: ignoring invalid context cache {path}: {str(ex)}",
+                    file=sys.stderr,
+                )
+        return context
+
+    def store(self, wikiId: str, context_name: str, revision: int, context: Context):
+        """
+        store the given context for the given revision
+
+        Args:
+            wikiId(str): the wikiId of the context
+            context_name(str): the name of the context
+            revision(int): the revision of the context page the context was parsed from
+            context(Context): the parsed context
+        """
+        if revision is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.getPath(wikiId, context_name)
+        record = {
+            "revision": revision,
+            "versions": self.getVersions(),
+            "context": context,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as cache_file:
+            pickle.dump(record, cache_file)
+        os.replace(tmp_path, path)
+
+    def getContext(
+        self, mw_context: MediaWikiContext, depth: int = None
+    ) -> Tuple[Context, Optional[Exception], Optional[str]]:
+        """
+        get the context for the given MediaWiki context from the cache
+        or via Context.fromWikiContext if the context page changed
+
+        Args:
+            mw_context(MediaWikiContext): the Mediawiki context
+            depth(int): the explain depth to show for the errorMessage
+
+        Returns:
+            tuple(Context,Exception,str): the context and potential parsing errors
+        """
+        wikiId = mw_context.wikiId
+        context_name = mw_context.context
+        try:
+            revision = self.getRevision(mw_context)
+        except Exception as ex:
+            revision = None
+            if self.debug:
+                print(f"revision of {context_name}@{wikiId} not available: {str(ex)}")
+        context = self.load(wikiId, context_name, revision)
+        if context is not None:
+            if self.debug:
+                print(f"using cached {context_name}@{wikiId} revision {revision}")
+            return context, None, None
+        context, error, errMsg = Context.fromWikiContext(
+            mw_context, depth=depth, debug=self.debug
+        )
+        if error is None and context is not None:
+            try:
+                self.store(wikiId, context_name, revision, context)
+            except Exception as ex:
+                print(
+                    f"Warning ⚠️: caching {context_name}@{wikiId} failed: {str(ex)}",
+                    file=sys.stderr,
+                )
+        return context, error, errMsg
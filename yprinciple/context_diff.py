@@ -0,0 +1,225 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from meta.metamodel import Context
+
+from yprinciple.gen_cache import GenerationCache
+from yprinciple.smw_targets import SMWTarget
+
+
+@dataclass
+class ContextDiff:
+    """
+    structural difference between two versions of a context
+    """
+
+    added_topics: List[str] = field(default_factory=list)
+    removed_topics: List[str] = field(default_factory=list)
+    changed_topics: List[str] = field(default_factory=list)
+    # properties as "Topic.property" keys
+    added_properties: List[str] = field(default_factory=list)
+    removed_properties: List[str] = field(default_factory=list)
+    changed_properties: List[str] = field(default_factory=list)
+    # topic links by link key
+    added_links: List[str] = field(default_factory=list)
+    removed_links: List[str] = field(default_factory=list)
+    changed_links: List[str] = field(default_factory=list)
+    # the titles of the pages of removed topics and properties
+    orphaned_pages: List[str] = field(default_factory=list)
+    # the source and target topic names of the added, removed and changed links
+    link_topics: Dict[str, List[str]] = field(default_factory=dict)
+
+    @staticmethod
+    def diffRecords(old: Dict[str, dict], new: Dict[str, dict]) -> tuple:
+        """
+        compare the given records by key
+
+        Returns:
+            tuple: the added, removed and changed keys
+        """
+        added = [key for key in new if key not in old]
+        removed = [key for key in old if key not in new]
+        changed = [key for key in new if key in old and old[key] != new[key]]
+        return added, removed, changed
+
+    @staticmethod
+    def getTopicRecords(context: Context) -> Dict[str, dict]:
+        """
+        get the records of the topics of the given context without their properties
+        """
+        records = {
+            topic_name: GenerationCache.plainRecord(topic)
+            for topic_name, topic in context.topics.items()
+        }
+        return records
+
+    @staticmethod
+    def getPropertyRecords(context: Context) -> Dict[str, dict]:
+        """
+        get the records of all properties of the given context by "Topic.property" key
+        """
+        records = {}
+        for topic_name, topic in context.topics.items():
+            for prop in topic.properties.values():
+                records[f"{topic_name}.{prop.name}"] = GenerationCache.propertyRecord(
+                    prop
+                )
+        return records
+
+    @staticmethod
+    def getLinkKey(topicLink) -> str:
+        """
+        get the key of the given topic link - links might share a name
+        so the key consists of the source and target topics and roles
+
+        Returns:
+            str: e.g. "City.city-Event.events"
+        """
+        key = f"{topicLink.source}.{topicLink.sourceRole}-{topicLink.target}.{topicLink.targetRole}"
+        return key
+
+    @classmethod
+    def getLinks(cls, context: Context) -> Dict[str, object]:
+        """
+        get the topic links of the given context by link key
+        """
+        links = {}
+        for topic in context.topics.values():
+            for topicLinks in [topic.sourceTopicLinks, topic.targetTopicLinks]:
+                for topicLink in topicLinks.values():
+                    links[cls.getLinkKey(topicLink)] = topicLink
+        return links
+
+    @classmethod
+    def compare(cls, old_context: Context, new_context: Context) -> "ContextDiff":
+        """
+        compare the given versions of a context
+
+        Args:
+            old_context(Context): the old version e.g. the currently generated one
+            new_context(Context): the new version
+
+        Returns:
+            ContextDiff: the difference
+        """
+        diff = cls()
+        diff.added_topics, diff.removed_topics, diff.changed_topics = cls.diffRecords(
+            cls.getTopicRecords(old_context), cls.getTopicRecords(new_context)
+        )
+        (
+            diff.added_properties,
+            diff.removed_properties,
+            diff.changed_properties,
+        ) = cls.diffRecords(
+            cls.getPropertyRecords(old_context), cls.getPropertyRecords(new_context)
+        )
+        old_links = cls.getLinks(old_context)
+        new_links = cls.getLinks(new_context)
+        diff.added_links, diff.removed_links, diff.changed_links = cls.diffRecords(
+            {
+                link_key: GenerationCache.plainRecord(link)
+                for link_key, link in old_links.items()
+            },
+            {
+                link_key: GenerationCache.plainRecord(link)
+                for link_key, link in new_links.items()
+            },
+        )
+        for link_key in diff.added_links + diff.removed_links + diff.changed_links:
+            topic_names = []
+            for links in [old_links, new_links]:
+                topicLink = links.get(link_key)
+                if topicLink is not None:
+                    for topic_name in [topicLink.source, topicLink.target]:
+                        if topic_name not in topic_names:
+                            topic_names.append(topic_name)
+            diff.link_topics[link_key] = topic_names
+        targets = SMWTarget.getSMWTargets()
+        for topic_name in diff.removed_topics:
+            topic = old_context.topics[topic_name]
+            for target in targets.values():
+                if (
+                    target.showInGrid
+                    and not target.is_multi
+                    and target.name != "Python"
+                ):
+                    diff.orphaned_pages.append(target.getPageTitle(topic))
+        for property_key in diff.removed_properties:
+            topic_name, prop_name = property_key.split(".", 1)
+            prop = old_context.topics[topic_name].properties[prop_name]
+            diff.orphaned_pages.append(targets["property"].getPageTitle(prop))
+        return diff
+
+    def getChanges(self, new_context: Context) -> List[str]:
+        """
+        get the changed topic names and "Topic.property" keys
+        of the new context that need to be regenerated
+
+        Args:
+            new_context(Context): the new version of the context
+
+        Returns:
+            list: the changes e.g. for GeneratorAPI.selectYpCells
+        """
+        changes = []
+
+        def add(change: str):
+            if change not in changes:
+                changes.append(change)
+
+        for topic_name in self.added_topics + self.changed_topics:
+            add(topic_name)
+        for property_key in self.added_properties + self.changed_properties:
+            add(property_key)
+        # a removed property changes the pages of its topic
+        for property_key in self.removed_properties:
+            topic_name, _prop_name = property_key.split(".", 1)
+            if topic_name in new_context.topics:
+                add(topic_name)
+        for topic_names in self.link_topics.values():
+            for topic_name in topic_names:
+                if topic_name in new_context.topics:
+                    add(topic_name)
+        return changes
+
+    def isEmpty(self) -> bool:
+        """
+        check whether there is no difference
+        """
+        is_empty = not any(
+            [
+                self.added_topics,
+                self.removed_topics,
+                self.changed_topics,
+                self.added_properties,
+                self.removed_properties,
+                self.changed_properties,
+                self.added_links,
+                self.removed_links,
+                self.changed_links,
+            ]
+        )
+        return is_empty
+
+    def getSummary(self) -> str:
+        """
+        get a human readable summary of the difference
+        """
+        lines = []
+        for kind in ["topics", "properties", "links"]:
+            for change in ["added", "removed", "changed"]:
+                names = getattr(self, f"{change}_{kind}")
+                if names:
+                    lines.append(f"{change} {kind}: {', '.join(names)}")
+        if self.orphaned_pages:
+            lines.append(f"orphaned pages: {', '.join(self.orphaned_pages)}")
+        if not lines:
+            lines.append("no changes")
+        summary = "\n".join(lines)
+        return summary
@@ -0,0 +1,97 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from meta.metamodel import Context, Property, Topic, TopicLink
+
+
+@dataclass
+class TopicIndex:
+    """
+    the derived data of a topic the generators need for each page
+    """
+
+    topic: Topic
+    # the topic named by extends (if any)
+    extends_topic: Optional[Topic] = None
+    # the resolved extends chain
+    extends_topics: List[Topic] = field(default_factory=list)
+    # own and inherited properties
+    all_properties: List[Property] = field(default_factory=list)
+    # own properties sorted by index
+    properties_by_index: List[Property] = field(default_factory=list)
+    primary_key_property: Optional[Property] = None
+    # the topic links as held by the topic
+    source_topic_links: List[TopicLink] = field(default_factory=list)
+    target_topic_links: List[TopicLink] = field(default_factory=list)
+
+    @classmethod
+    def ofTopic(cls, topic: Topic) -> "TopicIndex":
+        """
+        create the index for the given topic
+
+        Args:
+            topic(Topic): the topic to index
+
+        Returns:
+            TopicIndex: the index
+        """
+        extends_topic = None
+        extends = getattr(topic, "extends", None)
+        if extends:
+            extends_topic = topic.context_obj.lookupTopic(
+                extends, purpose=f" extends {extends} "
+            )
+        topic_index = cls(
+            topic=topic,
+            extends_topic=extends_topic,
+            extends_topics=topic.get_extends_topics(),
+            all_properties=topic.get_all_properties(),
+            properties_by_index=topic.propertiesByIndex(),
+            primary_key_property=topic.get_primary_key_property(),
+            source_topic_links=list(topic.sourceTopicLinks.values()),
+            target_topic_links=list(topic.targetTopicLinks.values()),
+        )
+        return topic_index
+
+
+class ContextIndex:
+    """
+    index of a loaded context
+
+    the per topic data is computed once on first use instead of on
+    every page so that the generation cost of a page does not grow
+    with the depth of the inheritance hierarchy and the number of links
+    """
+
+    def __init__(self, context: Context):
+        """
+        constructor
+
+        Args:
+            context(Context): the context to index
+        """
+        self.context = context
+        self.topic_indices: Dict[str, TopicIndex] = {}
+
+    def getTopicIndex(self, topic: Topic) -> TopicIndex:
+        """
+        get the index of the given topic
+
+        Args:
+            topic(Topic): the topic of my context
+
+        Returns:
+            TopicIndex: the index - computed on first use
+        """
+        topic_index = self.topic_indices.get(topic.name)
+        if topic_index is None or topic_index.topic is not topic:
+            topic_index = TopicIndex.ofTopic(topic)
+            if self.context.topics.get(topic.name) is topic:
+                self.topic_indices[topic.name] = topic_index
+        return topic_index
@@ -0,0 +1,299 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from mwclient.errors import APIError
+
+from yprinciple.tracing import tracer
+
+
+class TransientEditError(Exception):
+    """
+    an edit failed for a reason that is expected to go away
+    e.g. replication lag, rate limits or server errors
+    """
+
+    def __init__(self, code: str, info: str, retry_after: float = None):
+        """
+        constructor
+
+        Args:
+            code(str): the API error code or HTTP status
+            info(str): the description of the failure
+            retry_after(float): the seconds to wait as requested by the wiki (if any)
+        """
+        super().__init__(f"{code}: {info}")
+        self.code = code
+        self.info = info
+        self.retry_after = retry_after
+
+
+class EditScheduler:
+    """
+    schedule the page edits of a generation run
+
+    the edits of all worker threads share a single rate that is adapted
+    to the observed latency additive increase/multiplicative decrease (AIMD)
+    style - maxlag and Retry-After responses pause all edits for the requested
+    time and cells failing transiently are retried with exponential backoff
+
+    see https://www.mediawiki.org/wiki/Manual:Maxlag_parameter
+    and https://www.mediawiki.org/wiki/API:Etiquette
+    """
+
+    # API error codes of failures that are expected to go away
+    transient_codes = {
+        "maxlag",
+        "ratelimited",
+        "readonly",
+        "internal_api_error_DBConnectionError",
+        "internal_api_error_DBQueryError",
+    }
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        min_rate: float = 0.2,
+        max_rate: float = 100.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        target_latency: float = 2.0,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        seed: int = None,
+        debug: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            rate(float): the initial number of edits per second
+            min_rate(float): the lowest rate to slow down to
+            max_rate(float): the highest rate to speed up to
+            increase(float): the edits per second to add after a fast edit
+            decrease(float): the factor to multiply the rate with after a slow
+                or failed edit
+            target_latency(float): the latency in seconds above which an edit is slow
+            max_retries(int): the number of retries of a cell that failed transiently
+            base_delay(float): the delay in seconds before the first retry
+            max_delay(float): the maximum delay in seconds between retries
+            timeout(float): the timeout of a single edit request in seconds
+            clock(Callable): the clock in seconds to use
+            sleep(Callable): the function to wait with
+            seed(int): the seed for the jitter of the retry delays
+            debug(bool): if True show debug messages
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.clock = clock
+        self.sleep = sleep
+        self.random = random.Random(seed)
+        self.debug = debug
+        self.lock = threading.Lock()
+        # the earliest time of the next edit
+        self.next_time = 0.0
+        # the end of a pause requested by the wiki
+        self.paused_until = 0.0
+        self.stats = {"edits": 0, "failures": 0, "retries": 0, "waited": 0.0}
+
+    def acquire(self) -> float:
+        """
+        wait for the slot of the next edit
+
+        Returns:
+            float: the seconds waited
+        """
+        with self.lock:
+            now = self.clock()
+            start = max(now, self.next_time, self.paused_until)
+            self.next_time = start + 1.0 / self.rate
+        wait = start - now
+        if wait > 0:
+            with tracer.span("edit wait", wait=wait):
+                self.sleep(wait)
+            with self.lock:
+                self.stats["waited"] += wait
+        return wait
+
+    def onSuccess(self, latency: float):
+        """
+        adapt the rate to the latency of a successful edit
+
+        Args:
+            latency(float): the duration of the edit request in seconds
+        """
+        with self.lock:
+            self.stats["edits"] += 1
+            if latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def onFailure(self, retry_after: Optional[float] = None):
+        """
+        slow down after a transient failure and pause all edits
+        for the time requested by the wiki
+
+        Args:
+            retry_after(float): the seconds to pause (if any)
+        """
+        with self.lock:
+            self.stats["failures"] += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self.paused_until = max(self.paused_until, self.clock() + retry_after)
+
+    def onRetry(self, cells: int):
+        """
+        count the retries of the given number of cells
+
+        Args:
+            cells(int): the number of cells to retry
+        """
+        with self.lock:
+            self.stats["retries"] += cells
+
+    def getRetryDelay(self, attempt: int) -> float:
+        """
+        get the exponential backoff delay for the given retry attempt
+
+        Args:
+            attempt(int): the number of the retry starting with 1
+
+        Returns:
+            float: the delay in seconds with jitter
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        # spread the retries of cells that failed at the same time
+        delay *= self.random.uniform(0.5, 1.0)
+        return delay
+
+    def isTransient(self, ex: BaseException) -> bool:
+        """
+        check whether the given failure of a cell is worth a retry
+        """
+        return isinstance(ex, TransientEditError)
+
+    @staticmethod
+    def getRetryAfter(headers) -> Optional[float]:
+        """
+        get the Retry-After seconds from the given response headers
+        """
+        retry_after = headers.get("retry-after")
+        try:
+            return float(retry_after) if retry_after is not None else None
+        except ValueError:
+            # an HTTP date instead of seconds
+            return None
+
+    def post(self, page, text: str, summary: str) -> dict:
+        """
+        post the edit of the given page with the session of its site
+
+        the request is not retried here - lag, rate limit and server
+        errors are raised as TransientEditError
+
+        Args:
+            page(Page): the mwclient page to edit
+            text(str): the new text
+            summary(str): the edit summary
+
+        Returns:
+            dict: the edit result
+        """
+        site = page.site
+        url = f"{site.scheme}://{site.host}{site.path}api{site.ext}"
+        data = {
+            "action": "edit",
+            "format": "json",
+            "maxlag": site.max_lag,
+            "title": page.name,
+            "text": text,
+            "summary": summary,
+            "bot": "1",
+        }
+        # as mwclient only assert a login if one is required or active
+        if site.force_login or site.logged_in:
+            data["assert"] = "user"
+        if page.last_rev_time:
+            data["basetimestamp"] = time.strftime("%Y%m%d%H%M%S", page.last_rev_time)
+        if page.edit_time:
+            data["starttimestamp"] = time.strftime("%Y%m%d%H%M%S", page.edit_time)
+        for force in [False, True]:
+            data["token"] = site.get_token("csrf", force=force)
+            try:
+                response = site.connection.post(url, data=data, timeout=self.timeout)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as ex:
+                raise TransientEditError("connection", str(ex)) from ex
+            retry_after = self.getRetryAfter(response.headers)
+            lag = response.headers.get("x-database-lag")
+            status = response.status_code
+            if lag or status == 429 or 500 <= status <= 599:
+                raise TransientEditError(
+                    "maxlag" if lag else str(status),
+                    f"database lag {lag} s" if lag else response.reason,
+                    retry_after,
+                )
+            response.raise_for_status()
+            result = response.json()
+            error = result.get("error")
+            if error is None or error.get("code") != "badtoken":
+                break
+        if error is not None:
+            code = error.get("code")
+            if code in self.transient_codes:
+                raise TransientEditError(code, error.get("info"), retry_after)
+            raise APIError(code, error.get("info"), {"title": page.name})
+        edit_result = result.get("edit", {})
+        if edit_result.get("result") != "Success":
+            raise APIError(
+                edit_result.get("result"), f"edit of {page.name} failed", edit_result
+            )
+        return edit_result
+
+    def edit(self, page, text: str, summary: str) -> dict:
+        """
+        edit the given page in the next free slot
+
+        Args:
+            page(Page): the mwclient page to edit
+            text(str): the new text
+            summary(str): the edit summary
+
+        Returns:
+            dict: the edit result
+        """
+        self.acquire()
+        start = self.clock()
+        try:
+            edit_result = self.post(page, text, summary)
+        except TransientEditError as ex:
+            self.onFailure(ex.retry_after)
+            if self.debug:
+                print(f"edit of {page.name} failed transiently with {ex}")
+            raise
+        self.onSuccess(self.clock() - start)
+        return edit_result
@@ -0,0 +1,781 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import itertools
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from wikibot3rd.wikiuser import WikiUser
+
+
+@dataclass
+class FakeRevision:
+    """
+    a revision of a page of the fake wiki
+    """
+
+    revid: int
+    timestamp: str
+    text: str
+    user: str
+    comment: str = ""
+
+
+@dataclass
+class FakePage:
+    """
+    a page of the fake wiki
+    """
+
+    pageid: int
+    title: str
+    ns: int
+    revisions: List[FakeRevision] = field(default_factory=list)
+
+    @property
+    def latest(self) -> FakeRevision:
+        return self.revisions[-1]
+
+
+class FakeMediaWiki:
+    """
+    in memory stand-in for the subset of the MediaWiki action API
+    that mwclient and wikibot3rd use for generating pages:
+
+    * query with meta=siteinfo|userinfo|tokens and prop=info|revisions
+    * login and edit
+    * the Semantic MediaWiki ask API for registered results
+
+    latency, error rate, edit rate limit and replication lag can be
+    injected to benchmark the API path at realistic round trip times
+
+    see https://www.mediawiki.org/wiki/API:Main_page
+    """
+
+    namespaces = {
+        0: "",
+        2: "User",
+        4: "Project",
+        6: "File",
+        8: "MediaWiki",
+        10: "Template",
+        12: "Help",
+        14: "Category",
+        102: "Property",
+        106: "Form",
+        108: "Concept",
+    }
+
+    def __init__(
+        self,
+        users: Dict[str, str] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        edit_rate_limit: int = None,
+        rate_window: float = 60.0,
+        lag: float = 0.0,
+        retry_after: str = "1",
+        failure_actions: List[str] = None,
+        anonymous_edits: bool = False,
+        seed: int = None,
+        generator: str = "MediaWiki 1.39.8",
+    ):
+        """
+        constructor
+
+        Args:
+            users(dict): map of user names to passwords - if None any login is accepted
+            latency(float): the delay in seconds for each request
+            jitter(float): the maximum random extra delay in seconds for each request
+            error_rate(float): the fraction of requests to fail with the error status
+            error_status(int): the HTTP status of failed requests
+            edit_rate_limit(int): the maximum number of edits per user and rate window
+            rate_window(float): the length of the rate limit window in seconds
+            lag(float): the simulated replication lag in seconds - requests
+                with a smaller maxlag parameter are rejected
+            retry_after(str): the Retry-After header of lagged requests -
+                seconds or an HTTP date
+            failure_actions(list): the actions to inject errors and lag for
+                e.g. ["edit"] - if None all actions
+            anonymous_edits(bool): if True edits without a login are allowed
+            seed(int): the seed for the random failures
+            generator(str): the MediaWiki version to report
+        """
+        self.users = users
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.edit_rate_limit = edit_rate_limit
+        self.rate_window = rate_window
+        self.lag = lag
+        self.retry_after = retry_after
+        self.failure_actions = failure_actions
+        self.anonymous_edits = anonymous_edits
+        self.random = random.Random(seed)
+        self.generator = generator
+        self.lock = threading.RLock()
+        self.pages: Dict[str, FakePage] = {}
+        self.last_revid = 0
+        # session id -> user name
+        self.sessions: Dict[str, str] = {}
+        # session id -> csrf token
+        self.tokens: Dict[str, str] = {}
+        # user name -> times of recent edits
+        self.edit_times: Dict[str, List[float]] = {}
+        # condition -> ordered dict of page title -> printouts
+        self.ask_results: Dict[str, Dict[str, dict]] = {}
+        self.stats: Dict[str, int] = {}
+
+    @staticmethod
+    def now() -> str:
+        """
+        get the current time as MediaWiki timestamp
+        """
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return timestamp
+
+    def normalizeTitle(self, title: str) -> str:
+        """
+        normalize the given page title the way MediaWiki does
+        """
+        title = title.replace("_", " ").strip()
+        if ":" in title:
+            prefix, name = title.split(":", 1)
+            if prefix in self.namespaces.values() and name:
+                name = name[0].upper() + name[1:]
+                return f"{prefix}:{name}"
+        if title:
+            title = title[0].upper() + title[1:]
+        return title
+
+    def getNamespace(self, title: str) -> int:
+        """
+        get the namespace id of the given normalized title
+        """
+        if ":" in title:
+            prefix = title.split(":", 1)[0]
+            for ns, ns_name in self.namespaces.items():
+                if ns_name and ns_name == prefix:
+                    return ns
+        return 0
+
+    def setPage(self, title: str, text: str, user: str = "FakeBot", comment: str = ""):
+        """
+        create a new revision of the given page
+
+        Args:
+            title(str): the title of the page
+            text(str): the markup of the new revision
+            user(str): the user name of the author
+            comment(str): the edit summary
+
+        Returns:
+            FakePage: the page
+        """
+        with self.lock:
+            title = self.normalizeTitle(title)
+            page = self.pages.get(title)
+            if page is None:
+                page = FakePage(
+                    pageid=len(self.pages) + 1,
+                    title=title,
+                    ns=self.getNamespace(title),
+                )
+                self.pages[title] = page
+            self.last_revid += 1
+            revision = FakeRevision(
+                revid=self.last_revid,
+                timestamp=self.now(),
+                text=text,
+                user=user,
+                comment=comment,
+            )
+            page.revisions.append(revision)
+        return page
+
+    def getText(self, title: str) -> Optional[str]:
+        """
+        get the current markup of the given page
+
+        Returns:
+            str: the markup or None if the page does not exist
+        """
+        page = self.pages.get(self.normalizeTitle(title))
+        text = page.latest.text if page else None
+        return text
+
+    def addAskResult(self, condition: str, page_title: str, printouts: dict = None):
+        """
+        register a result of Semantic MediaWiki ask queries with the given condition
+
+        Args:
+            condition(str): a single condition e.g. [[Property topic::Concept:Event]]
+            page_title(str): the title of the resulting page
+            printouts(dict): map of printout labels to page titles
+        """
+        with self.lock:
+            results = self.ask_results.setdefault(condition, {})
+            results[page_title] = printouts or {}
+
+    def count(self, name: str):
+        """
+        count the given event
+        """
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def getUserInfo(self, user: Optional[str]) -> dict:
+        """
+        get the userinfo for the given user - anonymous if None
+        """
+        if user is None:
+            userinfo = {"id": 0, "name": "127.0.0.1", "anon": "", "rights": ["read"]}
+        else:
+            userinfo = {
+                "id": 1,
+                "name": user,
+                "groups": ["*", "user", "bot"],
+                "rights": ["read", "edit", "writeapi", "apihighlimits", "bot"],
+            }
+        return userinfo
+
+    def apiError(self, code: str, info: str) -> dict:
+        """
+        get the MediaWiki API error response for the given code
+        """
+        self.count(f"error:{code}")
+        return {"error": {"code": code, "info": info, "*": ""}}
+
+    def handle(
+        self, params: dict, session: Optional[str]
+    ) -> Tuple[int, Dict[str, str], dict, Optional[str]]:
+        """
+        handle an API request
+
+        Args:
+            params(dict): the request parameters
+            session(str): the session id from the cookie if any
+
+        Returns:
+            tuple: HTTP status, extra headers, JSON result and new session id if any
+        """
+        action = params.get("action", "")
+        self.count(f"action:{action}")
+        delay = self.latency
+        if self.jitter:
+            delay += self.random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        injectable = self.failure_actions is None or action in self.failure_actions
+        with self.lock:
+            failed = (
+                injectable
+                and self.error_rate > 0
+                and self.random.random() < self.error_rate
+            )
+        if failed:
+            self.count("error:http")
+            return self.error_status, {}, {"error": "injected failure"}, None
+        if injectable and "maxlag" in params and self.lag > float(params["maxlag"]):
+            result = self.apiError(
+                "maxlag", f"Waiting for a database server: {self.lag} seconds lagged."
+            )
+            headers = {
+                "X-Database-Lag": str(int(self.lag)),
+                "Retry-After": self.retry_after,
+            }
+            return 200, headers, result, None
+        user = self.sessions.get(session) if session else None
+        new_session = None
+        if action == "query":
+            result = self.query(params, user, session)
+        elif action == "login":
+            result, new_session = self.login(params, session)
+        elif action == "edit":
+            result = self.edit(params, user, session)
+        elif action == "ask":
+            result = self.ask(params)
+        else:
+            result = self.apiError(
+                "badvalue", f'Unrecognized value for parameter "action": {action}.'
+            )
+        return 200, {}, result, new_session
+
+    def query(self, params: dict, user: Optional[str], session: Optional[str]) -> dict:
+        """
+        handle the query action
+        """
+        query = {}
+        result = {"batchcomplete": "", "query": query}
+        meta = params.get("meta", "").split("|")
+        if "siteinfo" in meta:
+            query["general"] = {
+                "mainpage": "Main Page",
+                "sitename": "FakeWiki",
+                "generator": self.generator,
+                "writeapi": "",
+            }
+            query["namespaces"] = {
+                str(ns): {"id": ns, "case": "first-letter", "*": ns_name}
+                for ns, ns_name in self.namespaces.items()
+            }
+        if "userinfo" in meta:
+            query["userinfo"] = self.getUserInfo(user)
+        if "tokens" in meta:
+            token_type = params.get("type", "csrf")
+            if token_type == "login":
+                query["tokens"] = {"logintoken": "fakelogintoken+\\"}
+            else:
+                token = self.tokens.get(session, "+\\") if session else "+\\"
+                query["tokens"] = {f"{token_type}token": token}
+        if "titles" in params and "generator" not in params:
+            query["pages"] = self.queryPages(params)
+        return result
+
+    def queryPages(self, params: dict) -> dict:
+        """
+        get the page infos and latest revisions for the titles parameter
+        """
+        props = params.get("prop", "").split("|")
+        rvprop = params.get("rvprop", "ids|timestamp|flags|comment|user").split("|")
+        pages = {}
+        missing = 0
+        for requested in params["titles"].split("|"):
+            title = self.normalizeTitle(requested)
+            page = self.pages.get(title)
+            if page is None:
+                missing += 1
+                pages[str(-missing)] = {
+                    "ns": self.getNamespace(title),
+                    "title": title,
+                    "missing": "",
+                }
+                continue
+            latest = page.latest
+            info = {"pageid": page.pageid, "ns": page.ns, "title": title}
+            if "info" in props:
+                info.update(
+                    {
+                        "contentmodel": "wikitext",
+                        "pagelanguage": "en",
+                        "touched": latest.timestamp,
+                        "lastrevid": latest.revid,
+                        "length": len(latest.text.encode("utf-8")),
+                        "protection": [],
+                        "restrictiontypes": ["edit", "move"],
+                    }
+                )
+            if "revisions" in props:
+                revision = {}
+                if "ids" in rvprop:
+                    revision["revid"] = latest.revid
+                if "timestamp" in rvprop:
+                    revision["timestamp"] = latest.timestamp
+                if "user" in rvprop:
+                    revision["user"] = latest.user
+                if "comment" in rvprop:
+                    revision["comment"] = latest.comment
+                if "content" in rvprop:
+                    revision["slots"] = {
+                        "main": {
+                            "contentmodel": "wikitext",
+                            "contentformat": "text/x-wiki",
+                            "*": latest.text,
+                        }
+                    }
+                info["revisions"] = [revision]
+            pages[str(page.pageid)] = info
+        return pages
+
+    def login(self, params: dict, session: Optional[str]) -> Tuple[dict, Optional[str]]:
+        """
+        handle the login action
+        """
+        user = params.get("lgname")
+        password = params.get("lgpassword")
+        if params.get("lgtoken") is None:
+            return {
+                "login": {"result": "NeedToken", "token": "fakelogintoken+\\"}
+            }, None
+        if self.users is not None and self.users.get(user) != password:
+            result = {
+                "login": {
+                    "result": "Failed",
+                    "reason": "Incorrect username or password entered.",
+                }
+            }
+            return result, None
+        with self.lock:
+            new_session = secrets.token_hex(16)
+            self.sessions[new_session] = user
+            self.tokens[new_session] = f"{secrets.token_hex(16)}+\\"
+        result = {"login": {"result": "Success", "lguserid": 1, "lgusername": user}}
+        return result, new_session
+
+    def isRateLimited(self, user: str) -> bool:
+        """
+        check and record an edit of the given user against the edit rate limit
+        """
+        if self.edit_rate_limit is None:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            times = [
+                edit_time
+                for edit_time in self.edit_times.get(user, [])
+                if now - edit_time < self.rate_window
+            ]
+            limited = len(times) >= self.edit_rate_limit
+            if not limited:
+                times.append(now)
+            self.edit_times[user] = times
+        return limited
+
+    def edit(self, params: dict, user: Optional[str], session: Optional[str]) -> dict:
+        """
+        handle the edit action
+        """
+        if user is None and params.get("assert") == "user":
+            return self.apiError(
+                "assertuserfailed",
+                "You are no longer logged in, so the action could not be completed.",
+            )
+        if user is None and not self.anonymous_edits:
+            return self.apiError("permissiondenied", "You are not logged in.")
+        # anonymous users get the token "+\\"
+        token = self.tokens.get(session, "+\\") if session else "+\\"
+        if params.get("token") != token:
+            return self.apiError("badtoken", "Invalid CSRF token.")
+        if self.isRateLimited(user):
+            return self.apiError(
+                "ratelimited",
+                "As an anti-abuse measure, you are limited from performing this action too many times in a short space of time.",
+            )
+        title = self.normalizeTitle(params.get("title", ""))
+        with self.lock:
+            page = self.pages.get(title)
+            # MediaWiki accepts ISO 8601 as well as the compact timestamp format
+            basetimestamp = re.sub(r"\D", "", params.get("basetimestamp", ""))
+            if page is not None and basetimestamp:
+                latest = re.sub(r"\D", "", page.latest.timestamp)
+                if latest > basetimestamp:
+                    return self.apiError("editconflict", "Edit conflict.")
+            old_text = page.latest.text if page else ""
+            if "text" in params:
+                text = params["text"]
+            else:
+                text = (
+                    params.get("prependtext", "")
+                    + old_text
+                    + params.get("appendtext", "")
+                )
+            if page is not None and text == old_text:
+                self.count("edit:nochange")
+                return {
+                    "edit": {
+                        "result": "Success",
+                        "pageid": page.pageid,
+                        "title": title,
+                        "contentmodel": "wikitext",
+                        "nochange": "",
+                    }
+                }
+            old_revid = page.latest.revid if page else 0
+            # anonymous edits are attributed to the IP address
+            page = self.setPage(
+                title, text, user=user or "127.0.0.1", comment=params.get("summary")
+            )
+            self.count("edit:saved")
+            latest = page.latest
+        result = {
+            "edit": {
+                "result": "Success",
+                "pageid": page.pageid,
+                "title": title,
+                "contentmodel": "wikitext",
+                "oldrevid": old_revid,
+                "newrevid": latest.revid,
+                "newtimestamp": latest.timestamp,
+            }
+        }
+        if old_revid == 0:
+            result["edit"]["new"] = ""
+        return result
+
+    @staticmethod
+    def expandCondition(condition: str) -> List[str]:
+        """
+        expand the || alternatives of the given ask condition
+
+        e.g. [[Topic name::A||B]] gives [[Topic name::A]] and [[Topic name::B]]
+        """
+        alternatives = []
+        for part in re.findall(r"\[\[(.*?)\]\]", condition):
+            if "::" in part:
+                prop, values = part.split("::", 1)
+                alternatives.append(
+                    [f"[[{prop}::{value}]]" for value in values.split("||")]
+                )
+            else:
+                alternatives.append([f"[[{part}]]"])
+        conditions = [
+            "".join(combination) for combination in itertools.product(*alternatives)
+        ]
+        return conditions
+
+    def ask(self, params: dict) -> dict:
+        """
+        handle the Semantic MediaWiki ask action from the registered results
+
+        see https://www.semantic-mediawiki.org/wiki/Help:API:ask
+        """
+        query = params.get("query", "")
+        match = re.match(r"^((?:\[\[.*?\]\])+)(.*)$", query, re.DOTALL)
+        if not match:
+            return self.apiError("smw-api-invalid-query", f"invalid query {query}")
+        condition, rest = match.groups()
+        printrequests = [
+            {"label": "", "key": "", "redi": "", "typeid": "_wpg", "mode": 2}
+        ]
+        labels = []
+        offset = 0
+        limit = 50
+        for option in rest.split("|"):
+            option = option.strip()
+            if option.startswith("?"):
+                printout = option[1:]
+                prop, _sep, label = printout.partition("=")
+                prop = prop.strip()
+                label = label.strip() or prop
+                labels.append(label)
+                printrequests.append(
+                    {
+                        "label": label,
+                        "key": prop,
+                        "redi": "",
+                        "typeid": "_wpg",
+                        "mode": 1,
+                    }
+                )
+            elif option.startswith("offset="):
+                offset = int(option.split("=", 1)[1])
+            elif option.startswith("limit="):
+                limit = int(option.split("=", 1)[1])
+        records = {}
+        with self.lock:
+            for expanded in self.expandCondition(condition):
+                for page_title, printouts in self.ask_results.get(expanded, {}).items():
+                    records.setdefault(page_title, printouts)
+        titles = list(records.keys())
+        results = {}
+        for page_title in titles[offset : offset + limit]:
+            printouts = {}
+            for label in labels:
+                value = records[page_title].get(
+                    label, page_title if label == "page" else None
+                )
+                values = (
+                    []
+                    if value is None
+                    else value if isinstance(value, list) else [value]
+                )
+                printouts[label] = [{"fulltext": v, "exists": "1"} for v in values]
+            results[page_title] = {
+                "printouts": printouts,
+                "fulltext": page_title,
+                "namespace": self.getNamespace(page_title),
+                "exists": "1",
+                "displaytitle": "",
+            }
+        result = {
+            "query": {
+                "printrequests": printrequests,
+                "results": results,
+                "serializer": "SMW\\Serializers\\QueryResultSerializer",
+                "version": 2,
+                "meta": {
+                    "hash": "",
+                    "count": len(results),
+                    "offset": offset,
+                    "source": "",
+                },
+            }
+        }
+        if offset + limit < len(titles):
+            result["query-continue-offset"] = offset + limit
+        return result
+
+
+class FakeMediaWikiRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler serving api.php of a FakeMediaWiki
+    """
+
+    cookie_name = "fakewiki_session"
+
+    def log_message(self, format, *args):
+        # keep benchmark and test output clean
+        pass
+
+    def getParams(self) -> dict:
+        """
+        get the GET and POST parameters of the request
+        """
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if length > 0:
+            body = self.rfile.read(length).decode("utf-8")
+            params.update(parse_qsl(body, keep_blank_values=True))
+        return params
+
+    def getSession(self) -> Optional[str]:
+        """
+        get the session id from the cookie header
+        """
+        cookie_header = self.headers.get("Cookie")
+        if not cookie_header:
+            return None
+        cookie = SimpleCookie(cookie_header)
+        morsel = cookie.get(self.cookie_name)
+        return morsel.value if morsel else None
+
+    def answer(self):
+        """
+        answer an api.php request
+        """
+        if not urlparse(self.path).path.endswith("/api.php"):
+            self.send_error(404)
+            return
+        wiki = self.server.wiki
+        status, headers, result, new_session = wiki.handle(
+            self.getParams(), self.getSession()
+        )
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if new_session:
+            self.send_header(
+                "Set-Cookie", f"{self.cookie_name}={new_session}; Path=/; HttpOnly"
+            )
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.answer()
+
+    def do_POST(self):
+        self.answer()
+
+
+class FakeMediaWikiServer:
+    """
+    serve a FakeMediaWiki on localhost in a background thread
+
+    usage:
+        with FakeMediaWikiServer(FakeMediaWiki(latency=0.05)) as server:
+            wikiUser = server.getWikiUser("fakewiki", save=True)
+    """
+
+    def __init__(
+        self, wiki: FakeMediaWiki = None, host: str = "127.0.0.1", port: int = 0
+    ):
+        """
+        constructor
+
+        Args:
+            wiki(FakeMediaWiki): the fake wiki to serve - a default one if None
+            host(str): the host to bind to
+            port(int): the port to bind to - 0 for a free port
+        """
+        self.wiki = wiki if wiki is not None else FakeMediaWiki()
+        self.httpd = ThreadingHTTPServer((host, port), FakeMediaWikiRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.wiki = self.wiki
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeMediaWikiServer":
+        """
+        start serving in a background thread
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        stop serving
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def getWikiUser(
+        self,
+        wikiId: str = "fakewiki",
+        user: str = "FakeBot",
+        password: str = "fake-password",
+        save: bool = False,
+    ) -> WikiUser:
+        """
+        get a wiki user for this server and register the credentials
+
+        Args:
+            wikiId(str): the wikiId to use
+            user(str): the user name
+            password(str): the password
+            save(bool): if True save the wiki user ini file so that
+                WikiClient.ofWikiId and SMWAccess find this server
+
+        Returns:
+            WikiUser: the wiki user
+        """
+        if self.wiki.users is not None:
+            self.wiki.users[user] = password
+        wikiUser = WikiUser.ofDict(
+            {
+                "wikiId": wikiId,
+                "url": self.url,
+                "scriptPath": "",
+                "version": self.wiki.generator,
+                "user": user,
+                "password": password,
+                "email": "noreply@nouser.com",
+            },
+            lenient=True,
+        )
+        if save:
+            wikiUser.save()
+        return wikiUser
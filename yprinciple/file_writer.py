@@ -0,0 +1,122 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import tempfile
+from typing import Tuple
+
+
+class BulkFileWriter:
+    """
+    atomic, content-aware writer for many files in a target directory
+
+    the target directory is created only once, files whose content
+    is unchanged are not touched (so their mtime stays the same) and
+    changed files are written to a temporary file that is renamed
+    to the final name so that a crashed run never leaves half-written files
+    """
+
+    def __init__(
+        self, target_dir: str, encoding: str = "utf-8", file_mode: int = 0o644
+    ):
+        """
+        constructor
+
+        Args:
+            target_dir(str): the path to the target directory
+            encoding(str): the encoding of the files
+            file_mode(int): the mode of new files - replaced files keep their mode
+        """
+        self.target_dir = target_dir
+        self.encoding = encoding
+        self.dir_created = False
+        self.written = 0
+        self.unchanged = 0
+        self.file_mode = file_mode
+
+    def getPath(self, filename: str) -> str:
+        """
+        get the path for the given filename
+        """
+        path = f"{self.target_dir}/{filename}"
+        return path
+
+    def makeDirs(self):
+        """
+        create my target directory if this has not been done yet
+        """
+        if not self.dir_created:
+            os.makedirs(self.target_dir, exist_ok=True)
+            self.dir_created = True
+
+    def isUnchanged(self, path: str, content: bytes) -> bool:
+        """
+        check whether the file at the given path has the given content
+
+        Args:
+            path(str): the path of the file
+            content(bytes): the content to compare
+
+        Returns:
+            bool: True if the file exists and has exactly the given content
+        """
+        try:
+            if os.path.getsize(path) != len(content):
+                return False
+            with open(path, "rb") as existing_file:
+                return existing_file.read() == content
+        except OSError:
+            return False
+
+    def getMode(self, path: str) -> int:
+        """
+        get the mode for the file at the given path
+
+        Args:
+            path(str): the path of the file
+
+        Returns:
+            int: the mode of the existing file or my file_mode for a new file
+        """
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = self.file_mode
+        return mode
+
+    def write(self, filename: str, text: str) -> Tuple[str, bool]:
+        """
+        write the given text to the file with the given name
+        unless the file already has this content
+
+        Args:
+            filename(str): the name of the file in the target directory
+            text(str): the text to write
+
+        Returns:
+            tuple(str,bool): the path of the file and True if the file was unchanged
+        """
+        self.makeDirs()
+        path = self.getPath(filename)
+        content = text.encode(self.encoding)
+        if self.isUnchanged(path, content):
+            self.unchanged += 1
+            return path, True
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.target_dir, prefix=f".{filename}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+            # temporary files are created with mode 0600
+            os.chmod(tmp_path, self.getMode(path))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.written += 1
+        return path, False
@@ -0,0 +1,289 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, Iterable
+
+from meta.metamodel import Property, Topic
+
+from yprinciple.version import Version
+from yprinciple.ypcell import YpCell
+
+
+class GenerationCache:
+    """
+    persistent manifest of the cells generated in previous runs
+
+    for each (mode, target key, page title) the fingerprint of the inputs
+    of Target.generate and the hash of the last markup pushed are kept so that
+    an incremental run only processes cells whose inputs have changed
+    """
+
+    db_name = ".ypgen_cache.sqlite"
+    # number of updates after which they are committed
+    commit_interval = 100
+
+    def __init__(self, db_path: str, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            db_path(str): the path to the sqlite database file
+            debug(bool): if True show debug messages
+        """
+        self.db_path = db_path
+        self.debug = debug
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS cells (
+  mode TEXT NOT NULL,
+  target_key TEXT NOT NULL,
+  page_title TEXT NOT NULL,
+  fingerprint TEXT NOT NULL,
+  markup_hash TEXT NOT NULL,
+  updated TEXT NOT NULL,
+  PRIMARY KEY (mode, target_key, page_title)
+)""")
+        self.connection.commit()
+        self.pending_updates = 0
+
+    @classmethod
+    def ofDirectory(cls, directory: str, debug: bool = False) -> "GenerationCache":
+        """
+        get the generation cache stored in the given directory
+
+        Args:
+            directory(str): e.g. the wikibackup directory of a wiki
+            debug(bool): if True show debug messages
+
+        Returns:
+            GenerationCache: the cache
+        """
+        db_path = os.path.join(directory, cls.db_name)
+        gen_cache = cls(db_path, debug=debug)
+        return gen_cache
+
+    def commit(self):
+        """
+        commit the pending updates
+        """
+        self.connection.commit()
+        self.pending_updates = 0
+
+    def close(self):
+        """
+        commit the pending updates and close my database connection
+        """
+        self.commit()
+        self.connection.close()
+
+    @staticmethod
+    def hash(text: str) -> str:
+        """
+        get the sha256 hash of the given text
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return text_hash
+
+    @staticmethod
+    def plainRecord(obj) -> dict:
+        """
+        get the plain (non object reference) attributes of the given object
+
+        Args:
+            obj: e.g. a Topic, Property or TopicLink
+
+        Returns:
+            dict: the attributes with str, int, float, bool or None values
+        """
+        record = {
+            key: value
+            for key, value in sorted(vars(obj).items())
+            if value is None or isinstance(value, (str, int, float, bool))
+        }
+        return record
+
+    @classmethod
+    def propertyRecord(cls, prop: Property) -> dict:
+        """
+        get the record of the given property
+
+        FormTarget.formTemplate sets values_from and inputType of link
+        properties from the topicLink while generating - these attributes
+        are left out so that the fingerprint does not depend on the order
+        of generation
+        """
+        record = cls.plainRecord(prop)
+        if getattr(prop, "isLink", False):
+            record.pop("values_from", None)
+            record.pop("inputType", None)
+        return record
+
+    @classmethod
+    def topicRecord(cls, topic: Topic) -> dict:
+        """
+        get the record of the given topic including its properties
+        """
+        record = cls.plainRecord(topic)
+        record["properties"] = [
+            cls.propertyRecord(prop) for prop in topic.properties.values()
+        ]
+        return record
+
+    @classmethod
+    def fingerprintRecord(cls, modelElement) -> dict:
+        """
+        get the record of all inputs that feed the generation for the given
+        model element
+
+        for a topic these are the topic with its properties, the topics
+        of its extends chain and its topic links with the linked topics -
+        for a property the property and its topic link - the property pages
+        only depend on the name of their topic which is part of the cell key
+
+        Args:
+            modelElement: the Topic or Property to get the record for
+
+        Returns:
+            dict: the fingerprint record
+        """
+        record = {
+            "version": Version.version,
+            # copyright notices contain the current year
+            "year": datetime.now().year,
+        }
+        if isinstance(modelElement, Topic):
+            topic = modelElement
+            record["topic"] = cls.topicRecord(topic)
+            record["extends"] = [
+                cls.topicRecord(extends_topic)
+                for extends_topic in topic.get_extends_topics()
+            ]
+            topic_links = []
+            for topicLinks in [topic.sourceTopicLinks, topic.targetTopicLinks]:
+                for topicLink in topicLinks.values():
+                    tl_record = cls.plainRecord(topicLink)
+                    for role in ["sourceTopic", "targetTopic"]:
+                        linked_topic = getattr(topicLink, role, None)
+                        if linked_topic is not None:
+                            tl_record[role] = cls.topicRecord(linked_topic)
+                    topic_links.append(tl_record)
+            record["topicLinks"] = topic_links
+        elif isinstance(modelElement, Property):
+            prop = modelElement
+            record["property"] = cls.propertyRecord(prop)
+            if prop.topicLink is not None:
+                record["topicLink"] = cls.plainRecord(prop.topicLink)
+        else:
+            record["element"] = cls.plainRecord(modelElement)
+        return record
+
+    @classmethod
+    def fingerprint(cls, ypCell: YpCell) -> str:
+        """
+        get the fingerprint of the generation inputs of the given cell
+
+        Args:
+            ypCell(YpCell): the cell
+
+        Returns:
+            str: the fingerprint
+        """
+        record = cls.fingerprintRecord(ypCell.modelElement)
+        record["target"] = getattr(ypCell.target, "target_key", ypCell.target.name)
+        record_json = json.dumps(record, sort_keys=True, default=str)
+        fingerprint = cls.hash(record_json)
+        return fingerprint
+
+    def getKey(self, ypCell: YpCell) -> tuple:
+        """
+        get the key of the given cell
+        """
+        target_key = getattr(ypCell.target, "target_key", ypCell.target.name)
+        key = (target_key, ypCell.getPageTitle())
+        return key
+
+    def isCurrent(self, ypCell: YpCell, mode: str) -> bool:
+        """
+        check whether the given cell has been generated with unchanged inputs
+
+        Args:
+            ypCell(YpCell): the cell to check
+            mode(str): the generation mode e.g. "file" or "mwapi:wiki"
+
+        Returns:
+            bool: True if the stored fingerprint matches the current one
+        """
+        target_key, page_title = self.getKey(ypCell)
+        row = self.connection.execute(
+            "SELECT fingerprint FROM cells WHERE mode=? AND target_key=? AND page_title=?",
+            (mode, target_key, page_title),
+        ).fetchone()
+        current = row is not None and row[0] == self.fingerprint(ypCell)
+        return current
+
+    def yieldChangedCells(
+        self, ypCells: Iterable[YpCell], mode: str, is_present: Callable = None
+    ):
+        """
+        filter the given cells to the ones that need to be generated
+
+        Args:
+            ypCells(Iterable[YpCell]): the cells to filter
+            mode(str): the generation mode
+            is_present(Callable): optional check whether the result of a
+                current cell is still present e.g. as a file
+
+        Returns:
+            generator(YpCell): the cells whose inputs changed
+        """
+        skipped = 0
+        for ypCell in ypCells:
+            if self.isCurrent(ypCell, mode) and (
+                is_present is None or is_present(ypCell)
+            ):
+                skipped += 1
+                continue
+            yield ypCell
+        if self.debug:
+            print(f"incremental {mode}: {skipped} unchanged cells skipped")
+
+    def update(
+        self, ypCell: YpCell, mode: str, markup: str = None, markup_hash: str = None
+    ):
+        """
+        remember the successful generation of the given cell
+
+        Args:
+            ypCell(YpCell): the cell that has been generated
+            mode(str): the generation mode
+            markup(str): the markup that has been pushed
+            markup_hash(str): the hash of the markup if the markup
+                itself has not been kept
+        """
+        if markup_hash is None:
+            markup_hash = self.hash(markup)
+        target_key, page_title = self.getKey(ypCell)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cells VALUES (?,?,?,?,?,?)",
+            (
+                mode,
+                target_key,
+                page_title,
+                self.fingerprint(ypCell),
+                markup_hash,
+                datetime.now().isoformat(),
+            ),
+        )
+        self.pending_updates += 1
+        if self.pending_updates >= self.commit_interval:
+            self.commit()
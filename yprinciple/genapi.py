@@ -4,16 +4,28 @@ Created on 2023-01-30
 @author: wf
 """
 
+import os
 import sys
 import traceback
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple
 
 from meta.metamodel import Context
 from meta.mw import SMWAccess
 from wikibot3rd.wikipush import WikiPush
 
+from yprinciple.context_cache import ContextCache
+from yprinciple.context_diff import ContextDiff
+from yprinciple.edit_scheduler import EditScheduler
+from yprinciple.file_writer import BulkFileWriter
+from yprinciple.gen_cache import GenerationCache
+from yprinciple.impact import DependencyGraph
+from yprinciple.page_cache import PageCache
 from yprinciple.smw_targets import SMWTarget
-from yprinciple.ypcell import YpCell
+from yprinciple.tracing import tracer
+from yprinciple.ypcell import FileGenResult, MwGenResult, YpCell
 
 
 class GeneratorAPI:
@@ -36,6 +48,7 @@ class GeneratorAPI:
         self.debug = debug
         self.args = None
         self.errmsg = None
+        self.context_cache = ContextCache(debug=debug)
 
     @classmethod
     def fromArgs(cls, args) -> "GeneratorAPI":
@@ -49,14 +62,20 @@ class GeneratorAPI:
             GeneratorAPI:
         """
         gen = GeneratorAPI(verbose=not args.quiet, debug=args.debug)
+        if getattr(args, "noContextCache", False):
+            gen.context_cache = None
         gen.setWikiAndGetContexts(args)
-        if args.sidif:
-            gen.context, gen.error, gen.errmsg = Context.fromSiDIF_input(
-                args.sidif, debug=args.debug
-            )
-        else:
-            wikiId = args.source if args.push else args.wikiId
-            gen.readContext(wikiId, args.context)
+        with tracer.span("context load", context=args.context) as span:
+            if args.sidif:
+                span.set(sidif=args.sidif)
+                gen.context, gen.error, gen.errmsg = Context.fromSiDIF_input(
+                    args.sidif, debug=args.debug
+                )
+            else:
+                wikiId = args.source if args.push else args.wikiId
+                gen.readContext(wikiId, args.context)
+            if gen.context:
+                span.set(topics=len(gen.context.topics))
         # remember complete arguments (e.g. for push)
         gen.args = args
         return gen
@@ -85,11 +104,27 @@ class GeneratorAPI:
             self.context = None
             self.errmsg = f"Context {context_name} not available in {wikiId}"
             self.error = Exception(self.errmsg)
+        elif self.context_cache is not None:
+            self.context, self.error, self.errmsg = self.context_cache.getContext(
+                self.mw_context
+            )
         else:
             self.context, self.error, self.errmsg = Context.fromWikiContext(
                 self.mw_context, debug=self.debug
             )
 
+    def getDefaultTargetDir(self) -> str:
+        """
+        get the default target directory being the wikibackup directory
+        of my wiki
+
+        Returns:
+            str: the path of the directory
+        """
+        home = Path.home()
+        target_dir = f"{home}/wikibackup/{self.wikiId}"
+        return target_dir
+
     def filterTargets(self, target_names: list = None) -> dict:
         """
         filter targets by a list of target_names
@@ -100,14 +135,16 @@ class GeneratorAPI:
         Returns:
             dict: mapping from target names to targets
         """
-        allTargets = SMWTarget.getSMWTargets()
-        if target_names is None:
-            targets = allTargets
-        else:
-            targets = {}
-            for target_name in target_names:
-                if target_name in allTargets:
-                    targets[target_name] = allTargets[target_name]
+        with tracer.span("target filter", targets=target_names) as span:
+            allTargets = SMWTarget.getSMWTargets()
+            if target_names is None:
+                targets = allTargets
+            else:
+                targets = {}
+                for target_name in target_names:
+                    if target_name in allTargets:
+                        targets[target_name] = allTargets[target_name]
+            span.set(count=len(targets))
         return targets
 
     def yieldYpCells(
@@ -173,52 +210,420 @@ class GeneratorAPI:
         if self.debug:
             print(traceback.format_exc())
 
-    def generateViaMwApi(
+    def prefetchPages(self, ypCells: Iterable[YpCell]) -> PageCache:
+        """
+        prefetch the wiki pages of the given cells with batched API calls
+
+        Args:
+            ypCells(Iterable[YpCell]): the cells to prefetch the pages for
+
+        Returns:
+            PageCache: the prefetched pages
+        """
+        page_cache = PageCache.ofWikiClient(self.smwAccess.wikiClient, debug=self.debug)
+        page_titles = []
+        for ypCell in ypCells:
+            page_titles.extend(ypCell.getPageTitles())
+        with tracer.span("prefetch", pages=len(page_titles)) as span:
+            page_cache.prefetch(page_titles)
+            span.set(queries=page_cache.query_count)
+        if self.verbose:
+            print(
+                f"prefetched {len(page_cache)} pages with {page_cache.query_count} queries"
+            )
+        return page_cache
+
+    def yieldImpactedYpCells(
+        self,
+        hint: str,
+        changed_topics: list,
+        target_names: list = None,
+        topic_names: list = None,
+    ):
+        """
+        yield only the cells affected by a change of the given topics
+        and properties according to the dependency graph of my context
+
+        Args:
+            hint(str): hint message to show how the yield is used
+            changed_topics(list): the changed topic names and "Topic.property" keys
+            target_names(list): if set filter targets by name
+            topic_names(list): if set filter topics by name
+
+        Returns:
+            generator(YpCell)
+        """
+        changed_topic_names, property_keys = DependencyGraph.splitChanges(
+            changed_topics
+        )
+        impact = DependencyGraph(self.context).getImpact(
+            changed_topic_names, property_keys
+        )
+        impacted_topic_names = [
+            topic_name
+            for topic_name in impact.getTopicNames()
+            if topic_names is None or topic_name in topic_names
+        ]
+        targets = SMWTarget.getSMWTargets()
+        target_keys = {target.name: key for key, target in targets.items()}
+        ypCells = (
+            ypCell
+            for ypCell in self.yieldYpCells(hint, target_names, impacted_topic_names)
+            if impact.contains(ypCell, target_keys[ypCell.target.name])
+        )
+        yield from self.yieldFormPrimedCells(ypCells)
+
+    def yieldFormPrimedCells(self, ypCells: Iterable[YpCell]):
+        """
+        yield the given cells making sure that the form of the topic
+        of each link property cell has been generated before it
+
+        the form target sets values_from and inputType of link properties
+        so it has to run before the property cells of its topic - filtered
+        cells e.g. of impacted or incremental runs might not include the form cell
+
+        Args:
+            ypCells(Iterable[YpCell]): the cells in generation order
+
+        Returns:
+            generator(YpCell)
+        """
+        form_target = None
+        form_done = set()
+        for ypCell in ypCells:
+            target_key = getattr(ypCell.target, "target_key", ypCell.target.name)
+            element = ypCell.modelElement
+            if target_key == "form":
+                form_done.add(element.name)
+            elif target_key == "property" and element.isLink:
+                if element.topic not in form_done:
+                    if form_target is None:
+                        form_target = SMWTarget.getSMWTargets()["form"]
+                    topic = self.context.topics[element.topic]
+                    form_target.formTemplate(topic, isMultiple=False)
+                    form_done.add(element.topic)
+            yield ypCell
+
+    def getContextDiff(self, old_context: Context) -> ContextDiff:
+        """
+        get the difference between the given old version of my context
+        and my context e.g. to generate only the affected cells via
+        selectYpCells(changed_topics=diff.getChanges(self.context))
+
+        Args:
+            old_context(Context): the old version of my context
+
+        Returns:
+            ContextDiff: the added, removed and changed topics, properties
+            and topic links and the orphaned pages
+        """
+        diff = ContextDiff.compare(old_context, self.context)
+        return diff
+
+    def selectYpCells(
+        self,
+        hint: str,
+        target_names: list = None,
+        topic_names: list = None,
+        changed_topics: list = None,
+    ):
+        """
+        yield all cells for the given target and topic names or
+        only the cells affected by the given changed topics
+
+        Args:
+            hint(str): hint message to show how the yield is used
+            target_names(list): if set filter targets by name
+            topic_names(list): if set filter topics by name
+            changed_topics(list): if set only yield the cells affected
+                by these changed topic names and "Topic.property" keys
+
+        Returns:
+            generator(YpCell)
+        """
+        if changed_topics is None:
+            ypCells = self.yieldYpCells(hint, target_names, topic_names)
+        else:
+            ypCells = self.yieldImpactedYpCells(
+                hint, changed_topics, target_names, topic_names
+            )
+        return ypCells
+
+    def workOnCells(
+        self,
+        ypCells: Iterable[YpCell],
+        cell_work: Callable,
+        jobs: int = 1,
+        edit_scheduler: EditScheduler = None,
+        prepare: Callable = None,
+    ):
+        """
+        work on the given ypCells with the given cell_work function
+
+        with jobs > 1 a bounded pool of worker threads is used so that
+        the network round trips of independent cells overlap - the results
+        are still yielded in the order of the given cells
+
+        with an edit scheduler the cells that failed transiently are queued
+        and retried with exponential backoff after all other cells so that
+        their results are yielded last
+
+        Args:
+            ypCells(Iterable[YpCell]): the cells to work on
+            cell_work(Callable): the function to call for each cell
+            jobs(int): the maximum number of cells to work on concurrently
+            edit_scheduler(EditScheduler): the scheduler deciding which failures
+                to retry and when - if None failures are not retried
+            prepare(Callable): optional function to call for each cell in cell order
+                in the calling thread before its cell_work is started - its result
+                is passed to cell_work as second argument
+
+        Returns:
+            generator(tuple(YpCell,object)): the cells and their results - cells
+            for which the work failed are handled via handleFailure and skipped
+        """
+        retry_queue = []
+
+        def handleFailure(ypCell: YpCell, ex: BaseException):
+            if edit_scheduler is not None and edit_scheduler.isTransient(ex):
+                retry_queue.append((ypCell, ex))
+            else:
+                self.handleFailure(ypCell, ex)
+
+        yield from self.runCells(ypCells, cell_work, jobs, handleFailure, prepare)
+        attempt = 0
+        while retry_queue:
+            attempt += 1
+            failed = list(retry_queue)
+            retry_queue.clear()
+            if attempt > edit_scheduler.max_retries:
+                for ypCell, ex in failed:
+                    self.handleFailure(ypCell, ex)
+                break
+            delay = edit_scheduler.getRetryDelay(attempt)
+            if self.debug or self.verbose:
+                print(
+                    f"retrying {len(failed)} cells in {delay:.1f} s (attempt {attempt})"
+                )
+            edit_scheduler.onRetry(len(failed))
+            with tracer.span("retry", attempt=attempt, cells=len(failed)):
+                edit_scheduler.sleep(delay)
+            failed_cells = [ypCell for ypCell, _ex in failed]
+            yield from self.runCells(
+                failed_cells, cell_work, jobs, handleFailure, prepare
+            )
+
+    def runCells(
+        self,
+        ypCells: Iterable[YpCell],
+        cell_work: Callable,
+        jobs: int,
+        handleFailure: Callable[[YpCell, BaseException], None],
+        prepare: Callable = None,
+    ):
+        """
+        run the given cell_work function on the given ypCells in order
+
+        Args:
+            ypCells(Iterable[YpCell]): the cells to work on
+            cell_work(Callable): the function to call for each cell
+            jobs(int): the maximum number of cells to work on concurrently
+            handleFailure(Callable): the handler for failed cells
+            prepare(Callable): optional function to call for each cell in the
+                calling thread - see workOnCells
+
+        Returns:
+            generator(tuple(YpCell,object)): the cells and their results
+        """
+
+        def getArgs(ypCell: YpCell) -> tuple:
+            return (ypCell,) if prepare is None else (ypCell, prepare(ypCell))
+
+        if jobs is None or jobs <= 1:
+            for ypCell in ypCells:
+                try:
+                    yield ypCell, cell_work(*getArgs(ypCell))
+                except Exception as ex:
+                    handleFailure(ypCell, ex)
+            return
+
+        def collect(ypCell, future):
+            try:
+                return [(ypCell, future.result())]
+            except Exception as ex:
+                handleFailure(ypCell, ex)
+                return []
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            # keep a bounded window of cells in flight to limit memory usage
+            pending = deque()
+            for ypCell in ypCells:
+                try:
+                    future = executor.submit(cell_work, *getArgs(ypCell))
+                except Exception as ex:
+                    handleFailure(ypCell, ex)
+                    continue
+                pending.append((ypCell, future))
+                if len(pending) >= 2 * jobs:
+                    yield from collect(*pending.popleft())
+            while pending:
+                yield from collect(*pending.popleft())
+
+    def yieldViaMwApi(
         self,
         target_names: list = None,
         topic_names: list = None,
         dryRun: bool = True,
         withEditor: bool = False,
-    ):
+        jobs: int = 1,
+        prefetch: bool = True,
+        ignore_whitespace: bool = False,
+        incremental: bool = False,
+        changed_topics: list = None,
+        compact: bool = False,
+        edit_scheduler: EditScheduler = None,
+    ) -> Iterator[Tuple[YpCell, MwGenResult]]:
         """
-        start the generation via MediaWiki API
+        generate via MediaWiki API and yield each result as soon as
+        its cell is done so that callers can stream the results instead
+        of holding all of them in memory
 
         Args:
             target_names(list): an optional list of target names
             topic_name(list): an optional list of topic names
             dryRun(bool): if True do not transfer results
             withEditor(bool): if True - start editor
+            jobs(int): the number of cells to generate concurrently
+            prefetch(bool): if True prefetch the current pages with batched API calls
+            ignore_whitespace(bool): if True ignore trailing whitespace and line endings
+                when checking whether a page is unchanged
+            incremental(bool): if True only generate cells whose inputs changed
+                since the last successful run
+            changed_topics(list): if set only generate the cells affected by
+                these changed topic names and "Topic.property" keys
+            compact(bool): if True keep only the revision ids, sizes and hashes
+                of the pages and the markup in the results and the cells and
+                drop the prefetched page of each finished cell
+            edit_scheduler(EditScheduler): if set edit with an adaptive rate and
+                retry cells that failed transiently with exponential backoff
 
-        Return:
-            list(MwGenResult): a list of Mediawiki Generator Results
+        Yields:
+            tuple(YpCell,MwGenResult): the cells and their results in cell order -
+                retried cells come last, failed cells are reported
+                via handleFailure and skipped
         """
-        self.smwAccess.wikiClient.login()
-        genResults = []
-        for ypCell in self.yieldYpCells("via Mediawiki Api", target_names, topic_names):
-            try:
+        with tracer.span("generate via api", category="job", dryRun=dryRun, jobs=jobs):
+            self.smwAccess.wikiClient.login()
+            status_counter = Counter()
+            page_cache = None
+            gen_cache = None
+            mode = f"mwapi:{self.wikiId}"
+            ypCells = self.selectYpCells(
+                "via Mediawiki Api", target_names, topic_names, changed_topics
+            )
+            if incremental:
+                gen_cache = GenerationCache.ofDirectory(
+                    self.getDefaultTargetDir(), debug=self.debug
+                )
+                ypCells = self.yieldFormPrimedCells(
+                    gen_cache.yieldChangedCells(ypCells, mode)
+                )
+            if prefetch:
+                ypCells = list(ypCells)
+                page_cache = self.prefetchPages(ypCells)
+
+            def prepare(ypCell: YpCell) -> str:
+                # the markup is generated in cell order since generating a form
+                # sets attributes of the link properties used by the property cells
+                # - only fetching, diffing and editing run concurrently
+                if ypCell.target.is_multi:
+                    return None
+                return ypCell.generateMarkup(withEditor=withEditor)
+
+            def cell_work(ypCell: YpCell, markup: str):
                 genResult = ypCell.generateViaMwApi(
-                    smwAccess=self.smwAccess, dryRun=dryRun, withEditor=withEditor
+                    smwAccess=self.smwAccess,
+                    dryRun=dryRun,
+                    withEditor=withEditor,
+                    page_cache=page_cache,
+                    ignore_whitespace=ignore_whitespace,
+                    compact=compact,
+                    edit_scheduler=edit_scheduler,
+                    markup=markup,
                 )
-                if self.debug or self.verbose:
-                    diff_url = genResult.getDiffUrl()
-                    diff_info = "" if diff_url is None else diff_url
-                    diff_info += f"({len(genResult.markup_diff)})"
-                    print(f"diff: {diff_info}")
-                genResults.append(genResult)
-            except Exception as ex:
-                self.handleFailure(ypCell, ex)
+                if compact and page_cache is not None and ypCell.pageTitle:
+                    page_cache.invalidate(ypCell.pageTitle)
+                return genResult
+
+            try:
+                for ypCell, genResult in self.workOnCells(
+                    ypCells,
+                    cell_work,
+                    jobs=jobs,
+                    edit_scheduler=edit_scheduler,
+                    prepare=prepare,
+                ):
+                    if self.debug or self.verbose:
+                        diff_url = genResult.getDiffUrl()
+                        diff_info = "" if diff_url is None else diff_url
+                        if genResult.diff is not None:
+                            diff_info += f"({genResult.diff.getStats()})"
+                        print(f"diff: {diff_info}")
+                    if gen_cache is not None and genResult.getStatus() != "dry run":
+                        gen_cache.update(
+                            ypCell, mode, markup_hash=genResult.getMarkupHash()
+                        )
+                    status_counter[genResult.getStatus()] += 1
+                    yield ypCell, genResult
+            finally:
+                if gen_cache is not None:
+                    gen_cache.close()
+            if self.debug or self.verbose:
+                self.showStatusSummary("cells", status_counter)
+
+    def generateViaMwApi(self, *args, **kwargs) -> List[MwGenResult]:
+        """
+        start the generation via MediaWiki API
+
+        Args:
+            see yieldViaMwApi
+
+        Return:
+            list(MwGenResult): a list of Mediawiki Generator Results
+        """
+        genResults = [
+            genResult for _ypCell, genResult in self.yieldViaMwApi(*args, **kwargs)
+        ]
         return genResults
 
-    def generateToFile(
+    def showStatusSummary(self, kind: str, status_counter: Counter):
+        """
+        show the number of results per status
+
+        Args:
+            kind(str): the kind of results e.g. cells or files
+            status_counter(Counter): the number of results by status
+        """
+        status_info = ", ".join(
+            f"{count} {status}" for status, count in status_counter.most_common()
+        )
+        total = sum(status_counter.values())
+        print(f"generated {total} {kind}: {status_info}")
+
+    def yieldToFile(
         self,
         target_dir=None,
         target_names: list = None,
         topic_names: list = None,
         dryRun: bool = True,
         withEditor: bool = False,
-    ):
+        incremental: bool = False,
+        processes: int = 1,
+        changed_topics: list = None,
+    ) -> Iterator[Tuple[YpCell, FileGenResult]]:
         """
-        start the generation via MediaWiki Backup Directory
+        generate to the MediaWiki Backup Directory and yield each result
+        as soon as it is available
 
         Args:
             target_dir(str): the path to the target directory
@@ -227,26 +632,343 @@ class GeneratorAPI:
 
             dryRun(bool): if True do not transfer results
             withEditor(bool): if True - start editor
+            incremental(bool): if True only generate cells whose inputs changed
+                since the last successful run or whose file is missing
+            processes(int): the number of worker processes the topics are
+                partitioned across
+            changed_topics(list): if set only generate the cells affected by
+                these changed topic names and "Topic.property" keys
+
+        Yields:
+            tuple(YpCell,FileGenResult): the cells and their results in topic order
+        """
+        with tracer.span(
+            "generate to file", category="job", dryRun=dryRun, processes=processes
+        ):
+            if target_dir is None:
+                target_dir = self.getDefaultTargetDir()
+            if processes > 1:
+                results = self.yieldToFileInProcesses(
+                    target_dir=target_dir,
+                    target_names=target_names,
+                    topic_names=topic_names,
+                    dryRun=dryRun,
+                    withEditor=withEditor,
+                    incremental=incremental,
+                    processes=processes,
+                    changed_topics=changed_topics,
+                )
+            else:
+                results = self.yieldCellsToFile(
+                    target_dir=target_dir,
+                    target_names=target_names,
+                    topic_names=topic_names,
+                    dryRun=dryRun,
+                    withEditor=withEditor,
+                    incremental=incremental,
+                    changed_topics=changed_topics,
+                )
+            status_counter = Counter()
+            for ypCell, genResult in results:
+                status_counter[genResult.getStatus()] += 1
+                yield ypCell, genResult
+            if self.debug or self.verbose:
+                self.showStatusSummary("files", status_counter)
+
+    def generateToFile(self, *args, **kwargs) -> List[FileGenResult]:
+        """
+        start the generation via MediaWiki Backup Directory
+
+        Args:
+            see yieldToFile
 
         Return:
             list(FileGenResult): a list of File Generator Results
         """
-        genResults = []
-        if target_dir is None:
-            home = Path.home()
-            target_dir = f"{home}/wikibackup/{self.wikiId}"
-        for ypCell in self.yieldYpCells(
-            f" to file in {target_dir}", target_names, topic_names
-        ):
-            try:
-                genResult = ypCell.generateToFile(
-                    target_dir=target_dir, dryRun=dryRun, withEditor=withEditor
+        genResults = [
+            genResult for _ypCell, genResult in self.yieldToFile(*args, **kwargs)
+        ]
+        return genResults
+
+    def yieldCellsToFile(
+        self,
+        target_dir: str,
+        target_names: list = None,
+        topic_names: list = None,
+        dryRun: bool = True,
+        withEditor: bool = False,
+        incremental: bool = False,
+        changed_topics: list = None,
+        ypCells: Iterable[YpCell] = None,
+    ) -> Iterator[Tuple[YpCell, FileGenResult]]:
+        """
+        generate the cells to files in the given target directory
+        with a single bulk file writer
+
+        Args:
+            see yieldToFile
+            ypCells(Iterable[YpCell]): the cells to generate - if None
+                the cells selected by the target and topic names and changed topics
+
+        Yields:
+            tuple(YpCell,FileGenResult): the cells and their results -
+                failed cells are reported via handleFailure and skipped
+        """
+        gen_cache = None
+        file_writer = BulkFileWriter(target_dir)
+        mode = "file"
+        if ypCells is None:
+            ypCells = self.selectYpCells(
+                f" to file in {target_dir}", target_names, topic_names, changed_topics
+            )
+        if incremental:
+            gen_cache = GenerationCache.ofDirectory(target_dir, debug=self.debug)
+
+            def is_present(ypCell: YpCell) -> bool:
+                filename = ypCell.target.getFileName(ypCell.modelElement, "")
+                return os.path.isfile(os.path.join(target_dir, filename))
+
+            ypCells = self.yieldFormPrimedCells(
+                gen_cache.yieldChangedCells(ypCells, mode, is_present)
+            )
+        try:
+            for ypCell in ypCells:
+                try:
+                    genResult = ypCell.generateToFile(
+                        target_dir=target_dir,
+                        dryRun=dryRun,
+                        withEditor=withEditor,
+                        file_writer=file_writer,
+                    )
+                    if gen_cache is not None and not dryRun:
+                        gen_cache.update(ypCell, mode, genResult.markup)
+                except Exception as ex:
+                    self.handleFailure(ypCell, ex)
+                    continue
+                yield ypCell, genResult
+        finally:
+            if gen_cache is not None:
+                gen_cache.close()
+
+    def generateCellsToFile(self, *args, **kwargs) -> List[FileGenResult]:
+        """
+        generate the cells to files in the given target directory
+        with a single bulk file writer
+
+        Args:
+            see yieldCellsToFile
+
+        Return:
+            list(FileGenResult): a list of File Generator Results
+        """
+        genResults = [
+            genResult for _ypCell, genResult in self.yieldCellsToFile(*args, **kwargs)
+        ]
+        return genResults
+
+    def partitionTopics(
+        self, topic_names: list = None, partitions: int = 1
+    ) -> List[list]:
+        """
+        partition the topics of my context into contiguous chunks
+        so that concatenating the results keeps the topic order
+
+        Args:
+            topic_names(list): an optional list of topic names to filter
+            partitions(int): the number of chunks
+
+        Returns:
+            List[list]: the lists of topic names
+        """
+        names = [
+            topic_name
+            for topic_name in self.context.topics.keys()
+            if topic_names is None or topic_name in topic_names
+        ]
+        partitions = max(1, min(partitions, len(names)))
+        size, remainder = divmod(len(names), partitions)
+        chunks = []
+        start = 0
+        for i in range(partitions):
+            end = start + size + (1 if i < remainder else 0)
+            chunks.append(names[start:end])
+            start = end
+        return chunks
+
+    def yieldToFileInProcesses(
+        self,
+        target_dir: str,
+        target_names: list = None,
+        topic_names: list = None,
+        dryRun: bool = True,
+        withEditor: bool = False,
+        incremental: bool = False,
+        processes: int = 2,
+        changed_topics: list = None,
+    ) -> Iterator[Tuple[YpCell, FileGenResult]]:
+        """
+        generate to files with a pool of worker processes
+
+        the context is shipped to each worker once via the pool initializer -
+        the topics are partitioned into more chunks than workers so that
+        topics of different size are balanced across the workers
+
+        Args:
+            see yieldToFile
+
+        Yields:
+            tuple(YpCell,FileGenResult): the cells and their results in topic order -
+                the results of a chunk are yielded as soon as all previous
+                chunks are done
+        """
+        chunks = self.partitionTopics(topic_names, partitions=processes * 4)
+        targets = SMWTarget.getSMWTargets()
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=initFileWorker,
+            initargs=(self.context, self.verbose, self.debug),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    generateTopicsToFile,
+                    target_dir,
+                    target_names,
+                    chunk,
+                    dryRun,
+                    withEditor,
+                    incremental,
+                    changed_topics,
                 )
-                genResults.append(genResult)
-            except Exception as ex:
-                self.handleFailure(ypCell, ex)
+                for chunk in chunks
+            ]
+            for future in futures:
+                for cell_key, genResult in future.result():
+                    yield self.getYpCell(cell_key, targets), genResult
+
+    def generateToFileInProcesses(self, *args, **kwargs) -> List[FileGenResult]:
+        """
+        generate to files with a pool of worker processes
+
+        Args:
+            see yieldToFileInProcesses
+
+        Return:
+            list(FileGenResult): a list of File Generator Results in topic order
+        """
+        genResults = [
+            genResult
+            for _ypCell, genResult in self.yieldToFileInProcesses(*args, **kwargs)
+        ]
         return genResults
 
+    @staticmethod
+    def getCellKey(ypCell: YpCell) -> tuple:
+        """
+        get the key of the given cell to pass it between processes
+
+        Returns:
+            tuple: the target key, the topic name and the property name (if any)
+        """
+        element = ypCell.modelElement
+        if ypCell.target.target_key == "property":
+            cell_key = ("property", element.topic, element.name)
+        else:
+            cell_key = (ypCell.target.target_key, element.name, None)
+        return cell_key
+
+    def getYpCell(self, cell_key: tuple, targets: dict) -> YpCell:
+        """
+        get a cell of my context for the given key
+
+        Args:
+            cell_key(tuple): the key as returned by getCellKey
+            targets(dict): the targets by target key
+
+        Returns:
+            YpCell: the cell
+        """
+        target_key, topic_name, prop_name = cell_key
+        element = self.context.topics[topic_name]
+        if prop_name is not None:
+            element = element.properties[prop_name]
+        ypCell = YpCell(modelElement=element, target=targets[target_key])
+        return ypCell
+
+    def getPushQueries(self, topic_names: List[str]) -> List[tuple]:
+        """
+        get the ask queries for the pages to push for the given topics -
+        the topic names are combined with || so that a single query
+        covers all of them
+
+        Args:
+            topic_names(list): the names of the topics
+
+        Returns:
+            list: tuples of ask query and the field to select the page title from
+        """
+        concepts = "||".join(f"Concept:{topic_name}" for topic_name in topic_names)
+        names = "||".join(topic_names)
+        queries = [
+            (f"{{{{#ask: [[Property topic::{concepts}]]|?#=page}}}}", "page"),
+            (
+                f"{{{{#ask: [[Topic name::{names}]]|?Topic context=context}}}}",
+                "context",
+            ),
+        ]
+        return queries
+
+    def collectPushPageTitles(
+        self,
+        wikiPush: WikiPush,
+        topic_names: List[str],
+        batch_size: int = 50,
+        jobs: int = 1,
+    ) -> List[str]:
+        """
+        collect the titles of the pages to push for the given topics
+
+        Args:
+            wikiPush(WikiPush): the WikiPush to query the source wiki with
+            topic_names(list): the names of the topics
+            batch_size(int): the number of topics per ask query
+            jobs(int): the number of ask queries to run concurrently
+
+        Returns:
+            list: the page titles in order without duplicates
+        """
+        page_titles = []
+        for topic_name in topic_names:
+            topic = self.context.topics[topic_name]
+            page_titles.extend(
+                [
+                    f"Concept:{topic_name}",
+                    f"Category:{topic_name}",
+                    f"Template:{topic_name}",
+                    f"Form:{topic_name}",
+                    f"Help:{topic_name}",
+                    f"List of {topic.pluralName}",
+                ]
+            )
+        queries = []
+        for i in range(0, len(topic_names), batch_size):
+            queries.extend(self.getPushQueries(topic_names[i : i + batch_size]))
+
+        def run_query(query: tuple) -> list:
+            page_query, page_field = query
+            query_page_titles = wikiPush.query(
+                page_query,
+                wiki=self.smwSourceAccess.wikiClient,
+                pageField=page_field,
+            )
+            return query_page_titles
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for query_page_titles in executor.map(run_query, queries):
+                page_titles.extend(query_page_titles)
+        # a dict keeps the insertion order
+        page_titles = list(dict.fromkeys(page_titles))
+        return page_titles
+
     def push(self):
         """
         push according to my command line args
@@ -256,7 +978,7 @@ class GeneratorAPI:
         if self.args.topics:
             topic_names = self.args.topics
         else:
-            topic_names = self.context.topics.keys()
+            topic_names = list(self.context.topics.keys())
         login = self.args.login
         force = self.args.force
         ignore = True
@@ -272,38 +994,9 @@ class GeneratorAPI:
             print(
                 f"pushing concept {self.args.context} from {self.args.source} to {self.wikiId} ..."
             )
-        all_page_titles = []
-        for topic_name in topic_names:
-            topic = self.context.topics[topic_name]
-            for page_titles, page_query, query_field in [
-                ([f"Concept:{topic_name}"], None, None),
-                ([f"Category:{topic_name}"], None, None),
-                ([f"Template:{topic_name}"], None, None),
-                ([f"Form:{topic_name}"], None, None),
-                ([f"Help:{topic_name}"], None, None),
-                ([f"List of {topic.pluralName}"], None, None),
-                (
-                    None,
-                    f"{{{{#ask: [[Property topic::Concept:{topic_name}]]|?#=page}}}}",
-                    "page",
-                ),
-                (
-                    None,
-                    f"{{{{#ask: [[Topic name::{topic_name}]]|?Topic context=context}}}}",
-                    "context",
-                ),
-            ]:
-                if not page_titles:
-                    page_titles = wikiPush.query(
-                        page_query,
-                        wiki=self.smwSourceAccess.wikiClient,
-                        queryField=query_field,
-                    )
-                all_page_titles.extend(
-                    page_title
-                    for page_title in page_titles
-                    if page_title not in all_page_titles
-                )
+        all_page_titles = self.collectPushPageTitles(
+            wikiPush, topic_names, jobs=getattr(self.args, "jobs", 1)
+        )
         failed = wikiPush.push(
             pageTitles=all_page_titles, force=force, ignore=ignore, withImages=True
         )
@@ -311,3 +1004,52 @@ class GeneratorAPI:
             print(f"️Error {len(failed)} push attempts failed ❌️")
             for i, fail_name in enumerate(failed[:20]):
                 print(f"    {i+1:2}: {fail_name} ❌")
+
+
+# the GeneratorAPI of a worker process of generateToFileInProcesses
+file_worker_gen = None
+
+
+def initFileWorker(context: Context, verbose: bool, debug: bool):
+    """
+    initialize a worker process of generateToFileInProcesses
+    with the context to generate from
+
+    Args:
+        context(Context): the context
+        verbose(bool): if True show verbose messages
+        debug(bool): if True switch debugging on
+    """
+    global file_worker_gen
+    file_worker_gen = GeneratorAPI(verbose=verbose, debug=debug)
+    file_worker_gen.context = context
+
+
+def generateTopicsToFile(
+    target_dir: str,
+    target_names: list,
+    topic_names: list,
+    dryRun: bool,
+    withEditor: bool,
+    incremental: bool,
+    changed_topics: list = None,
+) -> list:
+    """
+    generate the given topics to files in a worker process
+
+    Return:
+        list(tuple): the keys of the generated cells and their File Generator Results
+    """
+    results = [
+        (GeneratorAPI.getCellKey(ypCell), genResult)
+        for ypCell, genResult in file_worker_gen.yieldCellsToFile(
+            target_dir=target_dir,
+            target_names=target_names,
+            topic_names=topic_names,
+            dryRun=dryRun,
+            withEditor=withEditor,
+            incremental=incremental,
+            changed_topics=changed_topics,
+        )
+    ]
+    return results
@@ -4,6 +4,10 @@ Created on 25.11.2022
 @author: wf
 """
 
+import asyncio
+import os
+import tempfile
+from collections import Counter
 from typing import Callable, List
 
 from meta.metamodel import Context, Topic
@@ -12,8 +16,13 @@ from ngwidgets.widgets import Link
 from nicegui import run, ui
 from nicegui.elements.tooltip import Tooltip
 
+from yprinciple.async_genapi import AsyncGeneratorAPI, AsyncMwApi
+from yprinciple.page_cache import PageCache
+from yprinciple.profiler import HotPathProfiler
 from yprinciple.target import Target
-from yprinciple.ypcell import YpCell
+from yprinciple.tracing import tracer
+from yprinciple.ui_coalescer import UpdateCoalescer
+from yprinciple.ypcell import MwGenResult, YpCell
 
 
 class GeneratorGrid:
@@ -23,6 +32,9 @@ class GeneratorGrid:
     see https://wiki.bitplan.com/index.php/Y-Prinzip#Example
     """
 
+    # status of a cell whose page status has not been resolved yet
+    pending_status = "⏳"
+
     def __init__(
         self, targets: dict, parent, solution: WebSolution, iconSize: str = "32px"
     ):
@@ -46,6 +58,10 @@ class GeneratorGrid:
         self.header_checkbox_by_id = {}
         self.cell_debug_msg_divs = []
         self.targets = targets
+        self.page_cache = None
+        self.ypcells_by_topic = {}
+        # coalesced grid and progress updates at most 10 times per second
+        self.ui_updates = UpdateCoalescer(min_interval=0.1)
         self.setup_styles()
         self.setup_ui()
 
@@ -159,7 +175,81 @@ class GeneratorGrid:
                             checkedYpCells.append(subCell)
         return checkedYpCells
 
-    def generateCheckedCells(self, cellsToGen: List[YpCell]):
+    def clearStatus(self, ypCell: YpCell):
+        """
+        clear the status display of the given cell
+        """
+        cell_checkbox = self.checkbox_by_id.get(ypCell.checkbox_id, None)
+        if cell_checkbox is not None:
+            status_div = cell_checkbox.status_div
+            with status_div:
+                status_div.clear()
+                status_div.content = ""
+
+    def showGenResult(self, ypCell: YpCell, genResult: MwGenResult):
+        """
+        show the diff link for the given generator result of the given cell
+        """
+        cell_checkbox = self.checkbox_by_id.get(ypCell.checkbox_id, None)
+        if genResult is not None and cell_checkbox is not None:
+            delta_color = ""
+            delta_text = "Δ"
+            diff_url = genResult.getDiffUrl()
+            if genResult.unchanged:
+                delta_text = "="
+                delta_color = "text-green-500"
+            elif diff_url is not None:
+                if genResult.page_changed():
+                    delta_color = "text-red-500"
+                else:
+                    delta_color = "text-green-500"
+            else:
+                delta_color = "text-gray-500"
+            with cell_checkbox.status_div:
+                link = Link.create(url=diff_url, text=delta_text)
+                _link_html = ui.html(link).classes(
+                    "text-xl font-bold " + delta_color,
+                )
+
+    def showFailure(self, ypCell: YpCell, ex: BaseException):
+        """
+        show the failure of the given cell
+        """
+        cell_checkbox = self.checkbox_by_id.get(ypCell.checkbox_id, None)
+        if cell_checkbox is not None:
+            with cell_checkbox.status_div:
+                cell_checkbox.status_div.content = f"❗ error:{str(ex)}"
+        self.solution.handle_exception(ex)
+
+    def showGenSummary(self, total: int, status_counter: Counter):
+        """
+        show the summary of a generation run
+        """
+        status_info = ", ".join(
+            f"{count} {status}" for status, count in status_counter.most_common()
+        )
+        self.solution.log_view.push(f"generated {total} cells: {status_info}")
+
+    def showProfile(self, profiler: HotPathProfiler):
+        """
+        save the profile of a generation run and show its report in the log
+        """
+        path = os.path.join(tempfile.gettempdir(), "ypgen-grid.pstats")
+        report = profiler.save(path)
+        self.solution.log_view.push(f"profile saved to {path}\n{report}")
+
+    def generateCheckedCells(
+        self, cellsToGen: List[YpCell], profiler: HotPathProfiler = None
+    ):
+        """
+        generate the given cells sequentially
+
+        Args:
+            cellsToGen(List[YpCell]): the cells to generate
+            profiler(HotPathProfiler): optional profiler to run in this thread
+        """
+        if profiler is not None:
+            profiler.start()
         try:
             # force login
             if not self.solution.smwAccess.wikiClient._is_logged_in:
@@ -167,40 +257,60 @@ class GeneratorGrid:
                 if ex:
                     self.solution.handle_exception(ex)
                     return
+            status_counter = Counter()
             for ypCell in cellsToGen:
-                cell_checkbox = self.checkbox_by_id.get(ypCell.checkbox_id, None)
-                status_div = cell_checkbox.status_div
-                with status_div:
-                    status_div.clear()
-                    status_div.content = ""
+                self.clearStatus(ypCell)
                 try:
                     genResult = ypCell.generateViaMwApi(
                         smwAccess=self.solution.smwAccess,
                         dryRun=self.solution.dryRun,
                         withEditor=self.solution.openEditor,
+                        ignore_whitespace=self.solution.ignoreWhitespace,
+                        compact=True,
                     )
-                    if genResult is not None and cell_checkbox is not None:
-                        delta_color = ""
-                        diff_url = genResult.getDiffUrl()
-                        if diff_url is not None:
-                            if genResult.page_changed():
-                                delta_color = "text-red-500"
-                            else:
-                                delta_color = "text-green-500"
-                        else:
-                            delta_color = "text-gray-500"
-                        with status_div:
-                            link = Link.create(url=diff_url, text="Δ")
-                            _link_html = ui.html(link).classes(
-                                "text-xl font-bold " + delta_color,
-                            )
+                    if genResult is not None:
+                        status_counter[genResult.getStatus()] += 1
+                    self.showGenResult(ypCell, genResult)
                 except BaseException as ex:
-                    with status_div:
-                        status_div.content = f"❗ error:{str(ex)}"
-                    self.solution.handle_exception(ex)
+                    self.showFailure(ypCell, ex)
+                self.updateProgress()
+            self.showGenSummary(len(cellsToGen), status_counter)
+        except Exception as outer_ex:
+            self.solution.handle_exception(outer_ex)
+        finally:
+            if profiler is not None:
+                profiler.stop()
+            self.flushUpdates()
+
+    async def generateCheckedCellsAsync(self, cellsToGen: List[YpCell]):
+        """
+        generate the given cells on the event loop with concurrent
+        page fetches and edits
+        """
+        try:
+            for ypCell in cellsToGen:
+                self.clearStatus(ypCell)
+
+            def handleFailure(ypCell: YpCell, ex: BaseException):
+                self.showFailure(ypCell, ex)
                 self.updateProgress()
+
+            agen = AsyncGeneratorAPI(self.solution.genapi, handleFailure=handleFailure)
+            status_counter = Counter()
+            async for ypCell, genResult in agen.yieldGenResults(
+                ypCells=cellsToGen,
+                dryRun=self.solution.dryRun,
+                ignore_whitespace=self.solution.ignoreWhitespace,
+                compact=True,
+            ):
+                status_counter[genResult.getStatus()] += 1
+                self.showGenResult(ypCell, genResult)
+                self.updateProgress()
+            self.showGenSummary(len(cellsToGen), status_counter)
         except Exception as outer_ex:
             self.solution.handle_exception(outer_ex)
+        finally:
+            self.flushUpdates()
 
     async def onGenerateButtonClick(self, _msg):
         """
@@ -210,7 +320,16 @@ class GeneratorGrid:
         total = len(cellsToGen)
         ui.notify(f"running {total} generator tasks")
         self.resetProgress("generating", total)
-        await run.io_bound(self.generateCheckedCells, cellsToGen)
+        profiler = HotPathProfiler() if self.solution.profile else None
+        with tracer.span("grid generate", category="job", cells=total):
+            if self.solution.openEditor or profiler is not None:
+                # the editor is blocking - keep it off the event loop
+                # the profiler needs the strictly nested spans of the sequential path
+                await run.io_bound(self.generateCheckedCells, cellsToGen, profiler)
+            else:
+                await self.generateCheckedCellsAsync(cellsToGen)
+        if profiler is not None:
+            self.showProfile(profiler)
 
     def check_ypcell_box(self, checkbox, ypCell, checked: bool):
         """
@@ -371,25 +490,19 @@ class GeneratorGrid:
         checkbox = self.create_simple_checkbox(
             parent=yp_cell_card, label_text=label_text, title=label_text
         )
-        yp_cell.getPage(self.solution.smwAccess)
-        color = "blue" if yp_cell.status == "✅" else "red"
-        link = f"<a href='{yp_cell.pageUrl}' style='color:{color}'>{label_text}<a>"
-        if yp_cell.status == "ⓘ":
-            link = f"{label_text}"
         # in a one column setting we need to break link and status message
-        if columns == 1:
-            label_text = label_text.replace(":", ":<br>")
-            delim = "<br>"
-        else:
-            delim = "&nbsp;"
+        checkbox.delim = "<br>" if columns == 1 else "&nbsp;"
+        # the page status is resolved later - see resolve_page_statuses
         with yp_cell_card:
             link_html = ui.html()
-            link_html.content = f"{link}{delim}"
+            link_html.content = f"{label_text}{checkbox.delim}"
             debug_div = ui.html()
-            debug_div.content = f"{yp_cell.statusMsg}"
+            debug_div.content = ""
             debug_div.visible = not self.cell_hide_size_info
             status_div = ui.html()
-            status_div.content = yp_cell.status
+            status_div.content = self.pending_status
+            checkbox.link_html = link_html
+            checkbox.debug_div = debug_div
             checkbox.status_div = status_div
             self.cell_debug_msg_divs.append(debug_div)
         # link ypCell with check box via a unique identifier
@@ -399,6 +512,93 @@ class GeneratorGrid:
         yp_cell.ui_ready = True
         return checkbox
 
+    def show_page_status(self, yp_cell: YpCell):
+        """
+        show the page status of the given cell from my page cache
+
+        Args:
+            yp_cell(YpCell): the cell to show the status for
+        """
+        checkbox = self.checkbox_by_id.get(yp_cell.checkbox_id, None)
+        if checkbox is None:
+            return
+        # the grid only shows the status - do not keep page objects and texts
+        yp_cell.getPage(
+            self.solution.smwAccess, page_cache=self.page_cache, compact=True
+        )
+        label_text = yp_cell.getLabelText()
+        color = "blue" if yp_cell.status == "✅" else "red"
+        link = f"<a href='{yp_cell.pageUrl}' style='color:{color}'>{label_text}<a>"
+        if yp_cell.status == "ⓘ":
+            link = f"{label_text}"
+        checkbox.link_html.content = f"{link}{checkbox.delim}"
+        checkbox.debug_div.content = f"{yp_cell.statusMsg}"
+        # do not overwrite the result of a generation that finished earlier
+        if checkbox.status_div.content == self.pending_status:
+            checkbox.status_div.content = yp_cell.status
+
+    def show_page_status_failure(self, yp_cell: YpCell, ex: BaseException):
+        """
+        show that the page status of the given cell could not be resolved
+        """
+        checkbox = self.checkbox_by_id.get(yp_cell.checkbox_id, None)
+        if checkbox is not None and checkbox.status_div.content == self.pending_status:
+            checkbox.status_div.content = f"❗ error:{str(ex)}"
+
+    async def resolve_page_statuses(self, batch_size: int = 50, concurrency: int = 4):
+        """
+        resolve the page status of all cells in parallel batches
+        and show each status as soon as its batch arrived
+
+        Args:
+            batch_size(int): the number of page titles per query
+            concurrency(int): the maximum number of queries in flight
+        """
+        cells_by_title = {}
+        for ypCells in self.ypcells_by_topic.values():
+            for ypCell in ypCells:
+                cells = list(ypCell.subCells.values()) if ypCell.subCells else [ypCell]
+                for cell in cells:
+                    if not cell.ui_ready:
+                        continue
+                    if cell.hasPage():
+                        cells_by_title.setdefault(cell.getPageTitle(), []).append(cell)
+                    else:
+                        self.show_page_status(cell)
+        if not cells_by_title:
+            return
+        page_titles = list(cells_by_title.keys())
+        self.resetProgress("resolving pages", total=len(page_titles))
+        site = self.solution.smwAccess.wikiClient.getSite()
+        self.page_cache = PageCache(site, batch_size=batch_size)
+
+        async def resolve_batch(api: AsyncMwApi, batch: List[str]):
+            try:
+                await api.fetchBatch(self.page_cache, batch)
+                for page_title in batch:
+                    for cell in cells_by_title[page_title]:
+                        if page_title in self.page_cache:
+                            self.show_page_status(cell)
+                        else:
+                            # the page is fetched with mwclient - keep it off the event loop
+                            await run.io_bound(self.show_page_status, cell)
+                    self.page_cache.invalidate(page_title)
+            except Exception as ex:
+                for page_title in batch:
+                    for cell in cells_by_title[page_title]:
+                        self.show_page_status_failure(cell, ex)
+                self.solution.handle_exception(ex)
+            self.ui_updates.add_progress(self.solution.progressBar, len(batch))
+
+        async with AsyncMwApi(site, concurrency=concurrency) as api:
+            await asyncio.gather(
+                *[
+                    resolve_batch(api, page_titles[i : i + batch_size])
+                    for i in range(0, len(page_titles), batch_size)
+                ]
+            )
+        self.flushUpdates()
+
     def add_topic_cell(self, topic: Topic):
         """
         add an icon for the given topic
@@ -426,16 +626,29 @@ class GeneratorGrid:
         return topic_icon
 
     def resetProgress(self, desc: str, total: int):
+        # apply pending steps of the previous phase before resetting
+        self.ui_updates.flush()
         self.solution.progressBar.desc = desc
         self.solution.progressBar.total = total
         self.solution.progressBar.reset()
 
-    def updateProgress(self):
+    def updateProgress(self, changed_element=None):
+        """
+        update the progress - the progress bar and the changed element
+        are updated at a bounded rate, see flushUpdates for the final update
+
+        Args:
+            changed_element: an element whose content changed e.g. the grid
+        """
+        self.ui_updates.add_progress(self.solution.progressBar)
+        if changed_element is not None:
+            self.ui_updates.mark_dirty(changed_element)
+
+    def flushUpdates(self):
         """
-        update the progress
+        send all pending progress and element updates
         """
-        self.solution.progressBar.update(1)
-        self.grid.update()
+        self.ui_updates.flush()
 
     def add_yp_cell(self, parent, ypCell: YpCell) -> "ui.checkbox":
         """
@@ -455,11 +668,11 @@ class GeneratorGrid:
                 # )
             for _subcell_name, subCell in ypCell.subCells.items():
                 checkbox = self.create_check_box_for_cell(subCell, parent=hide_show)
-                self.updateProgress()
+                self.updateProgress(self.grid)
                 pass
         else:
             checkbox = self.create_check_box_for_cell(ypCell, parent=self.grid)
-            self.updateProgress()
+            self.updateProgress(self.grid)
         return checkbox
 
     def add_topic_rows(self, context: Context):
@@ -469,28 +682,36 @@ class GeneratorGrid:
         Args:
             context(Context): the context for which do add topic rows
         """
-        total_steps = 0
-        for topic_name, topic in context.topics.items():
-            total_steps += len(self.displayTargets()) - 1
-            total_steps += len(topic.properties)
-        self.resetProgress("preparing", total=total_steps)
-        for topic_name, topic in context.topics.items():
-            self.checkboxes[topic_name] = {}
-            checkbox_row = self.checkboxes[topic_name]
-            with self.grid:
-                self.add_topic_cell(topic)
-                checkbox = self.create_simple_checkbox(
-                    parent=self.grid,
-                    label_text="→",
-                    title=f"select all {topic_name}",
-                    on_change=self.on_select_row,
-                )
-            for target in self.displayTargets():
-                ypCell = YpCell.createYpCell(target=target, topic=topic)
-                checkbox = self.add_yp_cell(parent=self.grid, ypCell=ypCell)
-                if checkbox:
-                    checkbox_row[target.name] = (checkbox, ypCell)
-            pass
+        with tracer.span("grid build", topics=len(context.topics)):
+            total_steps = 0
+            ypcells_by_topic = {}
+            for topic_name, topic in context.topics.items():
+                total_steps += len(self.displayTargets()) - 1
+                total_steps += len(topic.properties)
+                ypcells_by_topic[topic_name] = [
+                    YpCell.createYpCell(target=target, topic=topic)
+                    for target in self.displayTargets()
+                ]
+            self.resetProgress("preparing", total=total_steps)
+            self.ypcells_by_topic = ypcells_by_topic
+            for topic_name, topic in context.topics.items():
+                self.checkboxes[topic_name] = {}
+                checkbox_row = self.checkboxes[topic_name]
+                with self.grid:
+                    self.add_topic_cell(topic)
+                    checkbox = self.create_simple_checkbox(
+                        parent=self.grid,
+                        label_text="→",
+                        title=f"select all {topic_name}",
+                        on_change=self.on_select_row,
+                    )
+                for target, ypCell in zip(
+                    self.displayTargets(), ypcells_by_topic[topic_name]
+                ):
+                    checkbox = self.add_yp_cell(parent=self.grid, ypCell=ypCell)
+                    if checkbox:
+                        checkbox_row[target.name] = (checkbox, ypCell)
+            self.flushUpdates()
 
     def set_hide_show_status_of_cell_debug_msg(self, hidden: bool = False):
         """
@@ -0,0 +1,174 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+from meta.metamodel import Context, Property
+
+from yprinciple.ypcell import YpCell
+
+
+@dataclass
+class Impact:
+    """
+    the cells affected by a change of a context
+    """
+
+    # the target keys of the topic cells to regenerate by topic name
+    topic_targets: Dict[str, Set[str]] = field(default_factory=dict)
+    # the (topic name, property name) of the property cells to regenerate
+    properties: Set[Tuple[str, str]] = field(default_factory=set)
+
+    def addTopic(self, topic_name: str, target_keys: Iterable[str]):
+        """
+        add the given target keys for the given topic
+        """
+        self.topic_targets.setdefault(topic_name, set()).update(target_keys)
+
+    def getTopicNames(self) -> List[str]:
+        """
+        get the names of all topics with affected cells
+        """
+        topic_names = set(self.topic_targets.keys())
+        topic_names.update(topic_name for topic_name, _prop in self.properties)
+        return sorted(topic_names)
+
+    def contains(self, ypCell: YpCell, target_key: str) -> bool:
+        """
+        check whether the given cell is affected
+
+        Args:
+            ypCell(YpCell): the cell to check
+            target_key(str): the key of the target of the cell
+
+        Returns:
+            bool: True if the cell needs to be regenerated
+        """
+        element = ypCell.modelElement
+        if isinstance(element, Property):
+            return (element.topic, element.name) in self.properties
+        return target_key in self.topic_targets.get(element.name, set())
+
+    def __len__(self) -> int:
+        cells = sum(len(target_keys) for target_keys in self.topic_targets.values())
+        return cells + len(self.properties)
+
+
+class DependencyGraph:
+    """
+    change impact dependency graph of a context
+
+    the markup of a cell depends on its own model element and on
+
+    * the topics of the extends chain (template calls, uml classes, see also,
+      inherited properties of ask queries and python classes)
+    * the topics connected via topic links (uml relations, see also,
+      masterdetail section, values from of link properties)
+
+    the property cells only depend on their own property and the
+    source topic of their topic link
+    """
+
+    # the keys of all targets generating a page per topic
+    topic_target_keys = frozenset(
+        ["category", "concept", "form", "help", "listOf", "template", "python"]
+    )
+    # all topic pages include the inherited properties of the extends chain
+    extends_target_keys = topic_target_keys
+    # the list of pages and python classes only show the names of the link
+    # properties of their own topic but nothing of the linked topics
+    link_target_keys = topic_target_keys - {"listOf", "python"}
+
+    def __init__(self, context: Context):
+        """
+        constructor
+
+        Args:
+            context(Context): the context to build the graph for
+        """
+        self.context = context
+        # topic name -> names of the topics extending it directly or indirectly
+        self.extended_by: Dict[str, Set[str]] = {}
+        # topic name -> names of the topics whose links refer to it
+        self.linked_by: Dict[str, Set[str]] = {}
+        # topic name -> link properties of other topics referring to it
+        self.link_properties: Dict[str, List[Property]] = {}
+        self.build()
+
+    def build(self):
+        """
+        build the graph from my context
+        """
+        for topic_name, topic in self.context.topics.items():
+            for extends_topic in topic.get_extends_topics():
+                self.extended_by.setdefault(extends_topic.name, set()).add(topic_name)
+            for topicLinks in [topic.sourceTopicLinks, topic.targetTopicLinks]:
+                for topicLink in topicLinks.values():
+                    for linked_name in [topicLink.source, topicLink.target]:
+                        self.linked_by.setdefault(linked_name, set()).add(topic_name)
+            for prop in topic.properties.values():
+                topicLink = getattr(prop, "topicLink", None)
+                if topicLink is not None:
+                    for linked_name in [topicLink.source, topicLink.target]:
+                        self.linked_by.setdefault(linked_name, set()).add(topic_name)
+                        self.link_properties.setdefault(linked_name, []).append(prop)
+
+    def getImpact(
+        self, topic_names: Iterable[str] = None, property_keys: Iterable[str] = None
+    ) -> Impact:
+        """
+        get the cells affected by a change of the given topics and properties
+
+        Args:
+            topic_names(Iterable[str]): the names of the changed topics
+            property_keys(Iterable[str]): the changed properties as "Topic.property"
+
+        Returns:
+            Impact: the cells to regenerate
+        """
+        impact = Impact()
+        changed_topics = set(topic_names or [])
+        changed_properties = set()
+        for property_key in property_keys or []:
+            topic_name, prop_name = property_key.split(".", 1)
+            changed_properties.add((topic_name, prop_name))
+        for topic_name in changed_topics:
+            # the values from of link properties refer to the linked topics
+            for prop in self.link_properties.get(topic_name, []):
+                impact.properties.add((prop.topic, prop.name))
+        impact.properties.update(changed_properties)
+        # a changed property changes the topic pages of its topic
+        changed_topics.update(topic_name for topic_name, _prop in changed_properties)
+        for topic_name in changed_topics:
+            if topic_name in self.context.topics:
+                impact.addTopic(topic_name, self.topic_target_keys)
+            for dependent in self.extended_by.get(topic_name, set()):
+                impact.addTopic(dependent, self.extends_target_keys)
+            for dependent in self.linked_by.get(topic_name, set()) - {topic_name}:
+                impact.addTopic(dependent, self.link_target_keys)
+        return impact
+
+    @classmethod
+    def splitChanges(cls, changes: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        split the given change specifications into topic names
+        and "Topic.property" property keys
+
+        Args:
+            changes(Iterable[str]): e.g. ["Event", "City.name"]
+
+        Returns:
+            tuple: the topic names and the property keys
+        """
+        topic_names = []
+        property_keys = []
+        for change in changes:
+            if "." in change:
+                property_keys.append(change)
+            else:
+                topic_names.append(change)
+        return topic_names, property_keys
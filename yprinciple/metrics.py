@@ -0,0 +1,291 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+from yprinciple.tracing import Span, Tracer
+
+
+class Metric:
+    """
+    a metric with labels in the Prometheus text exposition format
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        """
+        constructor
+
+        Args:
+            name(str): the name of the metric e.g. ypgen_cells_generated_total
+            help_text(str): the description of the metric
+            label_names(tuple): the names of the labels
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.lock = threading.Lock()
+
+    def getLabelKey(self, labels: dict) -> Tuple[str, ...]:
+        """
+        get the tuple of the label values of the given labels
+        """
+        return tuple(str(labels.get(label_name, "")) for label_name in self.label_names)
+
+    def formatLabels(self, label_key: Tuple[str, ...], extra: dict = None) -> str:
+        """
+        format the given label values (and extra labels) e.g. as {target="Help"}
+        """
+        pairs = list(zip(self.label_names, label_key))
+        if extra:
+            pairs.extend(extra.items())
+        if not pairs:
+            return ""
+        escaped = [
+            (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+            for name, value in pairs
+        ]
+        labels = ",".join(f'{name}="{value}"' for name, value in escaped)
+        return f"{{{labels}}}"
+
+    def getSamples(self) -> List[str]:
+        """
+        get the sample lines of this metric
+        """
+        return []
+
+    def toPrometheus(self) -> str:
+        """
+        get this metric in the Prometheus text exposition format
+        """
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.getSamples())
+        text = "\n".join(lines)
+        return text
+
+
+class CounterMetric(Metric):
+    """
+    a monotonically increasing counter
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        increment the counter for the given labels
+        """
+        label_key = self.getLabelKey(labels)
+        with self.lock:
+            self.values[label_key] = self.values.get(label_key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """
+        get the value for the given labels
+        """
+        return self.values.get(self.getLabelKey(labels), 0)
+
+    def getSamples(self) -> List[str]:
+        with self.lock:
+            values = sorted(self.values.items())
+        samples = [
+            f"{self.name}{self.formatLabels(label_key)} {value}"
+            for label_key, value in values
+        ]
+        return samples
+
+
+class GaugeMetric(CounterMetric):
+    """
+    a value that can go up and down
+    """
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        """
+        decrement the gauge for the given labels
+        """
+        self.inc(-amount, **labels)
+
+
+class HistogramMetric(Metric):
+    """
+    a histogram of observed values with cumulative buckets
+    """
+
+    kind = "histogram"
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = default_buckets,
+    ):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., sum, count]
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """
+        observe the given value for the given labels
+        """
+        label_key = self.getLabelKey(labels)
+        with self.lock:
+            entry = self.values.get(label_key)
+            if entry is None:
+                entry = [0] * len(self.buckets) + [0.0, 0]
+                self.values[label_key] = entry
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def getCount(self, **labels) -> int:
+        """
+        get the number of observations for the given labels
+        """
+        entry = self.values.get(self.getLabelKey(labels))
+        return entry[-1] if entry else 0
+
+    def getSamples(self) -> List[str]:
+        with self.lock:
+            values = sorted((key, list(entry)) for key, entry in self.values.items())
+        samples = []
+        for label_key, entry in values:
+            for i, bound in enumerate(self.buckets):
+                labels = self.formatLabels(label_key, {"le": bound})
+                samples.append(f"{self.name}_bucket{labels} {entry[i]}")
+            labels = self.formatLabels(label_key, {"le": "+Inf"})
+            samples.append(f"{self.name}_bucket{labels} {entry[-1]}")
+            labels = self.formatLabels(label_key)
+            samples.append(f"{self.name}_sum{labels} {entry[-2]}")
+            samples.append(f"{self.name}_count{labels} {entry[-1]}")
+        return samples
+
+
+class GenerationMetrics:
+    """
+    Prometheus style metrics of the generation runs of a server
+
+    the metrics are derived from the spans of the tracer the
+    generator API, the cells and the generator grid are instrumented with
+    """
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.cells_generated = CounterMetric(
+            "ypgen_cells_generated_total",
+            "number of generated cells per target",
+            ("target",),
+        )
+        self.cell_failures = CounterMetric(
+            "ypgen_cell_failures_total",
+            "number of cells whose generation failed per target",
+            ("target",),
+        )
+        self.edits = CounterMetric(
+            "ypgen_edits_total",
+            "number of page edits performed, skipped or not needed in dry runs since the page was unchanged",
+            ("result",),
+        )
+        self.page_fetch = HistogramMetric(
+            "ypgen_page_fetch_seconds",
+            "latency of getting a page and its text",
+            ("cached",),
+        )
+        self.context_load = HistogramMetric(
+            "ypgen_context_load_seconds", "time to load a context"
+        )
+        self.grid_build = HistogramMetric(
+            "ypgen_grid_build_seconds", "time to build the generator grid"
+        )
+        self.active_jobs = GaugeMetric(
+            "ypgen_active_jobs", "number of generation jobs in progress", ("job",)
+        )
+        self.metrics: List[Metric] = [
+            self.cells_generated,
+            self.cell_failures,
+            self.edits,
+            self.page_fetch,
+            self.context_load,
+            self.grid_build,
+            self.active_jobs,
+        ]
+
+    def attach(self, tracer: Tracer):
+        """
+        listen to the spans of the given tracer - attaching again has no effect
+        """
+        if self.onSpanEnd not in tracer.listeners:
+            tracer.addListener(self.onSpanEnd, on_start=self.onSpanStart)
+
+    def detach(self, tracer: Tracer):
+        """
+        stop listening to the spans of the given tracer
+        """
+        tracer.removeListener(self.onSpanEnd, on_start=self.onSpanStart)
+
+    def onSpanStart(self, span: Span):
+        """
+        handle a started span
+        """
+        if span.category == "job":
+            self.active_jobs.inc(job=span.name)
+
+    def onSpanEnd(self, span: Span):
+        """
+        handle a finished span
+        """
+        if span.category == "job":
+            self.active_jobs.dec(job=span.name)
+        elif span.name == "cell":
+            target = span.attributes.get("target", "")
+            if "error" in span.attributes:
+                self.cell_failures.inc(target=target)
+            else:
+                self.cells_generated.inc(target=target)
+                # only cells generated via the MediaWiki API record the dry run flag
+                dry_run = span.attributes.get("dryRun")
+                if span.attributes.get("status") == "unchanged" and dry_run is not None:
+                    result = "dry_run_unchanged" if dry_run else "skipped"
+                    self.edits.inc(result=result)
+        elif span.name == "edit" and "error" not in span.attributes:
+            self.edits.inc(result="performed")
+        elif span.name == "fetch":
+            self.page_fetch.observe(
+                span.duration, cached=span.attributes.get("cached", False)
+            )
+        elif span.name == "context load":
+            self.context_load.observe(span.duration)
+        elif span.name == "grid build":
+            self.grid_build.observe(span.duration)
+
+    def toPrometheus(self) -> str:
+        """
+        get all metrics in the Prometheus text exposition format
+        """
+        text = "\n".join(metric.toPrometheus() for metric in self.metrics) + "\n"
+        return text
+
+
+# the metrics of the generator server
+metrics = GenerationMetrics()
@@ -0,0 +1,242 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from mwclient.page import Page
+from mwclient.util import parse_timestamp
+
+
+@dataclass
+class PageRecord:
+    """
+    the prefetched state of a wiki page
+    """
+
+    title: str
+    exists: bool
+    revision: int
+    # the markup of the latest revision - None if the page does not exist
+    text: Optional[str]
+    # the raw page info as returned by the query API
+    info: dict
+    timestamp: Optional[str] = None
+
+
+class PageCache:
+    """
+    prefetch existence, revision and text of many wiki pages
+    with multi-title query API calls instead of two round trips per page
+
+    see https://www.mediawiki.org/wiki/API:Revisions
+    """
+
+    def __init__(self, site, batch_size: int = None, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            site(mwclient.Site): the site to fetch the pages from
+            batch_size(int): the number of titles per query - if None 500 is used
+                for clients with the apihighlimits right and 50 otherwise
+            debug(bool): if True show debug messages
+        """
+        self.site = site
+        if batch_size is None:
+            rights = getattr(site, "rights", []) or []
+            batch_size = 500 if "apihighlimits" in rights else 50
+        self.batch_size = batch_size
+        self.debug = debug
+        self.records: Dict[str, PageRecord] = {}
+        self.query_count = 0
+
+    @classmethod
+    def ofWikiClient(cls, wikiClient, batch_size: int = None, debug: bool = False):
+        """
+        create a page cache for the given wikiClient
+
+        Args:
+            wikiClient(WikiClient): the wiki client to use
+            batch_size(int): the number of titles per query
+            debug(bool): if True show debug messages
+
+        Returns:
+            PageCache: the page cache
+        """
+        page_cache = cls(wikiClient.getSite(), batch_size=batch_size, debug=debug)
+        return page_cache
+
+    def __contains__(self, page_title: str) -> bool:
+        return page_title in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def prefetch(self, page_titles: Iterable[str]) -> int:
+        """
+        prefetch the given page titles in batches
+
+        Args:
+            page_titles(Iterable[str]): the titles of the pages to fetch
+
+        Returns:
+            int: the number of query API calls needed
+        """
+        titles = list(dict.fromkeys(page_titles))
+        queries = 0
+        for i in range(0, len(titles), self.batch_size):
+            batch = titles[i : i + self.batch_size]
+            queries += self.fetchBatch(batch)
+        return queries
+
+    def fetchBatch(self, page_titles: List[str]) -> int:
+        """
+        fetch a single batch of page titles following continuations
+
+        Args:
+            page_titles(List[str]): the titles to fetch
+
+        Returns:
+            int: the number of query API calls needed
+        """
+        queries = 0
+        # map normalized titles back to the requested ones
+        requested = {page_title: page_title for page_title in page_titles}
+        params = self.getBatchParams(page_titles)
+        continue_params = {}
+        while True:
+            result = self.site.get("query", **params, **continue_params)
+            queries += 1
+            continue_params = self.addQueryResult(result, requested)
+            if continue_params is None:
+                break
+        self.query_count += queries
+        if self.debug:
+            print(f"fetched {len(page_titles)} pages with {queries} queries")
+        return queries
+
+    def getBatchParams(self, page_titles: List[str]) -> dict:
+        """
+        get the query API parameters to fetch the given page titles
+
+        Args:
+            page_titles(List[str]): the titles to fetch
+
+        Returns:
+            dict: the query parameters
+        """
+        params = {
+            "prop": "info|revisions",
+            "inprop": "protection",
+            "rvprop": "ids|timestamp|content",
+            "rvslots": "main",
+            "titles": "|".join(page_titles),
+        }
+        return params
+
+    def addQueryResult(self, result: dict, requested: Dict[str, str]) -> Optional[dict]:
+        """
+        add the records of the given query API result
+
+        Args:
+            result(dict): the query API result
+            requested(dict): map of normalized titles to the requested ones -
+                updated with the normalizations of the result
+
+        Returns:
+            dict: the continue parameters or None if the query is complete
+        """
+        query = result.get("query", {})
+        for normalized in query.get("normalized", []):
+            requested[normalized["to"]] = normalized["from"]
+        for info in query.get("pages", {}).values():
+            self.addRecord(requested.get(info.get("title"), info.get("title")), info)
+        continue_params = result.get("continue", None)
+        return continue_params
+
+    def addRecord(self, page_title: str, info: dict):
+        """
+        add a record for the given page info
+
+        a continued query may deliver the revisions of a page in a later
+        response - an already known text is kept in that case
+
+        Args:
+            page_title(str): the title as requested
+            info(dict): the page info from the query API
+        """
+        text = None
+        timestamp = None
+        revisions = info.get("revisions")
+        if revisions:
+            rev = revisions[0]
+            if "slots" in rev:
+                text = rev["slots"]["main"].get(
+                    "*", rev["slots"]["main"].get("content")
+                )
+            else:
+                text = rev.get("*")
+            timestamp = rev.get("timestamp")
+        old_record = self.records.get(page_title)
+        if text is None and old_record is not None:
+            text = old_record.text
+            timestamp = old_record.timestamp
+        exists = "missing" not in info and "invalid" not in info
+        record = PageRecord(
+            title=page_title,
+            exists=exists,
+            revision=info.get("lastrevid", 0),
+            text=text if exists else None,
+            info=info,
+            timestamp=timestamp,
+        )
+        self.records[page_title] = record
+
+    def get(self, page_title: str) -> Optional[PageRecord]:
+        """
+        get the prefetched record for the given page title
+
+        Args:
+            page_title(str): the title of the page
+
+        Returns:
+            PageRecord: the record or None if the page has not been prefetched
+        """
+        record = self.records.get(page_title, None)
+        return record
+
+    def getPage(self, page_title: str) -> Optional[Page]:
+        """
+        get an mwclient Page for the given page title without an API call
+
+        the page is prepared as if text() had been called so that an edit
+        uses the prefetched revision for edit conflict detection
+
+        Args:
+            page_title(str): the title of the page
+
+        Returns:
+            Page: the page or None if the page has not been prefetched
+        """
+        record = self.get(page_title)
+        if record is None:
+            return None
+        page = Page(self.site, page_title, info=record.info)
+        if record.exists and record.timestamp:
+            page.last_rev_time = parse_timestamp(record.timestamp)
+            page.edit_time = time.gmtime()
+        return page
+
+    def invalidate(self, page_title: str):
+        """
+        forget the prefetched state of the given page e.g. after an edit
+
+        Args:
+            page_title(str): the title of the page
+        """
+        self.records.pop(page_title, None)
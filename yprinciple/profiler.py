@@ -4,7 +4,16 @@ Created on 2022-11-18
 @author: wf
 """
 
+import cProfile
+import io
+import pstats
+import threading
 import time
+from typing import Dict, List, Tuple
+
+from yprinciple.smw_targets import SMWTarget
+from yprinciple.tracing import Span, Tracer
+from yprinciple.tracing import tracer as default_tracer
 
 
 class Profiler:
@@ -34,3 +43,217 @@ class Profiler:
         if self.profile:
             print(f"{self.msg}{extraMsg} took {elapsed:5.1f} s")
         return elapsed
+
+
+class HotPathProfiler:
+    """
+    deterministic profiler for generation runs with the profiled time
+    aggregated per SMWTarget subclass and phase
+
+    a separate cProfile.Profile is switched on whenever a phase span
+    starts in the profiled thread so that the hot functions of e.g.
+    TemplateTarget.generate, the mwclient fetches and the diffs can be
+    told apart - cells worked on in other threads only contribute the
+    wall clock time of their spans
+
+    the phase spans of the profiled thread have to be strictly nested as
+    on the sequential generation path - cProfile can not tell the tasks of
+    an event loop apart so their interleaved spans would charge the time
+    to the wrong target and phase - out of order spans are dropped from
+    the profile stack and only contribute their wall clock time
+    """
+
+    phases = ("generate", "fetch", "diff", "edit", "write")
+
+    def __init__(self, top_n: int = 20, tracer: Tracer = None):
+        """
+        constructor
+
+        Args:
+            top_n(int): the number of hot functions to report
+            tracer(Tracer): the tracer whose spans mark the phases -
+                default: the tracer of the generator
+        """
+        self.top_n = top_n
+        self.tracer = default_tracer if tracer is None else tracer
+        self.target_classes = {
+            target.name: type(target).__name__
+            for target in SMWTarget.getSMWTargets().values()
+        }
+        self.base_profile = None
+        self.profiles: Dict[Tuple[str, str], cProfile.Profile] = {}
+        # (target class, phase) -> [calls, wall clock seconds]
+        self.wall_times: Dict[Tuple[str, str], list] = {}
+        self.stack: List[Tuple[Span, cProfile.Profile]] = []
+        self.thread_id = None
+        self.lock = threading.Lock()
+
+    def getKey(self, span: Span) -> Tuple[str, str]:
+        """
+        get the (target class, phase) key for the given phase span
+        from the span itself or the enclosing cell span
+        """
+        target_name = None
+        current = span
+        while current is not None and target_name is None:
+            target_name = current.attributes.get("target")
+            current = current.parent
+        target_class = self.target_classes.get(target_name, target_name or "-")
+        return target_class, span.name
+
+    def activeProfile(self) -> cProfile.Profile:
+        """
+        get the currently active profile of the profiled thread
+        """
+        return self.stack[-1][1] if self.stack else self.base_profile
+
+    def start(self):
+        """
+        start profiling the current thread
+        """
+        self.thread_id = threading.get_ident()
+        self.tracer.addListener(self.onSpanEnd, on_start=self.onSpanStart)
+        self.base_profile = cProfile.Profile()
+        self.base_profile.enable()
+
+    def stop(self):
+        """
+        stop profiling
+        """
+        self.activeProfile().disable()
+        self.stack = []
+        self.tracer.removeListener(self.onSpanEnd, on_start=self.onSpanStart)
+
+    def onSpanStart(self, span: Span):
+        """
+        switch to the profile of the phase of the given span
+        """
+        if span.name not in self.phases or threading.get_ident() != self.thread_id:
+            return
+        key = self.getKey(span)
+        self.activeProfile().disable()
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = cProfile.Profile()
+            self.profiles[key] = profile
+        self.stack.append((span, profile))
+        profile.enable()
+
+    def onSpanEnd(self, span: Span):
+        """
+        record the wall clock time of the given span and switch back
+        to the profile of the enclosing phase
+        """
+        if span.name not in self.phases:
+            return
+        key = self.getKey(span)
+        with self.lock:
+            wall_time = self.wall_times.setdefault(key, [0, 0.0])
+            wall_time[0] += 1
+            wall_time[1] += span.duration
+        if threading.get_ident() != self.thread_id:
+            return
+        if self.stack and self.stack[-1][0] is span:
+            profile = self.stack.pop()[1]
+            profile.disable()
+            self.activeProfile().enable()
+        elif any(stacked_span is span for stacked_span, _profile in self.stack):
+            # interleaved spans e.g. of concurrent tasks
+            self.activeProfile().disable()
+            self.stack = [
+                (stacked_span, profile)
+                for stacked_span, profile in self.stack
+                if stacked_span is not span
+            ]
+            self.activeProfile().enable()
+
+    def getStats(self, key: Tuple[str, str] = None) -> pstats.Stats:
+        """
+        get the statistics of the given (target class, phase)
+        or of the whole run
+
+        Args:
+            key(tuple): the target class and phase - None for all
+        """
+        if key is not None:
+            profiles = [self.profiles[key]]
+        else:
+            profiles = [self.base_profile, *self.profiles.values()]
+        stats = None
+        for profile in profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile, stream=io.StringIO())
+            else:
+                stats.add(profile)
+        return stats
+
+    def getPhaseReport(self) -> str:
+        """
+        get the calls, wall clock and profiled time per target class and phase
+        """
+        lines = [
+            f"{'target':<20} {'phase':<10} {'calls':>7} {'wall s':>9} {'profiled s':>11}"
+        ]
+        for key, (calls, wall_seconds) in sorted(
+            self.wall_times.items(), key=lambda item: -item[1][1]
+        ):
+            profiled = ""
+            if key in self.profiles:
+                stats = self.getStats(key)
+                if stats is not None:
+                    profiled = f"{stats.total_tt:.3f}"
+            target_class, phase = key
+            lines.append(
+                f"{target_class:<20} {phase:<10} {calls:>7} {wall_seconds:>9.3f} {profiled:>11}"
+            )
+        report = "\n".join(lines)
+        return report
+
+    def getTopReport(
+        self, key: Tuple[str, str] = None, top_n: int = None, sort_key="tottime"
+    ) -> str:
+        """
+        get the top N hot functions of the given (target class, phase) or of the whole run
+        """
+        if top_n is None:
+            top_n = self.top_n
+        stats = self.getStats(key)
+        if stats is None:
+            return ""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(sort_key).print_stats(top_n)
+        return stream.getvalue()
+
+    def getReport(self) -> str:
+        """
+        get the phase report and the hot functions of the whole run
+        """
+        report = f"""time per target and phase:
+{self.getPhaseReport()}
+
+top {self.top_n} hot functions:
+{self.getTopReport()}"""
+        return report
+
+    def save(self, path: str) -> str:
+        """
+        save the statistics of the whole run as pstats file to the given path
+        and the report as text file next to it
+
+        Args:
+            path(str): the path of the pstats file
+
+        Returns:
+            str: the report
+        """
+        stats = self.getStats()
+        if stats is not None:
+            stats.dump_stats(path)
+        report = self.getReport()
+        with open(f"{path}.txt", "w", encoding="utf-8") as report_file:
+            report_file.write(report)
+        return report
@@ -0,0 +1,122 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Iterable, TextIO, Tuple
+
+from yprinciple.ypcell import FileGenResult, GenResult, MwGenResult, YpCell
+
+
+class ResultSink:
+    """
+    stream generation results as newline delimited JSON (NDJSON)
+    with one record per cell e.g. for monitoring and review tooling
+    """
+
+    def __init__(self, stream: TextIO, with_markup: bool = False, close: bool = False):
+        """
+        constructor
+
+        Args:
+            stream(TextIO): the stream to write the records to
+            with_markup(bool): if True include the markup in the records
+            close(bool): if True close the stream when I am closed
+        """
+        self.stream = stream
+        self.with_markup = with_markup
+        self.close_stream = close
+        self.count = 0
+
+    @classmethod
+    def ofPath(cls, path: str, with_markup: bool = False) -> "ResultSink":
+        """
+        create a result sink for the given path
+
+        Args:
+            path(str): the path of the file to write to - "-" for stdout
+            with_markup(bool): if True include the markup in the records
+
+        Returns:
+            ResultSink: the sink
+        """
+        if path == "-":
+            sink = cls(sys.stdout, with_markup=with_markup)
+        else:
+            stream = open(path, "w", encoding="utf-8")
+            sink = cls(stream, with_markup=with_markup, close=True)
+        return sink
+
+    def getRecord(self, ypCell: YpCell, genResult: GenResult) -> dict:
+        """
+        get the record for the given cell and result
+
+        Args:
+            ypCell(YpCell): the generated cell
+            genResult(GenResult): the result of the generation
+
+        Returns:
+            dict: the JSON serializable record
+        """
+        record = ypCell.getTraceAttributes()
+        if ypCell.hasPage():
+            record["page"] = ypCell.getPageTitle()
+        record["status"] = genResult.getStatus()
+        record["markup_size"] = genResult.getMarkupSize()
+        record["markup_hash"] = genResult.getMarkupHash()
+        if isinstance(genResult, MwGenResult):
+            record["old_revision"] = getattr(genResult.old_page, "revision", None)
+            record["new_revision"] = getattr(genResult.new_page, "revision", None)
+            record["diff_url"] = genResult.getDiffUrl()
+            diff = genResult.diff
+            if diff is not None and diff.old_text is not None:
+                record["diff"] = diff.getStats()
+        elif isinstance(genResult, FileGenResult):
+            record["path"] = genResult.path
+        if self.with_markup:
+            record["markup"] = genResult.markup
+        record["timestamp"] = datetime.now().isoformat()
+        return record
+
+    def write(self, ypCell: YpCell, genResult: GenResult):
+        """
+        write the record of the given cell and result as a single line -
+        can be used as a callback for every finished cell
+
+        Args:
+            ypCell(YpCell): the generated cell
+            genResult(GenResult): the result of the generation
+        """
+        record = self.getRecord(ypCell, genResult)
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # make the line available to a reading process right away
+        self.stream.flush()
+        self.count += 1
+
+    def writeAll(self, results: Iterable[Tuple[YpCell, GenResult]]) -> int:
+        """
+        write the given results as they are yielded
+
+        Args:
+            results(Iterable): the cells and their results e.g.
+                from GeneratorAPI.yieldViaMwApi or GeneratorAPI.yieldToFile
+
+        Returns:
+            int: the number of records written
+        """
+        count = 0
+        for ypCell, genResult in results:
+            self.write(ypCell, genResult)
+            count += 1
+        return count
+
+    def close(self):
+        """
+        close my stream if I opened it
+        """
+        if self.close_stream:
+            self.stream.close()
@@ -5,11 +5,13 @@ Created on 2022-11-26
 """
 
 from datetime import datetime
+from typing import TextIO
 
 from meta.metamodel import Property, Topic, TopicLink
 
 import yprinciple.ypcell as ypcell
-from yprinciple.target import Target
+from yprinciple.context_index import TopicIndex
+from yprinciple.target import FragmentCache, FragmentWriter, Target
 from yprinciple.version import Version
 
 
@@ -36,11 +38,49 @@ class SMWTarget(Target):
             "property": PropertyTarget("Property", showInGrid=False),
             "python": PythonTarget("Python", "code"),
         }
+        fragment_cache = FragmentCache()
         for target_key, target in targets.items():
             target.target_key = target_key
+            target.fragment_cache = fragment_cache
         targets["properties"].subTarget = targets["property"]
         return targets
 
+    def memo(self, key, compute, context=None) -> str:
+        """
+        get the fragment for the given key from my fragment cache
+        or compute it if there is no fragment cache
+
+        Args:
+            key: the key of the fragment
+            compute (Callable): the function to create the fragment
+            context: the context the fragment depends on
+
+        Returns:
+            str: the fragment
+        """
+        if self.fragment_cache is None:
+            return compute()
+        fragment = self.fragment_cache.get(key, compute, context=context)
+        return fragment
+
+    def getTopicIndex(self, topic: Topic) -> TopicIndex:
+        """
+        get the index of the given topic from the context index
+        shared via my fragment cache
+
+        Args:
+            topic (Topic): the topic to get the index for
+
+        Returns:
+            TopicIndex: the extends chain, properties and links of the topic
+        """
+        context = getattr(topic, "context_obj", None)
+        if context is None or self.fragment_cache is None:
+            return TopicIndex.ofTopic(topic)
+        context_index = self.fragment_cache.getContextIndex(context)
+        topic_index = context_index.getTopicIndex(topic)
+        return topic_index
+
     def i18n(self, text: str) -> str:
         """
         return the internationalized version of the given text
@@ -87,8 +127,9 @@ class SMWTarget(Target):
 * [[:Template:{topic.name}]]
 * [[:Form:{topic.name}]]
 """
-        topicLinks = topic.targetTopicLinks.values()
-        extends_topics = topic.get_extends_topics()
+        topic_index = self.getTopicIndex(topic)
+        topicLinks = topic_index.target_topic_links
+        extends_topics = topic_index.extends_topics
         if len(topicLinks) + len(extends_topics) > 0:
             markup += "related topics:\n" ""
             for extends_topic in extends_topics:
@@ -136,6 +177,21 @@ class SMWTarget(Target):
         Returns:
             str: the wiki markup to be generated
         """
+        markup = self.memo(
+            ("bitplanumlci", fontSize), lambda: self.createBitplanumlci(fontSize)
+        )
+        return markup
+
+    def createBitplanumlci(self, fontSize: int) -> str:
+        """
+        create the plantuml skin params block for the given font size
+
+        Args:
+            fontSize (int): the font size to use
+
+        Returns:
+            str: the skin params markup
+        """
         currentYear = datetime.now().year
         markup = f"""' BITPlan Corporate identity skin params
 ' Copyright (c) 2015-{currentYear} BITPlan GmbH
@@ -177,6 +233,29 @@ class SMWTarget(Target):
         Returns:
             str: the wiki markup to generate
         """
+        source_topic = getattr(topicLink, "sourceTopic", None)
+        context = getattr(source_topic, "context_obj", None)
+        # links might share a name so key the relation by all of its parts
+        relation_key = (
+            "relation",
+            topicLink.source,
+            topicLink.sourceRole,
+            topicLink.sourceMultiple,
+            topicLink.target,
+            topicLink.targetRole,
+            topicLink.targetMultiple,
+        )
+        markup = self.memo(
+            relation_key,
+            lambda: self.createPlantUmlRelation(topicLink),
+            context=context,
+        )
+        return markup
+
+    def createPlantUmlRelation(self, topicLink: TopicLink) -> str:
+        """
+        create the plantuml relation line for the given topicLink
+        """
         sourceMany = "*" if topicLink.sourceMultiple else "1"
         targetMany = "*" if topicLink.targetMultiple else "1"
         markup = f"""{topicLink.source} "{topicLink.sourceRole} ({sourceMany})" -- "{topicLink.targetRole}({targetMany})" {topicLink.target}\n"""
@@ -193,33 +272,62 @@ class SMWTarget(Target):
           str: the plantuml markup to be generated
 
         """
-        markup = ""
+        markup = self.memo(
+            ("plantUmlClass", topic.name),
+            lambda: self.createPlantUmlClass(topic),
+            context=getattr(topic, "context_obj", None),
+        )
+        return markup
+
+    def plantUmlClass_to(self, topic: "Topic", sink: TextIO):
+        """
+        write the plantuml markup for the given topic to the given sink
+
+        Args:
+          topic (Topic): the topic to generate uml for
+          sink (TextIO): the writer for the markup fragments
+        """
+        sink.write(self.plantUmlClass(topic))
+
+    def createPlantUmlClass(self, topic: "Topic") -> str:
+        """
+        create the plantuml markup for the given topic
+
+        the markup of the extends chain is taken from the fragment cache
+        so that each topic of a deep inheritance hierarchy is only
+        rendered once per context
+
+        Args:
+          topic (Topic): the topic to generate uml for
+
+        Returns:
+          str: the plantuml markup
+        """
+        sink = FragmentWriter()
+        topic_index = self.getTopicIndex(topic)
         extends = getattr(topic, "extends", None)
         extends_markup = f" extends {extends} " if extends else ""
         # recursive inheritance
-        if extends:
-            extends_topic = topic.context_obj.lookupTopic(
-                extends, purpose=extends_markup
-            )
-            if extends_topic:
-                markup += self.plantUmlClass(extends_topic)
+        if topic_index.extends_topic:
+            self.plantUmlClass_to(topic_index.extends_topic, sink)
 
-        markup += f"""note as {topic.name}Note
+        sink.write(f"""note as {topic.name}Note
 {topic.documentation}
 end note
 class {topic.name}{extends_markup} {{
-"""
+""")
         for prop in topic.properties.values():
             prop_type = getattr(prop, "type", "Text")
-            markup += f"  {prop_type} {prop.name}\n"
-        markup += f"""}}
+            sink.write(f"  {prop_type} {prop.name}\n")
+        sink.write(f"""}}
 {topic.name}Note .. {topic.name}
-"""
+""")
         # Relations/Topic Links
-        for topicLink in topic.sourceTopicLinks.values():
-            markup += f"{self.plantUmlRelation(topicLink)}"
-        for topicLink in topic.targetTopicLinks.values():
-            markup += f"{self.plantUmlRelation(topicLink)}"
+        for topicLink in topic_index.source_topic_links:
+            sink.write(self.plantUmlRelation(topicLink))
+        for topicLink in topic_index.target_topic_links:
+            sink.write(self.plantUmlRelation(topicLink))
+        markup = sink.getvalue()
         return markup
 
     def uml(self, title: str, topic: "Topic", output_format: str = "svg") -> str:
@@ -234,20 +342,36 @@ class {topic.name}{extends_markup} {{
             str: the plantuml markup to be generated
 
         """
-        currentYear = datetime.now().year
+        sink = FragmentWriter()
+        self.uml_to(title, topic, sink, output_format=output_format)
+        markup = sink.getvalue()
+        return markup
+
+    def uml_to(
+        self, title: str, topic: "Topic", sink: TextIO, output_format: str = "svg"
+    ):
+        """
+        write the full uml (plantuml) markup for the given topic to the given sink
 
-        markup = f"""=== {title} ===
+        Args:
+            title (str): the title of the uml section
+            topic (Topic): the topic to generate uml for
+            sink (TextIO): the writer for the markup fragments
+            output_format (str): the output format to use - default: svg
+        """
+        currentYear = datetime.now().year
+        sink.write(f"""=== {title} ===
 <uml format='{output_format}'>
 title {topic.name}
 note as {topic.name}DiagramNote
 Copyright (c) 2015-{currentYear} BITPlan GmbH
 [[http://www.bitplan.com]]
 end note
-"""
-        markup += self.plantUmlClass(topic)
-        markup += f"""{self.bitplanumlci(12)}
-</uml>"""
-        return markup
+""")
+        self.plantUmlClass_to(topic, sink)
+        sink.write(self.bitplanumlci(12))
+        sink.write("""
+</uml>""")
 
 
 class CategoryTarget(SMWTarget):
@@ -257,7 +381,7 @@ class CategoryTarget(SMWTarget):
     see https://wiki.bitplan.com/index.php/SiDIFTemplates#category
     """
 
-    def generate(self, topic: Topic) -> str:
+    def generate_to(self, topic: Topic, sink: TextIO):
         """
         generate a category page for the given topic
 
@@ -267,32 +391,31 @@ class CategoryTarget(SMWTarget):
 
         Args:
             topic (Topic): the topic to generate wiki markup for
-
-        Returns:
-            str: the generated wiki markup
+            sink (TextIO): the writer for the generated wiki markup
         """
-        markup = f"""__NOTOC__
+        sink.write(f"""__NOTOC__
 {{{{#ask: [[Topic name::{topic.name}]] | ?Topic wikiDocumentation= | mainlabel=-}}}}
 {topic.getPluralName()} may be added and edited with the form [[Form:{topic.name}]]
 * [[List of {topic.getPluralName()}]]
 <div class="toccolours mw-collapsible mw-collapsed" style="width:1024px">
 {topic.name} {self.i18n("description")}
 <div class="mw-collapsible-content">
-{self.uml("uml",topic)}
+""")
+        self.uml_to("uml", topic, sink)
+        sink.write(f"""
 * [[Help:{topic.name}]]
 * [[Concept:{topic.name}]]
 * [[:Template:{topic.name}]]
 * [[:Form:{topic.name}]]
 === Properties ===
-"""
+""")
         for prop in topic.properties.values():
-            markup += f"* [[Property:{topic.name} {prop.name}]]\n"
-        markup += """</div>
+            sink.write(f"* [[Property:{topic.name} {prop.name}]]\n")
+        sink.write("""</div>
 </div>
-"""
+""")
         if hasattr(topic, "extends") and topic.extends:
-            markup += f"""[[Category:{topic.extends}]]\n"""
-        return markup
+            sink.write(f"""[[Category:{topic.extends}]]\n""")
 
 
 class ConceptTarget(SMWTarget):
@@ -302,7 +425,7 @@ class ConceptTarget(SMWTarget):
     see https://wiki.bitplan.com/index.php/SiDIFTemplates#concept
     """
 
-    def generate(self, topic: "Topic") -> str:
+    def generate_to(self, topic: "Topic", sink: TextIO):
         """
         generate a result for the given topic
 
@@ -310,12 +433,10 @@ class ConceptTarget(SMWTarget):
 
         Args:
             topic(Topic): the topic to generate wiki markup for
-
-        Returns:
-            str: the generated wiki markup
+            sink (TextIO): the writer for the generated wiki markup
         """
         extends_value = getattr(topic, "extends", "") or ""
-        markup = f"""{{{{Topic
+        sink.write(f"""{{{{Topic
 |name={topic.name}
 |pluralName={topic.getPluralName()}
 |extends={extends_value}
@@ -336,15 +457,16 @@ class ConceptTarget(SMWTarget):
 {{{{#forminput:form=Property|button text=add Property}}}}
 === Documentation ===
 {topic.wikiDocumentation}
-{self.uml("uml",topic)}
+""")
+        self.uml_to("uml", topic, sink)
+        sink.write(f"""
 
 {{{{#concept:[[isA::{topic.name}]]
 |{topic.wikiDocumentation}
 {self.seealso(topic)}
 }}}}
 [[Category:{topic.name}]]
-"""
-        return markup
+""")
 
 
 class HelpTarget(SMWTarget):
@@ -352,7 +474,7 @@ class HelpTarget(SMWTarget):
     the help Target
     """
 
-    def generate(self, topic: "Topic") -> str:
+    def generate_to(self, topic: "Topic", sink: TextIO):
         """
         generate a result for the given topic
 
@@ -360,11 +482,9 @@ class HelpTarget(SMWTarget):
 
         Args:
             topic (Topic): the topic to generate wiki markup for
-
-        Returns:
-            str: the generated wiki markup
+            sink (TextIO): the writer for the generated wiki markup
         """
-        markup = f"""[[File:Help_Icon.png|right]]
+        sink.write(f"""[[File:Help_Icon.png|right]]
 == Help for {topic.name} ==
 {self.topicHeader(topic)}
 === Documentation ===
@@ -383,11 +503,12 @@ class HelpTarget(SMWTarget):
 | ?Property uploadable = uploadable
 |format=table
 }}}}
-{self.uml("uml",topic)}
+""")
+        self.uml_to("uml", topic, sink)
+        sink.write(f"""
 {self.seealso(topic)}
 [[Category:{topic.name}]]
-"""
-        return markup
+""")
 
 
 class FormTarget(SMWTarget):
@@ -399,16 +520,34 @@ class FormTarget(SMWTarget):
 
     """
 
-    def formTemplate(self, topic: Topic, isMultiple: bool):
+    def formTemplate(self, topic: Topic, isMultiple: bool) -> str:
         """
         create the SMW page Form markups for the given topic
 
         Args:
             topic (Topic): the topic to create the markup for
             isMultiple (bool): True if there are multiple values allowed
+
+        Returns:
+            str: the form markup
+        """
+        sink = FragmentWriter()
+        self.formTemplate_to(topic, isMultiple, sink)
+        markup = sink.getvalue()
+        return markup
+
+    def formTemplate_to(self, topic: Topic, isMultiple: bool, sink: TextIO):
+        """
+        write the SMW page Form markups for the given topic to the given sink
+
+        Args:
+            topic (Topic): the topic to create the markup for
+            isMultiple (bool): True if there are multiple values allowed
+            sink (TextIO): the writer for the form markup
         """
         multiple = "|multiple" if isMultiple else ""
-        markup = f"""<div id="wikiPreview" style="display: none; padding-bottom: 25px; margin-bottom: 25px; border-bottom: 1px solid #AAAAAA;"></div>
+        sink.write(
+            f"""<div id="wikiPreview" style="display: none; padding-bottom: 25px; margin-bottom: 25px; border-bottom: 1px solid #AAAAAA;"></div>
 {{{{{{section|{topic.name}|level=1|hidden}}}}}}
 ={topic.name}=
 {{{{{{for template|{topic.name}{multiple}}}}}}}
@@ -416,7 +555,8 @@ class FormTarget(SMWTarget):
 ! colspan='2' | {topic.name}
 |-
 """
-        for prop in topic.propertiesByIndex():
+        )
+        for prop in self.getTopicIndex(topic).properties_by_index:
             values_from_key = "values from="
             if prop.isLink:
                 prop.values_from = f"{prop.topicLink.source}"
@@ -424,8 +564,8 @@ class FormTarget(SMWTarget):
                 values_from_key = "values from concept="
                 pass
             prop_type = getattr(prop, "type", "Text")
-            markup += f"""! {prop.label}:
-<!-- {prop_type} {prop.name} -->\n"""
+            sink.write(f"""! {prop.label}:
+<!-- {prop_type} {prop.name} -->\n""")
             inputType = (
                 f"|input type={prop.inputType}"
                 if getattr(prop, "inputType", None)
@@ -452,29 +592,28 @@ class FormTarget(SMWTarget):
                 if getattr(prop, "allowedValues", None)
                 else ""
             )
-            markup += f"""|{{{{{{field|{prop.name}|property={topic.name} {prop.name}{inputType}{size}{mandatory}{uploadable}{values_from}{allowedValues}{defaultValue}}}}}}}
+            sink.write(
+                f"""|{{{{{{field|{prop.name}|property={topic.name} {prop.name}{inputType}{size}{mandatory}{uploadable}{values_from}{allowedValues}{defaultValue}}}}}}}
 |-
 """
-        markup += f"""|-
+            )
+        sink.write(f"""|-
 |}}
 {{{{{{field|storemode|default={topic.defaultstoremode}|hidden}}}}}}
 {{{{{{end template}}}}}}
 <!-- {topic.name} -->
-        """
-        return markup
+        """)
 
-    def generate(self, topic: Topic) -> str:
+    def generate_to(self, topic: Topic, sink: TextIO):
         """
         generate the form page for the given topic
 
         Args:
             topic (Topic): the topic to generate wiki markup for
-
-        Returns:
-            str: the generated wiki markup
+            sink (TextIO): the writer for the generated wiki markup
         """
         multiple = "subobject" == topic.defaultstoremode
-        markup = f"""<noinclude>
+        sink.write(f"""<noinclude>
 This is the {self.profiWiki()}-Form for "{topic.name}".
 
 Create a new {topic.name} by entering a new pagetitle for a {topic.name}
@@ -486,7 +625,9 @@ with that pagetitle.
 
 === see also ===
 {self.seealso(topic)}
-</noinclude><includeonly>{self.formTemplate(topic,multiple)}
+</noinclude><includeonly>""")
+        self.formTemplate_to(topic, multiple, sink)
+        sink.write(f"""
 
 {{{{{{section|Freitext|level=1|hidden}}}}}}
 =Freitext=
@@ -498,8 +639,7 @@ with that pagetitle.
 {{{{{{standard input|save}}}}}}
 {{{{{{standard input|cancel}}}}}}
 </includeonly>
-        """
-        return markup
+        """)
 
 
 class ListOfTarget(SMWTarget):
@@ -515,25 +655,22 @@ class ListOfTarget(SMWTarget):
         pageTitle = f"List of {modelElement.getPluralName()}"
         return pageTitle
 
-    def generate(self, topic: Topic) -> str:
+    def generate_to(self, topic: Topic, sink: TextIO):
         """
         generate the list of page for the given topic
 
         Args:
             topic (Topic): the topic to generate wiki markup for
-
-        Returns:
-            str: the generated wiki markup
+            sink (TextIO): the writer for the generated wiki markup
         """
-        markup = f"""__NOCACHE__
+        sink.write(f"""__NOCACHE__
 {self.topicHeader(topic)}
 == {topic.getPluralName()} ==
 {{{{#ask: [[Concept:{topic.name}]]|format=count}}}}
 {{{{#forminput:form={topic.name}|button text=add {topic.name}}}}}
 {topic.askQuery()}
 [[:Category:{topic.name}]]
-    """
-        return markup
+    """)
 
 
 class TemplateTarget(SMWTarget):
@@ -577,7 +714,7 @@ class TemplateTarget(SMWTarget):
 }}"""
         return markup
 
-    def generate(self, topic: Topic) -> str:
+    def generate_to(self, topic: Topic, sink: TextIO):
         """
         generate a template for the given topic
 
@@ -585,73 +722,73 @@ class TemplateTarget(SMWTarget):
 
         Args:
             topic (Topic): the topic to generate wiki markup for
-
-        Returns:
-            str: the generated wiki markup
+            sink (TextIO): the writer for the generated wiki markup
         """
-        markup = f"""<noinclude>{self.copyright()}
+        sink.write(f"""<noinclude>{self.copyright()}
 This is the {self.profiWiki()}-Template for "{topic.name}".
 === see also ===
 {self.seealso(topic)}
 === Usage ===
 <pre>{{{{{topic.name}
-"""
-        all_properties = topic.get_all_properties()
-        for prop in all_properties:
-            markup += f"|{prop.name}=\n"
-        markup += f"""|storemode=property or subobject or none"
+""")
+        topic_index = self.getTopicIndex(topic)
+        for prop in topic_index.all_properties:
+            sink.write(f"|{prop.name}=\n")
+        sink.write(f"""|storemode=property or subobject or none"
 }}}}
 </pre>
 [[Category:Template]]
-</noinclude><includeonly>"""
-        extends_topics = topic.get_extends_topics()
-        for extends_topic in extends_topics:
-            markup += self.generateTopicCall(extends_topic)
-        primary_key_prop = topic.get_primary_key_property()
+</noinclude><includeonly>""")
+        for extends_topic in topic_index.extends_topics:
+            sink.write(self.generateTopicCall(extends_topic))
+        primary_key_prop = topic_index.primary_key_property
         subobject_name = (
             f"{{{{{{{primary_key_prop.name}|}}}}}}" if primary_key_prop else "-"
         )
-        markup += f"""{{{{#switch:{{{{{{storemode|}}}}}}
+        sink.write(f"""{{{{#switch:{{{{{{storemode|}}}}}}
 |none=
 |subobject={{{{#subobject:{subobject_name}
 |isA={topic.name}
-"""
+""")
         for prop in topic.properties.values():
             sep = self.separator_markup(prop)
-            markup += f"|{topic.name} {prop.name}={{{{{{{prop.name}|}}}}}}{sep}\n"
-        markup += f"""}}}}
+            sink.write(f"|{topic.name} {prop.name}={{{{{{{prop.name}|}}}}}}{sep}\n")
+        sink.write(f"""}}}}
 |#default={{{{#set:
 |isA={topic.name}
-"""
+""")
         for prop in topic.properties.values():
             sep = self.separator_markup(prop)
-            markup += f"|{topic.name} {prop.name}={{{{{{{prop.name}|}}}}}}{sep}\n"
-        markup += f"""}}}}\n"""  # end of #set
-        markup += f"""}}}}\n"""  # end of #switch
-        markup += f"""{{{{#switch:{{{{{{viewmode|}}}}}}"""
-        markup += "|hidden="
-        markup += "|masterdetail=\n"
-        for topicLink in topic.sourceTopicLinks.values():
+            sink.write(f"|{topic.name} {prop.name}={{{{{{{prop.name}|}}}}}}{sep}\n")
+        sink.write(f"""}}}}\n""")  # end of #set
+        sink.write(f"""}}}}\n""")  # end of #switch
+        sink.write(f"""{{{{#switch:{{{{{{viewmode|}}}}}}""")
+        sink.write("|hidden=")
+        sink.write("|masterdetail=\n")
+        for topicLink in topic_index.source_topic_links:
             if topicLink.targetTopic:
-                markup += f"= {topicLink.targetRole} =\n"
-                markup += f"{{{{#ask:[[Concept:{topicLink.targetTopic.name}]]"
-                markup += f"[[{topicLink.targetTopic.name} {topicLink.sourceRole}::{{{{FULLPAGENAME}}}}]]\n"
-                for prop in topicLink.targetTopic.propertiesByIndex():
-                    markup += (
+                sink.write(f"= {topicLink.targetRole} =\n")
+                sink.write(f"{{{{#ask:[[Concept:{topicLink.targetTopic.name}]]")
+                sink.write(
+                    f"[[{topicLink.targetTopic.name} {topicLink.sourceRole}::{{{{FULLPAGENAME}}}}]]\n"
+                )
+                target_index = self.getTopicIndex(topicLink.targetTopic)
+                for prop in target_index.properties_by_index:
+                    sink.write(
                         f"| ?{topicLink.targetTopic.name} {prop.name} = {prop.name}\n"
                     )
                     pass
-                markup += f"}}}}"  # end #ask
+                sink.write(f"}}}}")  # end #ask
                 pass
-        markup += "|#default="
-        markup += f"""{{{{{{!}}}} class='wikitable'
+        sink.write("|#default=")
+        sink.write(f"""{{{{{{!}}}} class='wikitable'
 ! colspan='2' {{{{!}}}}{topic.name}
 {{{{!}}}}-
 {{{{#switch:{{{{{{storemode|}}}}}}|property=
 ! colspan='2' style='text-align:left' {{{{!}}}} {{{{Icon|name=edit|size=24}}}}{{{{Link|target=Special:FormEdit/{topic.name}/{{{{FULLPAGENAME}}}}|title=edit}}}}
 {{{{!}}}}-
 }}}}
-"""
+""")
         for prop in topic.properties.values():
             # https://github.com/WolfgangFahl/py-yprinciple-gen/issues/13
             # show Links for external Identifiers in templates
@@ -665,20 +802,19 @@ This is the {self.profiWiki()}-Template for "{topic.name}".
                 link_markup = f"→[[{{{{{{{prop.name}|}}}}}}]]"
             else:
                 link_markup = ""
-            markup += f"""![[Property:{topic.name} {prop.name}|{prop.name}]]
+            sink.write(f"""![[Property:{topic.name} {prop.name}|{prop.name}]]
 {{{{!}}}}&nbsp;{{{{#if:{{{{{{{prop.name}|}}}}}}|{{{{{{{prop.name}}}}}}}|}}}}{link_markup}
-{{{{!}}}}-\n"""
-        markup += f"{{{{!}}}}}}\n"  # end of table
-        markup += f"""}}}}\n"""  # end of #switch viewmode
+{{{{!}}}}-\n""")
+        sink.write(f"{{{{!}}}}}}\n")  # end of table
+        sink.write(f"""}}}}\n""")  # end of #switch viewmode
 
         if hasattr(topic, "defaultstoremode"):
             if topic.defaultstoremode == "property":
-                markup += (
+                sink.write(
                     f"[[Category:{topic.name}]]{{{{#default_form:{topic.name}}}}}\n"
                 )
 
-        markup += """</includeonly>"""
-        return markup
+        sink.write("""</includeonly>""")
 
 
 class PropertyMultiTarget(SMWTarget):
@@ -719,26 +855,27 @@ class PropertyTarget(SMWTarget):
         pageTitle = f"{self.name}:{prop.topic} {prop.name}"
         return pageTitle
 
-    def generate(self, prop: Property) -> str:
+    def generate_to(self, prop: Property, sink: TextIO):
         """
         generate wiki markup for the given property
 
         see https://wiki.bitplan.com/index.php/SiDIFTemplates#propertiesdefs
 
-        Returns:
-            str: the wiki markup for the given property
+        Args:
+            prop (Property): the property to generate wiki markup for
+            sink (TextIO): the writer for the generated wiki markup
         """
         topic_name = prop.topic
         topicWithConcept = f"Concept:{topic_name}"
-        markup = f"""{{{{Property
+        sink.write(f"""{{{{Property
 |name={prop.name}
 |label={prop.label}
-"""
+""")
         if hasattr(prop, "documentation"):
-            markup += f"""|documentation={prop.documentation}\n"""
+            sink.write(f"""|documentation={prop.documentation}\n""")
         prop_type = getattr(prop, "type", "Text")
-        markup += f"""|type=Special:Types/{prop_type}
-"""
+        sink.write(f"""|type=Special:Types/{prop_type}
+""")
         # @TODO read from metamodel
         for prop_name in [
             "index",
@@ -759,20 +896,21 @@ class PropertyTarget(SMWTarget):
             if hasattr(prop, prop_name):
                 value = getattr(prop, prop_name, None)
                 if value is not None:
-                    markup += f"|{prop_name}={value}\n"
+                    sink.write(f"|{prop_name}={value}\n")
                     # e.g. |index={prop.index}
-        markup += f"""|topic={(topicWithConcept)}
+        sink.write(f"""|topic={(topicWithConcept)}
 |storemode=prop
 }}}}
 * [[Has type::{prop.type}]]
-"""
+""")
         if hasattr(prop, "formatterURI") and prop.formatterURI:
-            markup += f"""* External formatter uri: [[External formatter uri::{prop.formatterURI}]]
+            sink.write(
+                f"""* External formatter uri: [[External formatter uri::{prop.formatterURI}]]
 """
-        markup += f"""
+            )
+        sink.write(f"""
 This is a Property with type {{{{#show: {{{{FULLPAGENAMEE}}}} | ?Property type#- }}}}
-"""
-        return markup
+""")
 
 
 class PythonTarget(SMWTarget):
@@ -793,11 +931,11 @@ class PythonTarget(SMWTarget):
             ptype = "float"
         return ptype
 
-    def generate(self, topic: "Topic") -> str:
+    def generate_to(self, topic: "Topic", sink: TextIO):
         """
         generate python code for the given topic
         """
-        markup = f'''from dataclasses import dataclass
+        sink.write(f'''from dataclasses import dataclass
 from typing import Optional
 import dacite
 @dataclass
@@ -806,11 +944,13 @@ class {topic.name}:
     {topic.documentation}
     """
     pageTitle:str
-'''
+''')
 
-        for prop in topic.propertiesByIndex():
-            markup += f"""    {prop.name}:Optional[{self.pythonPropType(prop)}] # {getattr(prop,"documentation","")}\n"""
-        markup += f'''
+        for prop in self.getTopicIndex(topic).properties_by_index:
+            sink.write(
+                f"""    {prop.name}:Optional[{self.pythonPropType(prop)}] # {getattr(prop,"documentation","")}\n"""
+            )
+        sink.write(f'''
     @classmethod
     def askQuery(cls):
         """
@@ -835,6 +975,4 @@ class {topic.name}:
         """
         {topic.name.lower()}=dacite.from_dict(data_class=cls,data=data)
         return {topic.name.lower()}
-        '''
-
-        return markup
+        ''')
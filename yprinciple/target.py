@@ -4,7 +4,109 @@ Created on 2022-11-25
 @author: wf
 """
 
-from meta.metamodel import Topic
+from typing import Callable, Dict, Hashable, List, TextIO
+
+from meta.metamodel import Context, Topic
+
+from yprinciple.context_index import ContextIndex
+
+
+class FragmentWriter:
+    """
+    a writer that collects markup fragments in a list
+    and joins them only once on request
+    """
+
+    def __init__(self):
+        self.fragments: List[str] = []
+
+    def write(self, fragment: str) -> int:
+        """
+        add the given fragment
+
+        Args:
+            fragment (str): the markup fragment to add
+
+        Returns:
+            int: the number of characters written
+        """
+        self.fragments.append(fragment)
+        return len(fragment)
+
+    def getvalue(self) -> str:
+        """
+        get the markup collected so far
+        """
+        return "".join(self.fragments)
+
+
+class FragmentCache:
+    """
+    memo of markup fragments that only depend on the context
+    e.g. the plantuml class of a topic with its extends chain
+    together with the index of the context
+
+    the cache is scoped to a set of targets and a context - the fragments
+    are discarded as soon as a fragment for another context is requested
+    """
+
+    def __init__(self):
+        self.context = None
+        self.fragments: Dict[Hashable, str] = {}
+        self.context_index = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, context=None):
+        """
+        discard all fragments
+
+        Args:
+            context: the context the following fragments belong to
+        """
+        self.context = context
+        self.fragments = {}
+        self.context_index = None
+
+    def getContextIndex(self, context: Context) -> ContextIndex:
+        """
+        get the index of the given context - built once per context
+
+        Args:
+            context (Context): the context to get the index for
+
+        Returns:
+            ContextIndex: the index
+        """
+        if context is not self.context:
+            self.invalidate(context)
+        if self.context_index is None:
+            self.context_index = ContextIndex(context)
+        return self.context_index
+
+    def get(self, key: Hashable, compute: Callable[[], str], context=None) -> str:
+        """
+        get the fragment for the given key
+
+        Args:
+            key (Hashable): the key of the fragment
+            compute (Callable): the function to create the fragment if it is not cached
+            context: the context the fragment depends on - None for fragments
+                that do not depend on the context
+
+        Returns:
+            str: the fragment
+        """
+        if context is not None and context is not self.context:
+            self.invalidate(context)
+        fragment = self.fragments.get(key, None)
+        if fragment is None:
+            self.misses += 1
+            fragment = compute()
+            self.fragments[key] = fragment
+        else:
+            self.hits += 1
+        return fragment
 
 
 class Target:
@@ -34,6 +136,8 @@ class Target:
         self.is_subtarget = is_subtarget
         self.showInGrid = showInGrid
         self.subTarget = None
+        # optional memo of fragments shared by a set of targets
+        self.fragment_cache = None
 
     def getLabelText(self, modelElement) -> str:
         return self.getPageTitle(modelElement)
@@ -63,4 +167,28 @@ class Target:
         return filename
 
     def generate(self, topic: "Topic") -> str:
+        """
+        generate the markup for the given topic (or other model element)
+
+        Args:
+            topic (Topic): the model element to generate markup for
+
+        Returns:
+            str: the generated markup
+        """
+        sink = FragmentWriter()
+        self.generate_to(topic, sink)
+        markup = sink.getvalue()
+        return markup
+
+    def generate_to(self, topic: "Topic", sink: TextIO):
+        """
+        generate the markup for the given topic (or other model element)
+        as a stream of fragments
+
+        Args:
+            topic (Topic): the model element to generate markup for
+            sink (TextIO): a writer for the fragments e.g. a FragmentWriter,
+                an io.StringIO or a file opened for writing
+        """
         raise Exception(f"No generator available for target {self.name}")
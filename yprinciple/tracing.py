@@ -0,0 +1,269 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class Span:
+    """
+    a named, timed phase of a generation run with attributes
+    """
+
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        attributes: dict,
+        parent: Optional["Span"] = None,
+        recording: bool = True,
+    ):
+        """
+        constructor
+
+        Args:
+            name(str): the name of the phase e.g. fetch
+            category(str): the category e.g. cell
+            attributes(dict): attributes e.g. target key, topic and sizes
+            parent(Span): the enclosing span in the same thread
+            recording(bool): False for the span used when tracing is off
+        """
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.parent = parent
+        self.recording = recording
+        self.start_ns = 0
+        self.end_ns = 0
+        self.thread_id = 0
+        self.thread_name = ""
+
+    def set(self, **attributes):
+        """
+        set the given attributes
+        """
+        if self.recording:
+            self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        """
+        the duration of this span in seconds
+        """
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def getDepth(self) -> int:
+        """
+        get the nesting depth of this span
+        """
+        depth = 0
+        parent = self.parent
+        while parent is not None:
+            depth += 1
+            parent = parent.parent
+        return depth
+
+
+class Tracer:
+    """
+    hierarchical span tracer for generation runs
+
+    spans nest per thread and asyncio task and are recorded when tracing
+    is started - listeners get every started and finished span e.g. to
+    aggregate metrics. When neither is active span() only yields a shared
+    no-op span
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        """
+        constructor
+
+        Args:
+            clock(Callable): the nanosecond clock to use
+        """
+        self.clock = clock
+        self.recording = False
+        self.spans: List[Span] = []
+        self.listeners: List[Callable[[Span], None]] = []
+        self.start_listeners: List[Callable[[Span], None]] = []
+        self.lock = threading.Lock()
+        self.current_span: ContextVar[Optional[Span]] = ContextVar(
+            f"current_span_{id(self)}", default=None
+        )
+        self.epoch_ns = clock()
+        self.null_span = Span("null", "null", {}, recording=False)
+
+    @property
+    def enabled(self) -> bool:
+        """
+        True if spans are recorded or listened to
+        """
+        return self.recording or bool(self.listeners) or bool(self.start_listeners)
+
+    def start(self):
+        """
+        start recording spans - previously recorded spans are discarded
+        """
+        with self.lock:
+            self.spans = []
+            self.epoch_ns = self.clock()
+            self.recording = True
+
+    def stop(self):
+        """
+        stop recording spans
+        """
+        self.recording = False
+
+    def addListener(
+        self,
+        listener: Callable[[Span], None],
+        on_start: Callable[[Span], None] = None,
+    ):
+        """
+        add a listener to be called with every finished span
+
+        Args:
+            listener(Callable): the callback for finished spans
+            on_start(Callable): an optional callback for started spans
+        """
+        self.listeners.append(listener)
+        if on_start is not None:
+            self.start_listeners.append(on_start)
+
+    def removeListener(
+        self,
+        listener: Callable[[Span], None],
+        on_start: Callable[[Span], None] = None,
+    ):
+        """
+        remove the given listener
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+        if on_start in self.start_listeners:
+            self.start_listeners.remove(on_start)
+
+    @contextmanager
+    def span(self, name: str, category: str = "ypgen", **attributes) -> Iterator[Span]:
+        """
+        trace the phase with the given name
+
+        Args:
+            name(str): the name of the phase
+            category(str): the category of the phase
+            attributes: the attributes of the span
+
+        Yields:
+            Span: the span to add attributes to
+        """
+        if not self.enabled:
+            yield self.null_span
+            return
+        parent = self.current_span.get()
+        span = Span(name, category, attributes, parent=parent)
+        thread = threading.current_thread()
+        span.thread_id = thread.ident
+        span.thread_name = thread.name
+        token = self.current_span.set(span)
+        for on_start in self.start_listeners:
+            on_start(span)
+        span.start_ns = self.clock()
+        try:
+            yield span
+        except BaseException as ex:
+            span.set(error=type(ex).__name__)
+            raise
+        finally:
+            span.end_ns = self.clock()
+            self.current_span.reset(token)
+            if self.recording:
+                with self.lock:
+                    self.spans.append(span)
+            for listener in self.listeners:
+                listener(span)
+
+    def getSpans(self, name: str = None) -> List[Span]:
+        """
+        get the recorded spans - optionally only the ones with the given name
+        """
+        with self.lock:
+            spans = list(self.spans)
+        if name is not None:
+            spans = [span for span in spans if span.name == name]
+        return spans
+
+    def toChromeTrace(self) -> dict:
+        """
+        get the recorded spans in the Chrome trace event format
+        that can be loaded in chrome://tracing and https://ui.perfetto.dev
+
+        Returns:
+            dict: the trace with complete ("X") events in microseconds
+        """
+        pid = os.getpid()
+        events = []
+        thread_names: Dict[int, str] = {}
+        for span in sorted(self.getSpans(), key=lambda span: span.start_ns):
+            thread_names[span.thread_id] = span.thread_name
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start_ns - self.epoch_ns) / 1000,
+                    "dur": (span.end_ns - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {key: str(value) for key, value in span.attributes.items()},
+                }
+            )
+        for thread_id, thread_name in thread_names.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": {"name": thread_name},
+                }
+            )
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        return trace
+
+    def save(self, path: str):
+        """
+        save the recorded spans as Chrome trace JSON to the given path
+        """
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.toChromeTrace(), trace_file)
+
+    def getSummary(self) -> str:
+        """
+        get the number of spans and the total time per span name
+        """
+        totals: Dict[str, list] = {}
+        for span in self.getSpans():
+            total = totals.setdefault(span.name, [0, 0.0])
+            total[0] += 1
+            total[1] += span.duration
+        lines = [
+            f"{name}: {count}x {seconds:.3f} s"
+            for name, (count, seconds) in sorted(
+                totals.items(), key=lambda item: -item[1][1]
+            )
+        ]
+        summary = "\n".join(lines)
+        return summary
+
+
+# the tracer used by the generator API, the cells and the generator grid
+tracer = Tracer()
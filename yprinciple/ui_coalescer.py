@@ -0,0 +1,90 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import threading
+import time
+from typing import Callable, Dict
+
+
+class UpdateCoalescer:
+    """
+    coalesce user interface updates
+
+    elements marked as dirty and progress steps are collected and
+    sent at a bounded rate instead of once per change - a final flush
+    makes sure that the last changes are shown
+    """
+
+    def __init__(
+        self, min_interval: float = 0.1, clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        constructor
+
+        Args:
+            min_interval(float): the minimum time between two flushes in seconds
+                e.g. 0.1 for at most 10 flushes per second
+            clock(Callable): the clock to use
+        """
+        self.min_interval = min_interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.dirty: Dict[int, object] = {}
+        self.progress_steps: Dict[int, list] = {}
+        self.last_flush = None
+        self.requested = 0
+        self.flushes = 0
+
+    def mark_dirty(self, element):
+        """
+        mark the given element as needing an update
+
+        Args:
+            element: an element with an update() method e.g. a nicegui element
+        """
+        with self.lock:
+            self.requested += 1
+            self.dirty[id(element)] = element
+        self.maybe_flush()
+
+    def add_progress(self, progress_bar, steps: int = 1):
+        """
+        add the given number of steps to the given progress bar
+
+        Args:
+            progress_bar: a progress bar with an update(steps) method
+            steps(int): the number of steps
+        """
+        with self.lock:
+            self.requested += 1
+            entry = self.progress_steps.setdefault(id(progress_bar), [progress_bar, 0])
+            entry[1] += steps
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        """
+        flush if the minimum interval since the last flush has passed
+        """
+        last_flush = self.last_flush
+        if last_flush is None or self.clock() - last_flush >= self.min_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        send all pending updates
+        """
+        with self.lock:
+            self.last_flush = self.clock()
+            progress_steps = self.progress_steps
+            dirty = self.dirty
+            self.progress_steps = {}
+            self.dirty = {}
+            if progress_steps or dirty:
+                self.flushes += 1
+        for progress_bar, steps in progress_steps.values():
+            progress_bar.update(steps)
+        for element in dirty.values():
+            element.update()
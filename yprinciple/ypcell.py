@@ -4,36 +4,283 @@ Created on 2022-11-25
 @author: wf
 """
 
-import os
+import difflib
+import hashlib
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from meta.metamodel import Topic
+from meta.metamodel import Property, Topic
 from meta.mw import SMWAccess
 from ngwidgets.editor import Editor
-from wikibot3rd.wikipush import WikiPush
 
+from yprinciple.edit_scheduler import EditScheduler
+from yprinciple.file_writer import BulkFileWriter
+from yprinciple.page_cache import PageCache
 from yprinciple.target import Target
+from yprinciple.tracing import tracer
 from yprinciple.version import Version
 
 
-@dataclass
+class MarkupDiff:
+    """
+    lazy, bounded difference between the text of a page and the generated markup
+
+    equal texts are detected by length and hash without diffing, the diff
+    itself is only computed when it is accessed and its text is truncated
+    to max_lines lines while the added/removed statistics cover the full diff
+    """
+
+    __slots__ = (
+        "old_text",
+        "new_text",
+        "max_lines",
+        "n",
+        "attributes",
+        "computed",
+        "diff_text",
+        "added",
+        "removed",
+        "truncated",
+    )
+
+    def __init__(
+        self,
+        old_text: typing.Optional[str],
+        new_text: str,
+        max_lines: int = 500,
+        n: int = 1,
+        attributes: dict = None,
+    ):
+        """
+        constructor
+
+        Args:
+            old_text(str): the current page text - None if there is no page
+                in which case the "diff" is the new text itself
+            new_text(str): the generated markup
+            max_lines(int): the maximum number of diff lines to keep
+            n(int): the number of context lines
+            attributes(dict): the attributes of the diff trace span
+                e.g. the target and topic of the cell
+        """
+        self.old_text = old_text
+        self.new_text = new_text
+        self.max_lines = max_lines
+        self.n = n
+        self.attributes = attributes or {}
+        self.computed = False
+        self.diff_text = ""
+        self.added = 0
+        self.removed = 0
+        self.truncated = 0
+
+    @staticmethod
+    def getHash(text: str) -> str:
+        """
+        get the sha256 hash of the given text
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return text_hash
+
+    def isEqual(self) -> bool:
+        """
+        check whether the old and the new text are the same
+        """
+        if self.old_text is None:
+            return False
+        if len(self.old_text) != len(self.new_text):
+            return False
+        return self.getHash(self.old_text) == self.getHash(self.new_text)
+
+    def compute(self):
+        """
+        compute the diff in the human readable format of WikiPush.getDiff
+        """
+        if self.computed:
+            return
+        self.computed = True
+        if self.old_text is None:
+            self.diff_text = self.new_text
+            return
+        if self.isEqual():
+            return
+        with tracer.span(
+            "diff",
+            old_size=len(self.old_text),
+            new_size=len(self.new_text),
+            **self.attributes,
+        ) as span:
+            lines = []
+            diffs = difflib.unified_diff(
+                self.old_text.split("\n"), self.new_text.split("\n"), n=self.n
+            )
+            for line in diffs:
+                if "@@" in line or "---" in line or "+++" in line:
+                    continue
+                if line.startswith("+"):
+                    self.added += 1
+                elif line.startswith("-"):
+                    self.removed += 1
+                if len(lines) < self.max_lines:
+                    lines.append(line)
+                else:
+                    self.truncated += 1
+            if self.truncated:
+                lines.append(f"... {self.truncated} more diff lines truncated")
+            self.diff_text = "\n".join(lines)
+            span.set(added=self.added, removed=self.removed)
+
+    @property
+    def text(self) -> str:
+        """
+        the (truncated) diff text
+        """
+        self.compute()
+        return self.diff_text
+
+    def getStats(self) -> str:
+        """
+        get the added/removed line statistics e.g. "+3/-1"
+        """
+        self.compute()
+        stats = f"+{self.added}/-{self.removed}"
+        return stats
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass(slots=True)
+class PageRef:
+    """
+    compact reference to a revision of a wiki page
+
+    keeps the revision id, size and hash of the text instead of
+    the mwclient Page object and the full text
+    """
+
+    # the full title including the namespace
+    title: str
+    namespace: int
+    exists: bool
+    revision: int
+    # the size of the text in bytes
+    size: int = 0
+    # the sha256 hash of the text - None if the page does not exist
+    text_hash: typing.Optional[str] = None
+    # the (shared) site of the page for diff urls
+    site: object = field(default=None, repr=False)
+
+    @property
+    def page_title(self) -> str:
+        """
+        the title without the namespace as the attribute of an mwclient Page
+        """
+        page_title = self.title.split(":", 1)[1] if self.namespace else self.title
+        return page_title
+
+    @classmethod
+    def ofPage(cls, page, text: typing.Optional[str]) -> typing.Optional["PageRef"]:
+        """
+        create a compact reference for the given page
+
+        Args:
+            page(Page): the mwclient Page (if any)
+            text(str): the text of the page - None if the page does not exist
+
+        Returns:
+            PageRef: the reference or None if there is no page
+        """
+        if page is None or isinstance(page, PageRef):
+            return page
+        page_ref = cls(
+            title=page.name,
+            namespace=page.namespace,
+            exists=page.exists,
+            revision=page.revision,
+            size=len(text.encode("utf-8")) if text else 0,
+            text_hash=MarkupDiff.getHash(text) if text is not None else None,
+            site=page.site,
+        )
+        return page_ref
+
+
+@dataclass(slots=True)
 class GenResult:
     """
     generator Result
     """
 
-    # markup for new page
-    markup: str
+    # markup for new page - None for a compact result
+    markup: typing.Optional[str]
+
+    def getMarkupHash(self) -> str:
+        """
+        get the sha256 hash of the markup
+        """
+        return MarkupDiff.getHash(self.markup)
+
+    def getMarkupSize(self) -> int:
+        """
+        get the size of the markup in bytes
+        """
+        return len(self.markup.encode("utf-8"))
 
 
-@dataclass
+@dataclass(slots=True)
 class MwGenResult(GenResult):
-    # changes made
-    markup_diff: str
     # @TODO use correct typing for MwClient Page object (pywikibot compatible?)
+    # mwclient Page or PageRef for a compact result
     old_page: object
     new_page: object
+    # True if the generated markup matched the page text and no edit was done
+    unchanged: bool = False
+    # changes made - computed lazily
+    diff: typing.Optional[MarkupDiff] = field(default=None, repr=False)
+    # the size in bytes and the sha256 hash of the markup of a compact result
+    markup_size: typing.Optional[int] = None
+    markup_hash: typing.Optional[str] = None
+
+    def compact(self, old_text: typing.Optional[str], new_text: typing.Optional[str]):
+        """
+        drop the page objects, the markup and the diff and keep only
+        the revision ids, sizes and hashes
+
+        Args:
+            old_text(str): the text of the old page
+            new_text(str): the text of the new page
+        """
+        self.old_page = PageRef.ofPage(self.old_page, old_text)
+        self.new_page = PageRef.ofPage(self.new_page, new_text)
+        if self.markup is not None:
+            self.markup_size = len(self.markup.encode("utf-8"))
+            self.markup_hash = MarkupDiff.getHash(self.markup)
+            self.markup = None
+        self.diff = None
+
+    def getMarkupHash(self) -> str:
+        """
+        get the sha256 hash of the markup - also for a compact result
+        """
+        if self.markup is None:
+            return self.markup_hash
+        return GenResult.getMarkupHash(self)
+
+    def getMarkupSize(self) -> int:
+        """
+        get the size of the markup in bytes - also for a compact result
+        """
+        if self.markup is None:
+            return self.markup_size
+        return GenResult.getMarkupSize(self)
+
+    @property
+    def markup_diff(self) -> str:
+        """
+        the (truncated) diff of the page text and the markup
+        """
+        markup_diff = "" if self.diff is None else self.diff.text
+        return markup_diff
 
     def getDiffUrl(self) -> typing.Union[str, None]:
         """
@@ -61,10 +308,42 @@ class MwGenResult(GenResult):
         new_revision_id = getattr(self.new_page, "revision", None)
         return old_revision_id != new_revision_id
 
+    def getStatus(self) -> str:
+        """
+        get the status of this result
+
+        Returns:
+            str: "unchanged", "edited" or "dry run"
+        """
+        if self.unchanged:
+            status = "unchanged"
+        elif self.new_page is not None:
+            status = "edited"
+        else:
+            status = "dry run"
+        return status
+
 
-@dataclass
+@dataclass(slots=True)
 class FileGenResult(GenResult):
     path: str
+    # True if the file already had the generated content and was not written
+    unchanged: bool = False
+
+    def getStatus(self) -> str:
+        """
+        get the status of this result
+
+        Returns:
+            str: "unchanged", "written" or "dry run"
+        """
+        if self.unchanged:
+            status = "unchanged"
+        elif self.path is not None:
+            status = "written"
+        else:
+            status = "dry run"
+        return status
 
 
 class YpCell:
@@ -72,6 +351,23 @@ class YpCell:
     a Y-Principle cell
     """
 
+    # a grid has a cell per topic, target and property
+    __slots__ = (
+        "modelElement",
+        "target",
+        "smwAccess",
+        "debug",
+        "subCells",
+        "ui_ready",
+        "checkbox_id",
+        "pageUrl",
+        "page",
+        "pageText",
+        "pageTitle",
+        "status",
+        "statusMsg",
+    )
+
     def __init__(self, modelElement, target: Target, debug: bool = False):
         """
         constructor
@@ -87,6 +383,13 @@ class YpCell:
         self.debug = debug
         self.subCells = {}
         self.ui_ready = False
+        self.checkbox_id = None
+        self.pageUrl = None
+        self.page = None
+        self.pageText = None
+        self.pageTitle = None
+        self.status = None
+        self.statusMsg = ""
 
     @classmethod
     def createYpCell(
@@ -101,7 +404,11 @@ class YpCell:
         return ypCell
 
     def generateToFile(
-        self, target_dir: str, dryRun: bool = True, withEditor: bool = False
+        self,
+        target_dir: str,
+        dryRun: bool = True,
+        withEditor: bool = False,
+        file_writer: BulkFileWriter = None,
     ) -> FileGenResult:
         """
         generate the given cell and store the result to a file in the given target directory
@@ -110,6 +417,8 @@ class YpCell:
             target_dir (str): path to the target directory
             dryRun (bool): if True do not push the result
             withEditor (bool): if True open Editor when in dry Run mode
+            file_writer (BulkFileWriter): the writer to use for many cells -
+                if None a writer for the target directory is created
 
         Returns:
             FileGenResult: the generated result
@@ -117,17 +426,20 @@ class YpCell:
         # ignore multi targets
         if self.target.is_multi:
             return None
-        markup = self.generateMarkup(withEditor=withEditor)
-        path = None
-        if not dryRun:
-            filename = self.target.getFileName(self.modelElement, "")
-            path = f"{target_dir}/{filename}"
-            if not os.path.isdir(target_dir):
-                os.makedirs(target_dir, exist_ok=True)
-            with open(path, "w") as markup_file:
-                markup_file.write(markup)
-            pass
-        genResult = FileGenResult(markup=markup, path=path)
+        with tracer.span(
+            "cell", category="cell", **self.getTraceAttributes()
+        ) as cell_span:
+            markup = self.generateMarkup(withEditor=withEditor)
+            path = None
+            unchanged = False
+            if not dryRun:
+                if file_writer is None:
+                    file_writer = BulkFileWriter(target_dir)
+                filename = self.target.getFileName(self.modelElement, "")
+                with tracer.span("write", size=len(markup)):
+                    path, unchanged = file_writer.write(filename, markup)
+            genResult = FileGenResult(markup=markup, path=path, unchanged=unchanged)
+            cell_span.set(status=genResult.getStatus())
         return genResult
 
     def generateMarkup(self, withEditor: bool = False):
@@ -140,7 +452,9 @@ class YpCell:
         Returns:
             str: the markup
         """
-        markup = self.target.generate(self.modelElement)
+        with tracer.span("generate", **self.getTraceAttributes()) as span:
+            markup = self.target.generate(self.modelElement)
+            span.set(size=len(markup))
         if withEditor:
             Editor.open_tmp_text(
                 markup,
@@ -150,52 +464,164 @@ class YpCell:
             )
         return markup
 
+    @staticmethod
+    def normalizeMarkup(markup: str) -> str:
+        """
+        normalize the given markup for comparison by unifying line endings
+        and removing trailing whitespace of lines and of the whole text
+
+        MediaWiki strips trailing whitespace when saving a page so generated
+        markup might otherwise never compare equal to the page text
+
+        Args:
+            markup (str): the markup to normalize
+
+        Returns:
+            str: the normalized markup
+        """
+        markup = markup.replace("\r\n", "\n").replace("\r", "\n")
+        lines = [line.rstrip() for line in markup.split("\n")]
+        normalized = "\n".join(lines).rstrip()
+        return normalized
+
+    @classmethod
+    def isUnchanged(
+        cls, pageText: str, markup: str, ignore_whitespace: bool = False
+    ) -> bool:
+        """
+        check whether the given markup equals the given page text
+
+        Args:
+            pageText (str): the current text of the page - None if the page does not exist
+            markup (str): the generated markup
+            ignore_whitespace (bool): if True ignore trailing whitespace and line endings
+
+        Returns:
+            bool: True if an edit would not change the page
+        """
+        if pageText is None:
+            return False
+        if pageText == markup:
+            return True
+        if ignore_whitespace:
+            return cls.normalizeMarkup(pageText) == cls.normalizeMarkup(markup)
+        return False
+
     def generateViaMwApi(
-        self, smwAccess=None, dryRun: bool = True, withEditor: bool = False
+        self,
+        smwAccess=None,
+        dryRun: bool = True,
+        withEditor: bool = False,
+        page_cache: PageCache = None,
+        ignore_whitespace: bool = False,
+        compact: bool = False,
+        edit_scheduler: EditScheduler = None,
+        markup: str = None,
     ) -> typing.Union[MwGenResult, None]:
         """
         generate the given cell and upload the result via the given
         Semantic MediaWiki Access
 
+        pages whose text already equals the generated markup are not edited
+
         Args:
             smwAccess (SMWAccess): the access to use
             dryRun (bool): if True do not push the result
             withEditor (bool): if True open Editor when in dry Run mode
+            page_cache (PageCache): optional prefetched pages to get the old page from
+            ignore_whitespace (bool): if True ignore trailing whitespace and line endings
+                when comparing the markup with the current page text
+            compact (bool): if True keep only the revision ids, sizes and hashes
+                of the pages and the markup in the result and in this cell
+            edit_scheduler (EditScheduler): the scheduler to edit with - if None
+                the page is edited directly with the retries of mwclient
+            markup (str): the already generated markup - if None the markup is generated
 
         Returns:
             MwGenResult:
             None: if target is multi
         """
-        markup_diff = ""
         # ignore multi targets
         if self.target.is_multi:
             return None
-        markup = self.generateMarkup(withEditor=withEditor)
-        old_page = self.getPage(smwAccess)
-        new_page = None
-        if self.pageText:
-            markup_diff = WikiPush.getDiff(self.pageText, markup)
-            if withEditor:
-                Editor.open_tmp_text(
-                    self.pageText,
-                    file_name=self.target.getFileName(self.modelElement, "wiki_page"),
+        with tracer.span(
+            "cell", category="cell", **self.getTraceAttributes()
+        ) as cell_span:
+            diff = None
+            if markup is None:
+                markup = self.generateMarkup(withEditor=withEditor)
+            old_page = self.getPage(smwAccess, page_cache=page_cache)
+            old_text = self.pageText
+            new_page = None
+            unchanged = self.isUnchanged(self.pageText, markup, ignore_whitespace)
+            if self.pageText and not unchanged:
+                diff = MarkupDiff(
+                    self.pageText, markup, attributes=self.getTraceAttributes()
                 )
-                Editor.open_tmp_text(
-                    markup_diff,
-                    file_name=self.target.getFileName(self.modelElement, "wiki_diff"),
-                )
-        if not dryRun and self.page:
-            self.page.edit(markup, f"modified by {Version.name} {Version.version}")
-            # update status
-            # @TODO make diff/status available see https://github.com/WolfgangFahl/py-yprinciple-gen/issues/15
-            new_page = self.getPage(smwAccess)
-        else:
-            markup_diff = markup
-        genResult = MwGenResult(
-            markup=markup, markup_diff=markup_diff, old_page=old_page, new_page=new_page
-        )
+                if withEditor:
+                    Editor.open_tmp_text(
+                        self.pageText,
+                        file_name=self.target.getFileName(
+                            self.modelElement, "wiki_page"
+                        ),
+                    )
+                    Editor.open_tmp_text(
+                        diff.text,
+                        file_name=self.target.getFileName(
+                            self.modelElement, "wiki_diff"
+                        ),
+                    )
+            if unchanged and not dryRun:
+                # no-op edit avoided
+                pass
+            elif not dryRun and self.page:
+                summary = f"modified by {Version.name} {Version.version}"
+                with tracer.span("edit", page=self.pageTitle, size=len(markup)):
+                    if edit_scheduler is not None:
+                        edit_scheduler.edit(self.page, markup, summary)
+                    else:
+                        self.page.edit(markup, summary)
+                if page_cache is not None:
+                    page_cache.invalidate(self.pageTitle)
+                # update status
+                # @TODO make diff/status available see https://github.com/WolfgangFahl/py-yprinciple-gen/issues/15
+                with tracer.span("refetch", page=self.pageTitle):
+                    new_page = self.getPage(smwAccess)
+            else:
+                diff = MarkupDiff(None, markup)
+            genResult = MwGenResult(
+                markup=markup,
+                old_page=old_page,
+                new_page=new_page,
+                unchanged=unchanged,
+                diff=diff,
+            )
+            if compact:
+                new_text = self.pageText if new_page is not None else None
+                genResult.compact(old_text, new_text)
+                self.page = genResult.new_page or genResult.old_page
+                self.pageText = None
+            cell_span.set(status=genResult.getStatus(), dryRun=dryRun)
         return genResult
 
+    def getTraceAttributes(self) -> dict:
+        """
+        get the attributes describing me in trace spans
+
+        Returns:
+            dict: the target and topic (and property) name
+        """
+        element = self.modelElement
+        if isinstance(element, Property):
+            attributes = {
+                "target": self.target.name,
+                "topic": element.topic,
+                "property": element.name,
+            }
+        else:
+            attributes = {"target": self.target.name, "topic": element.name}
+        return attributes
+
     def getLabelText(self) -> str:
         """
         get my label Text
@@ -212,12 +638,43 @@ class YpCell:
         """
         return self.target.getPageTitle(self.modelElement)
 
-    def getPage(self, smwAccess: SMWAccess) -> str:
+    def hasPage(self) -> bool:
+        """
+        check whether this cell is backed by a wiki page
+
+        Returns:
+            bool: False for multi targets and the Python target
+        """
+        has_page = not (self.target.name == "Python" or self.target.is_multi)
+        return has_page
+
+    def getPageTitles(self) -> typing.List[str]:
+        """
+        get the titles of the wiki pages of this cell and its subcells
+
+        Returns:
+            List[str]: the page titles e.g. for prefetching
+        """
+        page_titles = []
+        if self.hasPage():
+            page_titles.append(self.getPageTitle())
+        for subCell in self.subCells.values():
+            page_titles.extend(subCell.getPageTitles())
+        return page_titles
+
+    def getPage(
+        self, smwAccess: SMWAccess, page_cache: PageCache = None, compact: bool = False
+    ) -> str:
         """
         get the pageText and status for the given smwAccess
 
         Args:
             smwAccess(SMWAccess): the Semantic Mediawiki access to use
+            page_cache(PageCache): optional prefetched pages to use instead of
+                fetching the page and its text via two API calls
+            compact(bool): if True only keep a PageRef with the revision id,
+                size and hash instead of the page object and its text
+                e.g. when only the status is needed
 
         Returns:
             str: the wiki markup for this cell (if any)
@@ -227,22 +684,32 @@ class YpCell:
         self.page = None
         self.pageText = None
         self.pageTitle = None
-        if self.target.name == "Python" or self.target.is_multi:
+        if not self.hasPage():
             self.status = "ⓘ"
             self.statusMsg = f"{self.status}"
         else:
             wikiClient = smwAccess.wikiClient
             self.pageTitle = self.getPageTitle()
-            self.page = wikiClient.getPage(self.pageTitle)
+            record = page_cache.get(self.pageTitle) if page_cache else None
+            with tracer.span(
+                "fetch", page=self.pageTitle, cached=record is not None
+            ) as span:
+                if record is not None:
+                    self.page = page_cache.getPage(self.pageTitle)
+                    self.pageText = record.text
+                else:
+                    self.page = wikiClient.getPage(self.pageTitle)
+                    if self.page.exists:
+                        self.pageText = self.page.text()
+                span.set(size=len(self.pageText) if self.pageText else 0)
             baseurl = wikiClient.wikiUser.getWikiUrl()
             # assumes simple PageTitle without special chars
             # see https://www.mediawiki.org/wiki/Manual:Page_title for the more comples
             # rules that could apply
             self.pageUrl = f"{baseurl}/index.php/{self.pageTitle}"
-            if self.page.exists:
-                self.pageText = self.page.text()
-            else:
-                self.pageText = None
             self.status = f"✅" if self.pageText else "❌"
             self.statusMsg = f"{len(self.pageText)}" if self.pageText else ""
+            if compact:
+                self.page = PageRef.ofPage(self.page, self.pageText)
+                self.pageText = None
         return self.page
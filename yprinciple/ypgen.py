@@ -7,9 +7,14 @@ Created on 2022-11-24
 import sys
 from argparse import ArgumentParser
 
+from meta.metamodel import Context
 from ngwidgets.cmd import WebserverCmd
 
+from yprinciple.edit_scheduler import EditScheduler
 from yprinciple.genapi import GeneratorAPI
+from yprinciple.profiler import HotPathProfiler
+from yprinciple.result_sink import ResultSink
+from yprinciple.tracing import tracer
 from yprinciple.ypgenapp import YPGenServer
 
 
@@ -57,12 +62,85 @@ class YPGen(WebserverCmd):
             required=False,
         )
         parser.add_argument("--sidif", help="path to SiDIF input file")
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="number of cells to generate concurrently via Api [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="number of worker processes the topics are partitioned across when generating to files [default: %(default)s]",
+        )
         parser.add_argument(
             "-nd",
             "--noDry",
             action="store_true",
             help="switch off dry run [default: %(default)s]",
         )
+        parser.add_argument(
+            "--noContextCache",
+            action="store_true",
+            help="always download and parse the context instead of using the local context cache [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="only generate cells whose inputs changed since the last successful run [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--changed-topics",
+            dest="changedTopics",
+            nargs="*",
+            help="only generate the cells affected by changes of these topics or Topic.property properties [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--diffSidif",
+            help="path to the SiDIF file of the previous version of the context - only generate the cells affected by the differences and report orphaned pages",
+        )
+        parser.add_argument(
+            "--ignoreWhitespace",
+            action="store_true",
+            help="ignore trailing whitespace and line endings when checking for unchanged pages [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--compact",
+            action="store_true",
+            help="keep only revision ids, sizes and hashes instead of pages and texts of generated cells to save memory in big runs [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--editRate",
+            type=float,
+            help="initial edits per second of the adaptive edit scheduler that honours maxlag and Retry-After and retries transiently failed cells - if not set pages are edited directly",
+        )
+        parser.add_argument(
+            "--editRetries",
+            type=int,
+            default=5,
+            help="number of retries of transiently failed cells with the edit scheduler [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--ndjson",
+            nargs="?",
+            const="-",
+            help="stream a JSON record per generated cell to the given file or to stdout if no file is given - implies --quiet for stdout",
+        )
+        parser.add_argument(
+            "--trace",
+            help="path of a Chrome trace / Perfetto JSON file to export the spans of the generation run to",
+        )
+        parser.add_argument(
+            "--profile",
+            help="path of a pstats file to save a profile of the generation run to - a report with the time per target and phase and the hot functions is saved next to it",
+        )
+        parser.add_argument(
+            "--profileTop",
+            type=int,
+            default=20,
+            help="number of hot functions to report when profiling [default: %(default)s]",
+        )
         parser.add_argument(
             "--editor",
             action="store_true",
@@ -99,35 +177,133 @@ class YPGen(WebserverCmd):
         handled = super().handle_args(args)
         args = self.args
         if args.genToFile or args.genViaMwApi or args.push:
-            gen = GeneratorAPI.fromArgs(args)
-            if gen.error:
-                print(f"{gen.errmsg}", file=sys.stderr)
-                return 3
-            dryRun = not args.noDry
-            if not gen.context:
-                msg = f"loading context {args.context} failed"
-                print(f"{msg}", file=sys.stderr)
-                return 4
-            if args.genViaMwApi:
-                gen.generateViaMwApi(
-                    target_names=args.targets,
-                    topic_names=args.topics,
-                    dryRun=dryRun,
-                    withEditor=args.editor,
-                )
-            if args.genToFile:
-                gen.generateToFile(
-                    target_dir=args.targetPath,
-                    target_names=args.targets,
-                    topic_names=args.topics,
-                    dryRun=dryRun,
-                    withEditor=args.editor,
-                )
-            if args.push:
-                gen.push()
-            handled = True
+            if args.ndjson == "-":
+                # stdout is reserved for the records
+                args.quiet = True
+            profiler = None
+            if args.trace:
+                tracer.start()
+            if args.profile:
+                profiler = HotPathProfiler(top_n=args.profileTop)
+                profiler.start()
+            try:
+                handled = self.generate(args)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                    report = profiler.save(args.profile)
+                    if not args.quiet:
+                        print(f"profile saved to {args.profile}")
+                        print(report)
+                if args.trace:
+                    tracer.stop()
+                    tracer.save(args.trace)
+                    if not args.quiet:
+                        print(f"trace saved to {args.trace}")
+                        print(tracer.getSummary())
+        return handled
+
+    def generate(self, args):
+        """
+        generate according to the given arguments
+
+        Args:
+            args: command line arguments
+
+        Returns:
+            True if handled or an exit code
+        """
+        gen = GeneratorAPI.fromArgs(args)
+        if gen.error:
+            print(f"{gen.errmsg}", file=sys.stderr)
+            return 3
+        dryRun = not args.noDry
+        if not gen.context:
+            msg = f"loading context {args.context} failed"
+            print(f"{msg}", file=sys.stderr)
+            return 4
+        changed_topics = args.changedTopics
+        if args.diffSidif:
+            old_context, error, errMsg = Context.fromSiDIF_input(
+                args.diffSidif, debug=args.debug
+            )
+            if error:
+                print(f"{errMsg}", file=sys.stderr)
+                return 5
+            diff = gen.getContextDiff(old_context)
+            if not args.quiet:
+                print(diff.getSummary())
+            changed_topics = (changed_topics or []) + diff.getChanges(gen.context)
+        sink = ResultSink.ofPath(args.ndjson) if args.ndjson else None
+        try:
+            self.generateResults(gen, args, dryRun, changed_topics, sink)
+        finally:
+            if sink is not None:
+                sink.close()
+        if args.push:
+            gen.push()
+        handled = True
         return handled
 
+    def generateResults(
+        self,
+        gen: GeneratorAPI,
+        args,
+        dryRun: bool,
+        changed_topics: list,
+        sink: ResultSink = None,
+    ):
+        """
+        generate via the MediaWiki API and/or to files and stream
+        the results to the given sink as they are yielded
+
+        Args:
+            gen(GeneratorAPI): the generator API to use
+            args: command line arguments
+            dryRun(bool): if True do not transfer results
+            changed_topics(list): if set only generate the affected cells
+            sink(ResultSink): the sink for the results - if None the results
+                are dropped right away
+        """
+        results_list = []
+        if args.genViaMwApi:
+            edit_scheduler = None
+            if args.editRate:
+                edit_scheduler = EditScheduler(
+                    rate=args.editRate, max_retries=args.editRetries, debug=args.debug
+                )
+            results = gen.yieldViaMwApi(
+                target_names=args.targets,
+                topic_names=args.topics,
+                dryRun=dryRun,
+                withEditor=args.editor,
+                jobs=args.jobs,
+                ignore_whitespace=args.ignoreWhitespace,
+                incremental=args.incremental,
+                changed_topics=changed_topics,
+                compact=args.compact,
+                edit_scheduler=edit_scheduler,
+            )
+            results_list.append(results)
+        if args.genToFile:
+            results = gen.yieldToFile(
+                target_dir=args.targetPath,
+                target_names=args.targets,
+                topic_names=args.topics,
+                dryRun=dryRun,
+                withEditor=args.editor,
+                incremental=args.incremental,
+                processes=args.processes,
+                changed_topics=changed_topics,
+            )
+            results_list.append(results)
+        for results in results_list:
+            if sink is not None:
+                sink.writeAll(results)
+            else:
+                for _result in results:
+                    pass
+
 
 def main(argv: list = None):
     """
@@ -6,22 +6,36 @@ Created on 2022-11-24
 
 import html
 
+from fastapi.responses import Response
 from meta.metamodel import Context
 from ngwidgets.input_webserver import InputWebserver, InputWebSolution
 from ngwidgets.profiler import Profiler
 from ngwidgets.progress import NiceguiProgressbar
 from ngwidgets.webserver import WebserverConfig
 from ngwidgets.widgets import Link
-from nicegui import background_tasks, run, ui
+from nicegui import app, background_tasks, run, ui
 from nicegui.client import Client
 from wikibot3rd.wikiuser import WikiUser
 
 from yprinciple.genapi import GeneratorAPI
 from yprinciple.gengrid import GeneratorGrid
+from yprinciple.metrics import metrics
 from yprinciple.smw_targets import SMWTarget
+from yprinciple.tracing import tracer
 from yprinciple.version import Version
 
 
+@app.get("/metrics")
+def get_metrics():
+    """
+    get the generation metrics in the Prometheus text exposition format
+    """
+    return Response(
+        content=metrics.toPrometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 class YPGenServer(InputWebserver):
     """
     Y-Principle Generator webserver
@@ -51,6 +65,9 @@ class YPGenServer(InputWebserver):
     def configure_run(self):
         """ """
         InputWebserver.configure_run(self)
+        # the spans of the generator API, the cells and the generator grid
+        # feed the metrics
+        metrics.attach(tracer)
         # wiki users
         self.wikiUsers = WikiUser.getWikiUsers()
 
@@ -99,7 +116,9 @@ class YPGenApp(InputWebSolution):
         # states
         self.useSidif = True
         self.dryRun = True
+        self.ignoreWhitespace = False
         self.openEditor = False
+        self.profile = False
         self.explainDepth = 0
         profile.time()
 
@@ -161,9 +180,13 @@ class YPGenApp(InputWebSolution):
 
     async def async_showGenerateGrid(self):
         """
-        run setup in background
+        run setup in background and resolve the page status
+        of the cells once the grid is shown
         """
+        self.generatorGrid = None
         await run.io_bound(self.show_GenerateGrid)
+        if self.generatorGrid is not None:
+            await self.generatorGrid.resolve_page_statuses()
 
     def show_GenerateGrid(self):
         """
@@ -178,9 +201,18 @@ class YPGenApp(InputWebSolution):
                 )
             if self.useSidif:
                 if self.mw_context is not None:
-                    context, error, errMsg = Context.fromWikiContext(
-                        self.mw_context, debug=self.args.debug, depth=self.explainDepth
-                    )
+                    with tracer.span("context load", context=self.mw_context.context):
+                        context_cache = self.genapi.context_cache
+                        if context_cache is not None:
+                            context, error, errMsg = context_cache.getContext(
+                                self.mw_context, depth=self.explainDepth
+                            )
+                        else:
+                            context, error, errMsg = Context.fromWikiContext(
+                                self.mw_context,
+                                debug=self.args.debug,
+                                depth=self.explainDepth,
+                            )
                     if error is not None:
                         self.log_view.push(errMsg)
                     else:
@@ -345,9 +377,13 @@ class YPGenApp(InputWebSolution):
                     self, "useSidif"
                 )
                 self.dryRunButton = ui.switch("dry Run").bind_value(self, "dryRun")
+                self.ignoreWhitespaceButton = ui.switch("ignore whitespace").bind_value(
+                    self, "ignoreWhitespace"
+                )
                 self.openEditorButton = ui.switch("open Editor").bind_value(
                     self, "openEditor"
                 )
+                self.profileButton = ui.switch("profile").bind_value(self, "profile")
                 self.hideShowSizeInfo = ui.switch("size info").on(
                     "click", self.handleHideShowSizeInfo
                 )